@@ -4,22 +4,37 @@ from __future__ import absolute_import
 from . import croniter as cron_m
 from .croniter import (
     DAY_FIELD,
+    DAY_TIMES_CACHE,
+    DOW_FIELD,
+    EXPAND_CACHE,
     HOUR_FIELD,
     MINUTE_FIELD,
     MONTH_FIELD,
     OVERFLOW32B_MODE,
     SECOND_FIELD,
+    TIMESTAMP_TO_DT_CACHE,
+    TZ_TRANSITIONS_CACHE,
     UTC_DT,
+    YEAR_DAYS_CACHE,
     YEAR_FIELD,
+    CanonicalForm,
     CroniterBadCronError,
     CroniterBadDateError,
     CroniterBadTypeRangeError,
     CroniterError,
     CroniterNotAlphaError,
     CroniterUnsupportedSyntaxError,
+    CronSchedule,
+    LRUCache,
+    ValidationResult,
     croniter,
+    croniter_count,
     croniter_range,
+    croniter_range_array,
     datetime_to_timestamp,
+    dump_schedules,
+    load_schedules,
+    timestamp_to_datetime,
 )
 
 croniter.__name__  # make flake8 happy
@@ -4,59 +4,28 @@
 from __future__ import absolute_import, division, print_function
 
 import binascii
-import calendar
-import copy
 import datetime
+import hashlib
 import math
-import platform
-import random
-import re
 import struct
 import sys
-import traceback as _traceback
+import threading
+import weakref
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
 from time import time
 
-# as pytz is optional in thirdparty libs but we need it for good support under
-# python2, just test that it's well installed
-import pytz  # noqa
-from dateutil.relativedelta import relativedelta
-from dateutil.tz import tzutc
+# Keep the import of this module cheap: modules only needed by some code
+# paths (pytz, re, random) are imported where they are used.
 
 
 def is_32bit():
     """
-    Detect if Python is running in 32-bit mode.
-    Compatible with Python 2.6 and later versions.
+    Detect if Python is running in 32-bit mode, from the size of a pointer.
     Returns True if running on 32-bit Python, False for 64-bit.
     """
-    # Method 1: Check pointer size
-    bits = struct.calcsize("P") * 8
-
-    # Method 2: Check platform architecture string
-    try:
-        architecture = platform.architecture()[0]
-    except RuntimeError:
-        architecture = None
-
-    # Method 3: Check maxsize (sys.maxint in Python 2)
-    try:
-        # Python 2
-        is_small_maxsize = sys.maxint <= 2 ** 32
-    except AttributeError:
-        # Python 3
-        is_small_maxsize = sys.maxsize <= 2 ** 32
-
-    # Evaluate all available methods
-    is_32 = False
-
-    if bits == 32:
-        is_32 = True
-    elif architecture and "32" in architecture:
-        is_32 = True
-    elif is_small_maxsize:
-        is_32 = True
-
-    return is_32
+    return struct.calcsize("P") * 8 == 32
 
 
 try:
@@ -73,12 +42,109 @@ except ImportError:
     OrderedDict = dict  # py26 degraded mode, expanders order will not be immutable
 
 
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+ValidationResult = namedtuple(
+    "ValidationResult", ["expression", "hash_id", "valid", "code", "field_index", "token", "message"]
+)
+CanonicalForm = namedtuple("CanonicalForm", ["expression", "day_or", "fingerprint"])
+
+
+if hasattr(OrderedDict, "move_to_end"):
+    _move_to_end = OrderedDict.move_to_end
+else:  # py2
+
+    def _move_to_end(data, key):
+        data[key] = data.pop(key)
+
+
+class LRUCache(object):
+    """
+    Thread safe mapping bounded to `maxsize` entries, evicting the least
+    recently used entry first.
+
+    A `maxsize` of `None` means unbounded, and `0` disables the cache.
+    Lookups are accounted in the `hits` and `misses` counters.
+    """
+
+    def __init__(self, maxsize=128):
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            # without reinserting the key, which would let the mapping grow until it is resized
+            _move_to_end(self._data, key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            self._trim()
+
+    def resize(self, maxsize):
+        """Change the maximum size, evicting entries in excess."""
+        with self._lock:
+            self.maxsize = maxsize
+            self._trim()
+
+    def _trim(self):
+        if self.maxsize is None:
+            return
+        while len(self._data) > self.maxsize:
+            del self._data[next(iter(self._data))]
+
+    def clear(self):
+        """Drop every entry and reset the statistics."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def __getitem__(self, key):
+        value = self.get(key, MARKER)
+        if value is MARKER:
+            raise KeyError(key)
+        return value
+
+    __setitem__ = set
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+
 try:
     # py3 recent
     UTC_DT = datetime.timezone.utc
 except AttributeError:
+    import pytz
+
     UTC_DT = pytz.utc
 EPOCH = datetime.datetime.fromtimestamp(0, UTC_DT)
+try:
+    # immutable timezones of a fixed offset
+    _FIXED_OFFSET_TYPES = (datetime.timezone,)
+except AttributeError:  # py2
+    _FIXED_OFFSET_TYPES = ()
 
 # fmt: off
 M_ALPHAS = {
@@ -103,18 +169,38 @@ SECOND_FIELDS = (MINUTE_FIELD, HOUR_FIELD, DAY_FIELD, MONTH_FIELD, DOW_FIELD, SE
 YEAR_FIELDS =   (MINUTE_FIELD, HOUR_FIELD, DAY_FIELD, MONTH_FIELD, DOW_FIELD, SECOND_FIELD, YEAR_FIELD)  # noqa: E222
 # fmt: on
 
-step_search_re = re.compile(r"^([^-]+)-([^-/]+)(/(\d+))?$")
-only_int_re = re.compile(r"^\d+$")
+
+class _LazyRegex(object):
+    """
+    Regular expression compiled on its first use.
+    """
+
+    def __init__(self, pattern, flags=0):
+        self.pattern = pattern
+        self.flags = flags
+        self._compiled = None
+
+    def __getattr__(self, name):
+        if self._compiled is None:
+            import re
+
+            self._compiled = re.compile(self.pattern, self.flags)
+        return getattr(self._compiled, name)
+
+
+# retrocompat, fields are now parsed without regular expressions
+step_search_re = _LazyRegex(r"^([^-]+)-([^-/]+)(/(\d+))?$")
+only_int_re = _LazyRegex(r"^\d+$")
 
 WEEKDAYS = "|".join(DOW_ALPHAS.keys())
 MONTHS = "|".join(M_ALPHAS.keys())
-star_or_int_re = re.compile(r"^(\d+|\*)$")
-special_dow_re = re.compile(
+star_or_int_re = _LazyRegex(r"^(\d+|\*)$")
+special_dow_re = _LazyRegex(
     (r"^(?P<pre>((?P<he>(({WEEKDAYS})(-({WEEKDAYS}))?)").format(WEEKDAYS=WEEKDAYS)
     + (r"|(({MONTHS})(-({MONTHS}))?)|\w+)#)|l)(?P<last>\d+)$").format(MONTHS=MONTHS)
 )
-re_star = re.compile("[*]")
-hash_expression_re = re.compile(
+re_star = _LazyRegex("[*]")
+hash_expression_re = _LazyRegex(
     r"^(?P<hash_type>h|r)(\((?P<range_begin>\d+)-(?P<range_end>\d+)\))?(\/(?P<divisor>\d+))?$"
 )
 
@@ -131,9 +217,31 @@ SECOND_CRON_LEN = len(SECOND_FIELDS)
 YEAR_CRON_LEN = len(YEAR_FIELDS)
 # retrocompat
 VALID_LEN_EXPRESSION = set(a for a in CRON_FIELDS if isinstance(a, int))
-TIMESTAMP_TO_DT_CACHE = {}
-EXPRESSIONS = {}
 MARKER = object()
+# bit standing for `l` (last day of month) in the day of month field mask
+LAST_DAY_BIT = 1
+# maximum number of distinct expressions kept by the expansion caches
+EXPAND_CACHE_SIZE = 4096
+# compiled expansions, see croniter._expand_cached
+EXPAND_CACHE = LRUCache(EXPAND_CACHE_SIZE)
+# retrocompat: split tokens of the last expanded expressions
+EXPRESSIONS = LRUCache(EXPAND_CACHE_SIZE)
+# repeats a 7 bits pattern over 5 weeks by multiplication
+WEEKS_REPEAT = 1 | 1 << 7 | 1 << 14 | 1 << 21 | 1 << 28
+# matching days of a year for given date fields, see CronSchedule._year_days
+YEAR_DAYS_CACHE_SIZE = 4096
+YEAR_DAYS_CACHE = LRUCache(YEAR_DAYS_CACHE_SIZE)
+# results of timestamp_to_datetime, resize to 0 to disable
+TIMESTAMP_TO_DT_CACHE_SIZE = 4096
+TIMESTAMP_TO_DT_CACHE = LRUCache(TIMESTAMP_TO_DT_CACHE_SIZE)
+# UTC offsets of the timezones, see _tz_offsets
+TZ_TRANSITIONS_CACHE_SIZE = 256
+TZ_TRANSITIONS_CACHE = LRUCache(TZ_TRANSITIONS_CACHE_SIZE)
+# largest number of times of day searched through a table, see _day_times
+DAY_TIMES_MAX = 1440
+# matching seconds of the day for given time fields, see _day_times
+DAY_TIMES_CACHE_SIZE = 4096
+DAY_TIMES_CACHE = LRUCache(DAY_TIMES_CACHE_SIZE)
 
 
 def timedelta_to_seconds(td):
@@ -147,6 +255,374 @@ def datetime_to_timestamp(d):
     return timedelta_to_seconds(d - datetime.datetime(1970, 1, 1))
 
 
+def timestamp_to_datetime(timestamp, tzinfo=None):
+    """
+    Converts a UNIX `timestamp` into a `datetime` object in `tzinfo`, naive
+    if `tzinfo` is None.
+
+    Results are kept in `TIMESTAMP_TO_DT_CACHE` for the timezones with a
+    stable identity, see `_tz_key`.
+    """
+    tz_key = _tz_key(tzinfo) if tzinfo else None
+    if tzinfo and tz_key is None:
+        # the cached datetimes would keep any other timezone alive
+        key = None
+    else:
+        key = (timestamp, tz_key)
+        result = TIMESTAMP_TO_DT_CACHE.get(key)
+        if result is not None:
+            return result
+    if OVERFLOW32B_MODE:
+        # degraded mode to workaround Y2038
+        # see https://github.com/python/cpython/issues/101069
+        result = EPOCH.replace(tzinfo=None) + datetime.timedelta(seconds=timestamp)
+    else:
+        result = datetime.datetime.fromtimestamp(timestamp, tz=UTC_DT).replace(tzinfo=None)
+    if tzinfo:
+        result = result.replace(tzinfo=UTC_DT).astimezone(tzinfo)
+    if key is not None:
+        TIMESTAMP_TO_DT_CACHE.set(key, result)
+    return result
+
+
+def _zoneinfo_types():
+    return tuple(sys.modules[name].ZoneInfo for name in ("zoneinfo", "backports.zoneinfo") if name in sys.modules)
+
+
+def _tz_key(tzinfo):
+    """
+    Return the key standing for `tzinfo` in the caches, or None when it has
+    no stable identity: pytz timezones and the cached `zoneinfo` timezones
+    are keyed by their name, fixed offsets by their offset and name.
+    """
+    if isinstance(tzinfo, _FIXED_OFFSET_TYPES):
+        # equal fixed offsets may still differ by name
+        return (type(tzinfo), tzinfo.utcoffset(None), tzinfo.tzname(None))
+    pytz = sys.modules.get("pytz")
+    if pytz is not None and isinstance(tzinfo, pytz.BaseTzInfo):
+        # all the instances of a pytz timezone convert to the same ones
+        return ("pytz", tzinfo.zone)
+    zoneinfo_types = _zoneinfo_types()
+    if isinstance(tzinfo, zoneinfo_types) and tzinfo.key is not None:
+        # datetimes in other instances of a zone (eg: ZoneInfo.no_cache) are in another timezone
+        try:
+            if type(tzinfo)(tzinfo.key) is tzinfo:
+                return ("zoneinfo", type(tzinfo), tzinfo.key)
+        except Exception:
+            pass
+    return None
+
+
+def _days_from_civil(year, month, day):
+    """
+    Return the number of days between 1970-01-01 and the given proleptic
+    gregorian date (http://howardhinnant.github.io/date_algorithms.html).
+    """
+    if month <= 2:
+        year -= 1
+    era = year // 400
+    yoe = year - era * 400
+    doy = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+def _civil_from_days(days):
+    """
+    Return the `(year, month, day)` lying `days` days after 1970-01-01,
+    see `_days_from_civil`.
+    """
+    days += 719468
+    era = days // 146097
+    doe = days - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = mp + (3 if mp < 10 else -9)
+    year = yoe + era * 400
+    if month <= 2:
+        year += 1
+    return year, month, day
+
+
+def _mask_next(mask, x):
+    """Return the lowest value >= `x` set in the bitmask `mask`, or None."""
+    mask >>= x
+    if not mask:
+        return None
+    return x + (mask & -mask).bit_length() - 1
+
+
+def _mask_prev(mask, x):
+    """Return the highest value <= `x` set in the bitmask `mask`, or None."""
+    mask &= (2 << x) - 1
+    if not mask:
+        return None
+    return mask.bit_length() - 1
+
+
+def _uniform_values(mask, size):
+    """
+    Return `(step, first)` when the bitmask `mask` of values below `size`
+    allows `first`, `first + step`, ... repeating every `step` across the
+    cycle (`size` being a multiple of `step`), else None.
+    """
+    if mask is None:
+        return 1, 0
+    first = _mask_next(mask, 0)
+    second = _mask_next(mask, first + 1)
+    if second is None:
+        return size, first
+    step = second - first
+    if size % step or first >= step:
+        return None
+    expected = 0
+    for value in range(first, size, step):
+        expected |= 1 << value
+    return (step, first) if mask == expected else None
+
+
+def _fixed_period(masks):
+    """
+    Return `(period, offset)` when the time fields of `masks` match the
+    seconds of the day `offset + k * period`, `period` dividing a day,
+    else None.
+    """
+    has_seconds = len(masks) > UNIX_CRON_LEN
+    seconds = _uniform_values(masks[SECOND_FIELD], 60) if has_seconds else (60, 0)
+    minutes = _uniform_values(masks[MINUTE_FIELD], 60)
+    hours = _uniform_values(masks[HOUR_FIELD], 24)
+    if seconds is None or minutes is None or hours is None:
+        return None
+    if seconds[0] < 60:
+        # several seconds a minute: every minute of every hour must match
+        if minutes != (1, 0) or hours != (1, 0):
+            return None
+        return seconds
+    if minutes[0] < 60:
+        if hours != (1, 0):
+            return None
+        return minutes[0] * 60, minutes[1] * 60 + seconds[1]
+    return hours[0] * 3600, hours[1] * 3600 + minutes[1] * 60 + seconds[1]
+
+
+def _offset_seconds(offset):
+    return offset.days * 86400 + offset.seconds
+
+
+class _TransitionOffsets(object):
+    """
+    UTC offsets of a pytz timezone or of a fixed offset, read from the
+    sorted UTC timestamps of its transitions, see `_tz_offsets`.
+    """
+
+    __slots__ = ("times", "offsets", "infos")
+
+    def __init__(self, times, offsets, infos):
+        self.times = times
+        # in seconds, the first one also applying before the first transition
+        self.offsets = offsets
+        self.infos = infos
+
+    def offset(self, timestamp):
+        """Return the UTC offset in seconds in effect at `timestamp`."""
+        return self.offsets[max(0, bisect_right(self.times, timestamp) - 1)]
+
+    def info(self, timestamp):
+        """Return the `(utcoffset, dst, tzname)` in effect at `timestamp`."""
+        return self.infos[max(0, bisect_right(self.times, timestamp) - 1)]
+
+    def resolve(self, wall, offset):
+        """
+        Return the timestamp of the wall-clock time `wall` (local seconds
+        since the epoch) observed with the UTC `offset`, or None if it does
+        not exist with this offset.
+        """
+        timestamp = wall - offset
+        return timestamp if self.offset(timestamp) == offset else None
+
+
+class _ZoneInfoOffsets(object):
+    """
+    UTC offsets of a `zoneinfo` timezone, which does not expose its
+    transitions but converts timestamps quickly, see `_tz_offsets`.
+    """
+
+    __slots__ = ("tzinfo",)
+
+    def __init__(self, tzinfo):
+        self.tzinfo = tzinfo
+
+    def _datetime(self, timestamp):
+        if OVERFLOW32B_MODE:
+            return timestamp_to_datetime(timestamp, self.tzinfo)
+        # cheaper than a miss of TIMESTAMP_TO_DT_CACHE, and kept out of it
+        return datetime.datetime.fromtimestamp(timestamp, self.tzinfo)
+
+    def offset(self, timestamp):
+        """Return the UTC offset in seconds in effect at `timestamp`."""
+        return _offset_seconds(self._datetime(timestamp).utcoffset())
+
+    def info(self, timestamp):
+        """Return the `(utcoffset, dst, tzname)` in effect at `timestamp`."""
+        d = self._datetime(timestamp)
+        return d.utcoffset(), d.dst(), d.tzname()
+
+    def resolve(self, wall, offset):
+        """
+        Return the timestamp of the wall-clock time `wall` (local seconds
+        since the epoch) observed with the UTC `offset`, or None if it does
+        not exist with this offset, see `_TransitionOffsets.resolve`.
+        """
+        # `fold` reads the wall-clock time with the offset before (0) or after (1) a
+        # transition: they differ for repeated times, and are swapped in a skipped one
+        d = (EPOCH.replace(tzinfo=None) + datetime.timedelta(seconds=wall)).replace(tzinfo=self.tzinfo)
+        before, after = (_offset_seconds(d.replace(fold=fold).utcoffset()) for fold in (0, 1))
+        if before < after or offset not in (before, after):
+            return None
+        return wall - offset
+
+
+def _tz_offsets(tzinfo):
+    """
+    Return the UTC offsets of the timezones whose matches are resolved on
+    timestamps (pytz and zoneinfo timezones, fixed offsets), None for the
+    others, whose datetimes resolve wall-clock times on their own.
+
+    Entries are shared in `TZ_TRANSITIONS_CACHE`, keyed like in
+    `timestamp_to_datetime`. The other timezones are keyed by their id,
+    with a weak reference checking the id was not reused.
+    """
+    key = _tz_key(tzinfo)
+    ref = None
+    if key is None:
+        try:
+            ref = weakref.ref(tzinfo)
+        except TypeError:
+            return _tz_offsets_uncached(tzinfo)
+        key = ("id", id(tzinfo))
+    entry = TZ_TRANSITIONS_CACHE.get(key)
+    if entry is not None and (ref is None or entry[0]() is tzinfo):
+        return entry[1]
+    zone = _tz_offsets_uncached(tzinfo)
+    TZ_TRANSITIONS_CACHE.set(key, (ref, zone))
+    return zone
+
+
+def _tz_offsets_uncached(tzinfo):
+    zone = None
+    utc_transition_times = getattr(tzinfo, "_utc_transition_times", None)
+    transition_info = getattr(tzinfo, "_transition_info", None)
+    zoneinfo_types = _zoneinfo_types()
+    if utc_transition_times and transition_info:
+        # pytz, see DstTzInfo.fromutc
+        if not any(d.microsecond for d in utc_transition_times) and not any(
+            info[0].microseconds for info in transition_info
+        ):
+            zone = _TransitionOffsets(
+                [
+                    _days_from_civil(d.year, d.month, d.day) * 86400 + d.hour * 3600 + d.minute * 60 + d.second
+                    for d in utc_transition_times
+                ],
+                [info[0].days * 86400 + info[0].seconds for info in transition_info],
+                list(transition_info),
+            )
+    elif isinstance(tzinfo, zoneinfo_types):
+        zone = _ZoneInfoOffsets(tzinfo)
+    else:
+        try:
+            offset = tzinfo.utcoffset(None)
+        except (AttributeError, TypeError, ValueError):
+            offset = None
+        if offset is not None and not offset.microseconds:
+            zone = _TransitionOffsets([], [offset.days * 86400 + offset.seconds], [None])
+    return zone
+
+
+def _utc_transitions(tzinfo, start, stop):
+    """
+    Return the timestamps in `(start, stop]` at which the UTC offset of
+    `tzinfo` changes, looking for the changes day by day unless they are
+    known from `_tz_offsets`.
+    """
+    zone = _tz_offsets(tzinfo)
+    if isinstance(zone, _TransitionOffsets):
+        times, offsets = zone.times, zone.offsets
+        begin, end = max(1, bisect_right(times, start)), bisect_right(times, stop)
+        return [times[i] for i in range(begin, end) if offsets[i] != offsets[i - 1]]
+    transitions = []
+    offset = timestamp_to_datetime(start, tzinfo).utcoffset()
+    while start < stop:
+        end = min(start + 86400, stop)
+        end_offset = timestamp_to_datetime(end, tzinfo).utcoffset()
+        if end_offset != offset:
+            low, high = start, end
+            while high - low > 1:
+                middle = (low + high) // 2
+                if timestamp_to_datetime(middle, tzinfo).utcoffset() == offset:
+                    low = middle
+                else:
+                    high = middle
+            transitions.append(high)
+        start, offset = end, end_offset
+    return transitions
+
+
+def _whole_seconds(d):
+    """
+    Return the whole seconds since the epoch of the (naive UTC or aware)
+    datetime `d`, and 1 if it has a fraction of second else 0.
+    """
+    delta = d - (EPOCH if d.tzinfo else EPOCH.replace(tzinfo=None))
+    return delta.days * 86400 + delta.seconds, 1 if delta.microseconds else 0
+
+
+def _first_weekday(year, month):
+    """Return the weekday of the first day of `month` (0 being sunday)."""
+    # the 1st of January 1970 was a thursday
+    return (_days_from_civil(year, month, 1) + 4) % 7
+
+
+def _year_kind(year):
+    """
+    Return the kind of `year`, `7 * leap + weekday of its first day` (0
+    being sunday), the years of a kind sharing the same calendar.
+    """
+    leap = year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+    return 7 * leap + (_days_from_civil(year, 1, 1) + 4) % 7
+
+
+def _day_times(hour_mask, minute_mask, second_mask):
+    """
+    Return the sorted seconds of the day matched by the masks of the time
+    fields (None matching every value) as an `array('i')`, or None when
+    there are more than `DAY_TIMES_MAX` of them.
+
+    Entries are shared in `DAY_TIMES_CACHE`.
+    """
+    key = (hour_mask, minute_mask, second_mask)
+    times = DAY_TIMES_CACHE.get(key, MARKER)
+    if times is MARKER:
+        values = [
+            [i for i in range(size) if mask is None or mask >> i & 1]
+            for mask, size in ((hour_mask, 24), (minute_mask, 60), (second_mask, 60))
+        ]
+        times = None
+        if len(values[0]) * len(values[1]) * len(values[2]) <= DAY_TIMES_MAX:
+            times = array("i", (h * 3600 + m * 60 + s for h in values[0] for m in values[1] for s in values[2]))
+        DAY_TIMES_CACHE.set(key, times)
+    return times
+
+
+def _is_utc(tzinfo):
+    """Tell whether `tzinfo` is UTC, whose wall-clock time is the UTC time."""
+    try:
+        return tzinfo.utcoffset(None) == datetime.timedelta(0)
+    except (AttributeError, TypeError, ValueError):
+        return False
+
+
 class CroniterError(ValueError):
     """General top-level Croniter base exception"""
 
@@ -158,10 +634,22 @@ class CroniterBadTypeRangeError(TypeError):
 class CroniterBadCronError(CroniterError):
     """Syntax, unknown value, or range error within a cron expression"""
 
+    # machine readable error kind, see croniter.validate_many
+    code = "invalid"
+
+    def __init__(self, *args, **kwargs):
+        self.code = kwargs.pop("code", self.code)
+        # index (eg: MINUTE_FIELD) and content of the offending field, if known
+        self.field_index = kwargs.pop("field_index", None)
+        self.token = kwargs.pop("token", None)
+        super(CroniterBadCronError, self).__init__(*args, **kwargs)
+
 
 class CroniterUnsupportedSyntaxError(CroniterBadCronError):
     """Valid cron syntax, but likely to produce inaccurate results"""
 
+    code = "unsupported"
+
     # Extending CroniterBadCronError, which may be contridatory, but this allows
     # catching both errors with a single exception.  From a user perspective
     # these will likely be handled the same way.
@@ -174,6 +662,8 @@ class CroniterBadDateError(CroniterError):
 class CroniterNotAlphaError(CroniterBadCronError):
     """Cron syntax contains an invalid day or month abbreviation"""
 
+    code = "not_alpha"
+
 
 class croniter(object):
     MONTHS_IN_YEAR = 12
@@ -196,9 +686,9 @@ class croniter(object):
         {},  # 1: hour
         {"l": "l"},  # 2: dom
         # 3: mon
-        copy.deepcopy(M_ALPHAS),
+        dict(M_ALPHAS),
         # 4: dow
-        copy.deepcopy(DOW_ALPHAS),
+        dict(DOW_ALPHAS),
         # 5: second
         {},
         # 6: year
@@ -239,17 +729,8 @@ class croniter(object):
         expand_from_start_time=False,
     ):
         self._ret_type = ret_type
-        self._day_or = day_or
-        self._implement_cron_bug = implement_cron_bug
-        self.second_at_beginning = bool(second_at_beginning)
         self._expand_from_start_time = expand_from_start_time
 
-        if hash_id:
-            if not isinstance(hash_id, (bytes, str)):
-                raise TypeError("hash_id must be bytes or UTF-8 string")
-            if not isinstance(hash_id, bytes):
-                hash_id = hash_id.encode("UTF-8")
-
         self._max_years_btw_matches_explicitly_set = max_years_between_matches is not None
         if not self._max_years_btw_matches_explicitly_set:
             max_years_between_matches = 50
@@ -265,22 +746,100 @@ class croniter(object):
         self.cur = None
         self.set_current(start_time, force=False)
 
-        self.expanded, self.nth_weekday_of_month = self.expand(
-            expr_format,
-            hash_id=hash_id,
-            from_timestamp=self.dst_start_time if self._expand_from_start_time else None,
-            second_at_beginning=second_at_beginning,
-        )
-        self.fields = CRON_FIELDS[len(self.expanded)]
-        self.expressions = EXPRESSIONS[(expr_format, hash_id, second_at_beginning)]
+        if isinstance(expr_format, CronSchedule):
+            self.schedule = expr_format
+        else:
+            self.schedule = CronSchedule(
+                expr_format,
+                hash_id=hash_id,
+                day_or=day_or,
+                implement_cron_bug=implement_cron_bug,
+                second_at_beginning=second_at_beginning,
+                from_timestamp=self.dst_start_time if self._expand_from_start_time else None,
+                _croniter=type(self),
+            )
+        self.fields = self.schedule.fields
         self._is_prev = is_prev
 
+    # the parsed expression is held by the (immutable) schedule: `expanded`,
+    # `nth_weekday_of_month` and `expressions` are mutable copies of it made
+    # once per cursor, and assigning them rebuilds the schedule
+    @property
+    def expanded(self):
+        return self._schedule_copies()[0]
+
+    @expanded.setter
+    def expanded(self, value):
+        self._rebuild_schedule(expanded=value)
+
+    @property
+    def nth_weekday_of_month(self):
+        return self._schedule_copies()[1]
+
+    @nth_weekday_of_month.setter
+    def nth_weekday_of_month(self, value):
+        self._rebuild_schedule(nth_weekday_of_month=value)
+
+    @property
+    def expressions(self):
+        return self._schedule_copies()[2]
+
+    @expressions.setter
+    def expressions(self, value):
+        self._rebuild_schedule(expressions=value)
+
+    @property
+    def masks(self):
+        return self.schedule.masks
+
+    def _schedule_copies(self):
+        copies = self.__dict__.get("_copies")
+        if copies is None or copies[3] is not self.schedule:
+            schedule = self.schedule
+            copies = self._copies = (
+                [list(field) for field in schedule.expanded],
+                dict((k, set(v)) for k, v in schedule.nth_weekday_of_month),
+                list(schedule.expressions),
+                schedule,
+            )
+        return copies
+
+    def _rebuild_schedule(self, **changes):
+        expanded, nth_weekday_of_month, expressions, schedule = self._schedule_copies()
+        expanded = changes.get("expanded", expanded)
+        self.schedule = CronSchedule(
+            schedule.expr_format,
+            hash_id=schedule.hash_id,
+            day_or=schedule.day_or,
+            implement_cron_bug=schedule.implement_cron_bug,
+            second_at_beginning=schedule.second_at_beginning,
+            _croniter=schedule._croniter,
+            _compiled=(
+                expanded,
+                changes.get("nth_weekday_of_month", nth_weekday_of_month),
+                changes.get("expressions", expressions),
+                self._fields_masks(expanded),
+            ),
+        )
+
+    @property
+    def second_at_beginning(self):
+        return self.schedule.second_at_beginning
+
+    @property
+    def _day_or(self):
+        return self.schedule.day_or
+
+    @property
+    def _implement_cron_bug(self):
+        return self.schedule.implement_cron_bug
+
     @classmethod
     def _alphaconv(cls, index, key, expressions):
         try:
             return cls.ALPHACONV[index][key]
         except KeyError:
-            raise CroniterNotAlphaError("[{0}] is not acceptable".format(" ".join(expressions)))
+            raise CroniterNotAlphaError("[{0}] is not acceptable".format(" ".join(expressions)), token=key)
 
     def get_next(self, ret_type=None, start_time=None, update_current=True):
         if start_time and self._expand_from_start_time:
@@ -300,6 +859,75 @@ class croniter(object):
             update_current=update_current,
         )
 
+    def get_nth_next(self, n, ret_type=None, start_time=None, update_current=True):
+        """
+        Return the `n`-th next match, `get_nth_next(1)` being `get_next()`.
+
+        The matches in between are counted per day and per year rather than
+        iterated over, unless a timezone with DST is attached.
+        """
+        if start_time and self._expand_from_start_time:
+            raise ValueError("start_time is not supported when using expand_from_start_time = True.")
+        return self._get_nth(n, ret_type, start_time, False, update_current)
+
+    def get_nth_prev(self, n, ret_type=None, start_time=None, update_current=True):
+        """
+        Return the `n`-th previous match, see `get_nth_next`.
+        """
+        return self._get_nth(n, ret_type, start_time, True, update_current)
+
+    def _get_nth(self, n, ret_type, start_time, is_prev, update_current):
+        if int(n) != n or n < 1:
+            raise ValueError("n must be a positive integer, got {0!r}".format(n))
+        ret_type = ret_type or self._ret_type
+        if not issubclass(ret_type, (float, datetime.datetime)):
+            raise TypeError("Invalid ret_type, only 'float' or 'datetime' is acceptable.")
+        self.set_current(start_time, force=True)
+        state = (self.cur, self.dst_start_time, self._is_prev)
+        result = self._get_next(ret_type=float, is_prev=is_prev)
+        if n > 1:
+            skipped = self.schedule._skip(result, int(n) - 1, is_prev, self.tzinfo, self._max_years_between_matches)
+            if skipped is None:
+                for i in range(int(n) - 1):
+                    result = self._get_next(ret_type=float, is_prev=is_prev)
+            else:
+                result = self.cur = skipped
+        if update_current is False:
+            self.cur, self.dst_start_time, self._is_prev = state
+        if issubclass(ret_type, datetime.datetime):
+            return self.timestamp_to_datetime(result)
+        return result
+
+    def get_next_many(self, n, ret_type=float, start_time=None, update_current=True):
+        """
+        Return the `n` next matches, as an `array('d')` of timestamps for
+        `float` or as a list of datetimes, advancing the cursor only once.
+        """
+        if start_time and self._expand_from_start_time:
+            raise ValueError("start_time is not supported when using expand_from_start_time = True.")
+        return self._get_many(n, ret_type, start_time, False, update_current)
+
+    def get_prev_many(self, n, ret_type=float, start_time=None, update_current=True):
+        """
+        Return the `n` previous matches, see `get_next_many`.
+        """
+        return self._get_many(n, ret_type, start_time, True, update_current)
+
+    def _get_many(self, n, ret_type, start_time, is_prev, update_current):
+        if int(n) != n or n < 1:
+            raise ValueError("n must be a positive integer, got {0!r}".format(n))
+        if not issubclass(ret_type, (float, datetime.datetime)):
+            raise TypeError("Invalid ret_type, only 'float' or 'datetime' is acceptable.")
+        self.set_current(start_time, force=True)
+        need_datetime = issubclass(ret_type, datetime.datetime)
+        timestamps, datetimes, dst_start_time = self.schedule._next_many(
+            self.cur, self.dst_start_time, self.tzinfo, is_prev, self._max_years_between_matches, int(n), need_datetime
+        )
+        if update_current:
+            self.cur, self.dst_start_time = timestamps[-1], dst_start_time
+            self._is_prev = is_prev
+        return datetimes if need_datetime else timestamps
+
     def get_current(self, ret_type=None):
         ret_type = ret_type or self._ret_type
         if issubclass(ret_type, datetime.datetime):
@@ -332,23 +960,7 @@ class croniter(object):
         """
         if tzinfo is MARKER:  # allow to give tzinfo=None even if self.tzinfo is set
             tzinfo = self.tzinfo
-        k = timestamp
-        if tzinfo:
-            k = (timestamp, repr(tzinfo))
-        try:
-            return TIMESTAMP_TO_DT_CACHE[k]
-        except KeyError:
-            pass
-        if OVERFLOW32B_MODE:
-            # degraded mode to workaround Y2038
-            # see https://github.com/python/cpython/issues/101069
-            result = EPOCH.replace(tzinfo=None) + datetime.timedelta(seconds=timestamp)
-        else:
-            result = datetime.datetime.fromtimestamp(timestamp, tz=tzutc()).replace(tzinfo=None)
-        if tzinfo:
-            result = result.replace(tzinfo=UTC_DT).astimezone(tzinfo)
-        TIMESTAMP_TO_DT_CACHE[(result, repr(result.tzinfo))] = result
-        return result
+        return timestamp_to_datetime(timestamp, tzinfo)
 
     _timestamp_to_datetime = timestamp_to_datetime  # retrocompat
 
@@ -377,71 +989,24 @@ class croniter(object):
         if is_prev is None:
             is_prev = self._is_prev
         self._is_prev = is_prev
-        expanded = self.expanded[:]
-        nth_weekday_of_month = self.nth_weekday_of_month.copy()
 
         ret_type = ret_type or self._ret_type
 
         if not issubclass(ret_type, (float, datetime.datetime)):
             raise TypeError("Invalid ret_type, only 'float' or 'datetime' is acceptable.")
 
-        # exception to support day of month and day of week as defined in cron
-        dom_dow_exception_processed = False
-        if (expanded[DAY_FIELD][0] != "*" and expanded[DOW_FIELD][0] != "*") and self._day_or:
-            # If requested, handle a bug in vixie cron/ISC cron where day_of_month and day_of_week form
-            # an intersection (AND) instead of a union (OR) if either field is an asterisk or starts with an asterisk
-            # (https://crontab.guru/cron-bug.html)
-            if self._implement_cron_bug and (
-                re_star.match(self.expressions[DAY_FIELD]) or re_star.match(self.expressions[DOW_FIELD])
-            ):
-                # To produce a schedule identical to the cron bug, we'll bypass the code that
-                # makes a union of DOM and DOW, and instead skip to the code that does an intersect instead
-                pass
-            else:
-                bak = expanded[DOW_FIELD]
-                expanded[DOW_FIELD] = ["*"]
-                t1 = self._calc(self.cur, expanded, nth_weekday_of_month, is_prev)
-                expanded[DOW_FIELD] = bak
-                expanded[DAY_FIELD] = ["*"]
-
-                t2 = self._calc(self.cur, expanded, nth_weekday_of_month, is_prev)
-                if not is_prev:
-                    result = t1 if t1 < t2 else t2
-                else:
-                    result = t1 if t1 > t2 else t2
-                dom_dow_exception_processed = True
-
-        if not dom_dow_exception_processed:
-            result = self._calc(self.cur, expanded, nth_weekday_of_month, is_prev)
-
-        # DST Handling for cron job spanning across days
-        dtstarttime = self._timestamp_to_datetime(self.dst_start_time)
-        dtstarttime_utcoffset = dtstarttime.utcoffset() or datetime.timedelta(0)
-        dtresult = self.timestamp_to_datetime(result)
-        lag = lag_hours = 0
-        # do we trigger DST on next crontab (handle backward changes)
-        dtresult_utcoffset = dtstarttime_utcoffset
-        if dtresult and self.tzinfo:
-            dtresult_utcoffset = dtresult.utcoffset()
-            lag_hours = self._timedelta_to_seconds(dtresult - dtstarttime) / (60 * 60)
-            lag = self._timedelta_to_seconds(dtresult_utcoffset - dtstarttime_utcoffset)
-        hours_before_midnight = 24 - dtstarttime.hour
-        if dtresult_utcoffset != dtstarttime_utcoffset:
-            if (lag > 0 and abs(lag_hours) >= hours_before_midnight) or (
-                lag < 0 and ((3600 * abs(lag_hours) + abs(lag)) >= hours_before_midnight * 3600)
-            ):
-                dtresult_adjusted = dtresult - datetime.timedelta(seconds=lag)
-                result_adjusted = self._datetime_to_timestamp(dtresult_adjusted)
-                # Do the actual adjust only if the result time actually exists
-                if self._timestamp_to_datetime(result_adjusted).tzinfo == dtresult_adjusted.tzinfo:
-                    dtresult = dtresult_adjusted
-                    result = result_adjusted
-                self.dst_start_time = result
+        need_datetime = issubclass(ret_type, datetime.datetime)
+        result, dtresult, self.dst_start_time = self.schedule._next(
+            self.cur,
+            self.dst_start_time,
+            self.tzinfo,
+            is_prev,
+            self._max_years_between_matches,
+            need_datetime,
+        )
         if update_current:
             self.cur = result
-        if issubclass(ret_type, datetime.datetime):
-            result = dtresult
-        return result
+        return dtresult if need_datetime else result
 
     # iterator protocol, to enable direct use of croniter
     # objects in a loop, like "for dt in croniter("5 0 * * *'): ..."
@@ -495,263 +1060,42 @@ class croniter(object):
 
     __next__ = next = _get_next
 
-    def _calc(self, now, expanded, nth_weekday_of_month, is_prev):
-        if is_prev:
-            now = math.ceil(now)
-            nearest_diff_method = self._get_prev_nearest_diff
-            sign = -1
-            offset = 1 if (len(expanded) > UNIX_CRON_LEN or now % 60 > 0) else 60
-        else:
-            now = math.floor(now)
-            nearest_diff_method = self._get_next_nearest_diff
-            sign = 1
-            offset = 1 if (len(expanded) > UNIX_CRON_LEN) else 60
-
-        dst = now = self.timestamp_to_datetime(now + sign * offset)
-
-        month, year = dst.month, dst.year
-        current_year = now.year
-        DAYS = self.DAYS
-
-        def proc_year(d):
-            if len(expanded) == YEAR_CRON_LEN:
-                try:
-                    expanded[YEAR_FIELD].index("*")
-                except ValueError:
-                    # use None as range_val to indicate no loop
-                    diff_year = nearest_diff_method(d.year, expanded[YEAR_FIELD], None)
-                    if diff_year is None:
-                        return None, d
-                    if diff_year != 0:
-                        if is_prev:
-                            d += relativedelta(
-                                years=diff_year,
-                                month=12,
-                                day=31,
-                                hour=23,
-                                minute=59,
-                                second=59,
-                            )
-                        else:
-                            d += relativedelta(
-                                years=diff_year,
-                                month=1,
-                                day=1,
-                                hour=0,
-                                minute=0,
-                                second=0,
-                            )
-                        return True, d
-            return False, d
-
-        def proc_month(d):
-            try:
-                expanded[MONTH_FIELD].index("*")
-            except ValueError:
-                diff_month = nearest_diff_method(d.month, expanded[MONTH_FIELD], self.MONTHS_IN_YEAR)
-                reset_day = 1
-
-                if diff_month is not None and diff_month != 0:
-                    if is_prev:
-                        d += relativedelta(months=diff_month)
-                        reset_day = DAYS[d.month - 1]
-                        if d.month == 2 and self.is_leap(d.year) is True:
-                            reset_day += 1
-                        d += relativedelta(day=reset_day, hour=23, minute=59, second=59)
-                    else:
-                        d += relativedelta(months=diff_month, day=reset_day, hour=0, minute=0, second=0)
-                    return True, d
-            return False, d
-
-        def proc_day_of_month(d):
-            try:
-                expanded[DAY_FIELD].index("*")
-            except ValueError:
-                days = DAYS[month - 1]
-                if month == 2 and self.is_leap(year) is True:
-                    days += 1
-                if "l" in expanded[DAY_FIELD] and days == d.day:
-                    return False, d
+    @staticmethod
+    def _get_next_nearest(x, to_check):
+        small = [item for item in to_check if item < x]
+        large = [item for item in to_check if item >= x]
+        large.extend(small)
+        return large[0]
 
-                if is_prev:
-                    days_in_prev_month = DAYS[(month - 2) % self.MONTHS_IN_YEAR]
-                    diff_day = nearest_diff_method(d.day, expanded[DAY_FIELD], days_in_prev_month)
-                else:
-                    diff_day = nearest_diff_method(d.day, expanded[DAY_FIELD], days)
+    @staticmethod
+    def _get_prev_nearest(x, to_check):
+        small = [item for item in to_check if item <= x]
+        large = [item for item in to_check if item > x]
+        small.reverse()
+        large.reverse()
+        small.extend(large)
+        return small[0]
 
-                if diff_day is not None and diff_day != 0:
-                    if is_prev:
-                        d += relativedelta(days=diff_day, hour=23, minute=59, second=59)
-                    else:
-                        d += relativedelta(days=diff_day, hour=0, minute=0, second=0)
-                    return True, d
-            return False, d
-
-        def proc_day_of_week(d):
-            try:
-                expanded[DOW_FIELD].index("*")
-            except ValueError:
-                diff_day_of_week = nearest_diff_method(d.isoweekday() % 7, expanded[DOW_FIELD], 7)
-                if diff_day_of_week is not None and diff_day_of_week != 0:
-                    if is_prev:
-                        d += relativedelta(days=diff_day_of_week, hour=23, minute=59, second=59)
-                    else:
-                        d += relativedelta(days=diff_day_of_week, hour=0, minute=0, second=0)
-                    return True, d
-            return False, d
-
-        def proc_day_of_week_nth(d):
-            if "*" in nth_weekday_of_month:
-                s = nth_weekday_of_month["*"]
-                for i in range(0, 7):
-                    if i in nth_weekday_of_month:
-                        nth_weekday_of_month[i].update(s)
-                    else:
-                        nth_weekday_of_month[i] = s
-                del nth_weekday_of_month["*"]
-
-            candidates = []
-            for wday, nth in nth_weekday_of_month.items():
-                c = self._get_nth_weekday_of_month(d.year, d.month, wday)
-                for n in nth:
-                    if n == "l":
-                        candidate = c[-1]
-                    elif len(c) < n:
-                        continue
-                    else:
-                        candidate = c[n - 1]
-                    if (is_prev and candidate <= d.day) or (not is_prev and d.day <= candidate):
-                        candidates.append(candidate)
-
-            if not candidates:
-                if is_prev:
-                    d += relativedelta(days=-d.day, hour=23, minute=59, second=59)
-                else:
-                    days = DAYS[month - 1]
-                    if month == 2 and self.is_leap(year) is True:
-                        days += 1
-                    d += relativedelta(days=(days - d.day + 1), hour=0, minute=0, second=0)
-                return True, d
-
-            candidates.sort()
-            diff_day = (candidates[-1] if is_prev else candidates[0]) - d.day
-            if diff_day != 0:
-                if is_prev:
-                    d += relativedelta(days=diff_day, hour=23, minute=59, second=59)
-                else:
-                    d += relativedelta(days=diff_day, hour=0, minute=0, second=0)
-                return True, d
-            return False, d
-
-        def proc_hour(d):
-            try:
-                expanded[HOUR_FIELD].index("*")
-            except ValueError:
-                diff_hour = nearest_diff_method(d.hour, expanded[HOUR_FIELD], 24)
-                if diff_hour is not None and diff_hour != 0:
-                    if is_prev:
-                        d += relativedelta(hours=diff_hour, minute=59, second=59)
-                    else:
-                        d += relativedelta(hours=diff_hour, minute=0, second=0)
-                    return True, d
-            return False, d
-
-        def proc_minute(d):
-            try:
-                expanded[MINUTE_FIELD].index("*")
-            except ValueError:
-                diff_min = nearest_diff_method(d.minute, expanded[MINUTE_FIELD], 60)
-                if diff_min is not None and diff_min != 0:
-                    if is_prev:
-                        d += relativedelta(minutes=diff_min, second=59)
-                    else:
-                        d += relativedelta(minutes=diff_min, second=0)
-                    return True, d
-            return False, d
-
-        def proc_second(d):
-            if len(expanded) > UNIX_CRON_LEN:
-                try:
-                    expanded[SECOND_FIELD].index("*")
-                except ValueError:
-                    diff_sec = nearest_diff_method(d.second, expanded[SECOND_FIELD], 60)
-                    if diff_sec is not None and diff_sec != 0:
-                        d += relativedelta(seconds=diff_sec)
-                        return True, d
-            else:
-                d += relativedelta(second=0)
-            return False, d
-
-        procs = [
-            proc_year,
-            proc_month,
-            proc_day_of_month,
-            (proc_day_of_week_nth if nth_weekday_of_month else proc_day_of_week),
-            proc_hour,
-            proc_minute,
-            proc_second,
-        ]
-
-        while abs(year - current_year) <= self._max_years_between_matches:
-            next = False
-            stop = False
-            for proc in procs:
-                (changed, dst) = proc(dst)
-                # `None` can be set mostly for year processing
-                # so please see proc_year / _get_prev_nearest_diff / _get_next_nearest_diff
-                if changed is None:
-                    stop = True
-                    break
-                if changed:
-                    month, year = dst.month, dst.year
-                    next = True
-                    break
-            if stop:
-                break
-            if next:
-                continue
-            return self.datetime_to_timestamp(dst.replace(microsecond=0))
-
-        if is_prev:
-            raise CroniterBadDateError("failed to find prev date")
-        raise CroniterBadDateError("failed to find next date")
-
-    @staticmethod
-    def _get_next_nearest(x, to_check):
-        small = [item for item in to_check if item < x]
-        large = [item for item in to_check if item >= x]
-        large.extend(small)
-        return large[0]
-
-    @staticmethod
-    def _get_prev_nearest(x, to_check):
-        small = [item for item in to_check if item <= x]
-        large = [item for item in to_check if item > x]
-        small.reverse()
-        large.reverse()
-        small.extend(large)
-        return small[0]
-
-    @staticmethod
-    def _get_next_nearest_diff(x, to_check, range_val):
-        """
-        `range_val` is the range of a field.
-        If no available time, we can move to next loop(like next month).
-        `range_val` can also be set to `None` to indicate that there is no loop.
-        ( Currently, should only used for `year` field )
-        """
-        for i, d in enumerate(to_check):
-            if d == "l" and range_val is not None:
-                # if 'l' then it is the last day of month
-                # => its value of range_val
-                d = range_val
-            if d >= x:
-                return d - x
-        # When range_val is None and x not exists in to_check,
-        # `None` will be returned to suggest no more available time
-        if range_val is None:
-            return None
-        return to_check[0] - x + range_val
+    @staticmethod
+    def _get_next_nearest_diff(x, to_check, range_val):
+        """
+        `range_val` is the range of a field.
+        If no available time, we can move to next loop(like next month).
+        `range_val` can also be set to `None` to indicate that there is no loop.
+        ( Currently, should only used for `year` field )
+        """
+        for i, d in enumerate(to_check):
+            if d == "l" and range_val is not None:
+                # if 'l' then it is the last day of month
+                # => its value of range_val
+                d = range_val
+            if d >= x:
+                return d - x
+        # When range_val is None and x not exists in to_check,
+        # `None` will be returned to suggest no more available time
+        if range_val is None:
+            return None
+        return to_check[0] - x + range_val
 
     @staticmethod
     def _get_prev_nearest_diff(x, to_check, range_val):
@@ -788,16 +1132,42 @@ class croniter(object):
             return -range_val
         return candidate - x - range_val
 
+    @staticmethod
+    def _get_next_mask_diff(x, mask, range_val):
+        """
+        Bitmask counterpart of `_get_next_nearest_diff`: bit `i` of `mask`
+        stands for the value `i`.
+        """
+        value = _mask_next(mask, x)
+        if value is not None:
+            return value - x
+        if range_val is None:
+            return None
+        return _mask_next(mask, 0) - x + range_val
+
+    @staticmethod
+    def _get_prev_mask_diff(x, mask, range_val):
+        """
+        Bitmask counterpart of `_get_prev_nearest_diff`, see
+        `_get_next_mask_diff`.
+        """
+        value = _mask_prev(mask, x)
+        if value is not None:
+            return value - x
+        if range_val is None:
+            return None
+        value = _mask_prev(mask, range_val)
+        if value is None:
+            return -range_val
+        return value - x - range_val
+
     @staticmethod
     def _get_nth_weekday_of_month(year, month, day_of_week):
         """For a given year/month return a list of days in nth-day-of-month order.
         The last weekday of the month is always [-1].
         """
-        w = (day_of_week + 6) % 7
-        c = calendar.Calendar(w).monthdayscalendar(year, month)
-        if c[0][0] == 0:
-            c.pop(0)
-        return tuple(i[0] for i in c)
+        days = croniter.DAYS[month - 1] + (month == 2 and croniter.is_leap(year))
+        return tuple(range(1 + (day_of_week - _first_weekday(year, month)) % 7, days + 1, 7))
 
     @staticmethod
     def is_leap(year):
@@ -818,14 +1188,12 @@ class croniter(object):
             val = cls.LOWMAP[field_index][val]
         return val
 
-    @classmethod
-    def _expand(
-        cls,
-        expr_format,
-        hash_id=None,
-        second_at_beginning=False,
-        from_timestamp=None,
-    ):
+    @staticmethod
+    def _split_expression(expr_format, hash_id=None, second_at_beginning=False):
+        """
+        Resolve `@` aliases and split an expression into its lowercased
+        fields, the second field being moved to its own (6th) position.
+        """
         # Split the expression in components, and normalize L -> l, MON -> mon,
         # etc. Keep expr_format untouched so we can use it in the exception
         # messages.
@@ -849,219 +1217,272 @@ class croniter(object):
         expressions = efl.split()
 
         if len(expressions) not in VALID_LEN_EXPRESSION:
-            raise CroniterBadCronError("Exactly 5, 6 or 7 columns has to be specified for iterator expression.")
+            raise CroniterBadCronError(
+                "Exactly 5, 6 or 7 columns has to be specified for iterator expression.", code="columns"
+            )
 
         if len(expressions) > UNIX_CRON_LEN and second_at_beginning:
             # move second to it's own(6th) field to process by same logical
             expressions.insert(SECOND_FIELD, expressions.pop(0))
 
+        return efl, expressions
+
+    @classmethod
+    def _expand(
+        cls,
+        expr_format,
+        hash_id=None,
+        second_at_beginning=False,
+        from_timestamp=None,
+    ):
+        efl, expressions = cls._split_expression(expr_format, hash_id, second_at_beginning)
+
         expanded = []
         nth_weekday_of_month = {}
 
-        for field_index, expr in enumerate(expressions):
-            for expanderid, expander in EXPANDERS.items():
-                expr = expander(cls).expand(
-                    efl,
-                    field_index,
-                    expr,
-                    hash_id=hash_id,
-                    from_timestamp=from_timestamp,
+        field_index = None
+        try:
+            for field_index, expr in enumerate(expressions):
+                expanded.append(
+                    cls._expand_field(
+                        efl,
+                        field_index,
+                        expr,
+                        expressions,
+                        nth_weekday_of_month,
+                        expr_format=expr_format,
+                        hash_id=hash_id,
+                        from_timestamp=from_timestamp,
+                    )
                 )
+        except CroniterBadCronError as exc:
+            if exc.field_index is None:
+                exc.field_index = field_index
+                exc.token = exc.token or expressions[field_index]
+            raise
+        except ValueError as exc:
+            raise CroniterBadCronError(
+                "[{0}] is not acceptable: {1}".format(expr_format, exc),
+                field_index=field_index,
+                token=expressions[field_index],
+            )
 
-            if "?" in expr:
-                if expr != "?":
-                    raise CroniterBadCronError(
-                        "[{0}] is not acceptable. Question mark can not used with other characters".format(expr_format)
-                    )
-                if field_index not in [DAY_FIELD, DOW_FIELD]:
-                    raise CroniterBadCronError(
-                        "[{0}] is not acceptable. Question mark can only used in day_of_month or day_of_week".format(
-                            expr_format
-                        )
-                    )
-                # currently just trade `?` as `*`
-                expr = "*"
-
-            e_list = expr.split(",")
-            res = []
-
-            while len(e_list) > 0:
-                e = e_list.pop()
-                nth = None
-
-                if field_index == DOW_FIELD:
-                    # Handle special case in the dow expression: 2#3, l3
-                    special_dow_rem = special_dow_re.match(str(e))
-                    if special_dow_rem:
-                        g = special_dow_rem.groupdict()
-                        he, last = g.get("he", ""), g.get("last", "")
-                        if he:
-                            e = he
-                            try:
-                                nth = int(last)
-                                assert 5 >= nth >= 1
-                            except (KeyError, ValueError, AssertionError):
-                                raise CroniterBadCronError(
-                                    "[{0}] is not acceptable. Invalid day_of_week value: '{1}'".format(
-                                        expr_format, nth
-                                    )
-                                )
-                        elif last:
-                            e = last
-                            nth = g["pre"]  # 'l'
-
-                # Before matching step_search_re, normalize "*" to "{min}-{max}".
-                # Example: in the minute field, "*/5" normalizes to "0-59/5"
-                t = re.sub(
-                    r"^\*(\/.+)$",
-                    r"%d-%d\1" % (cls.RANGES[field_index][0], cls.RANGES[field_index][1]),
-                    str(e),
+        # Check to make sure the dow combo in use is supported
+        if nth_weekday_of_month:
+            dow_expanded_set = set(expanded[DOW_FIELD])
+            dow_expanded_set = dow_expanded_set.difference(nth_weekday_of_month.keys())
+            dow_expanded_set.discard("*")
+            # Skip: if it's all weeks instead of wildcard
+            if dow_expanded_set and len(set(expanded[DOW_FIELD])) != cls.LEN_MEANS_ALL[DOW_FIELD]:
+                raise CroniterUnsupportedSyntaxError(
+                    "day-of-week field does not support mixing literal values and nth day of week syntax.  "
+                    "Cron: '{}'    dow={} vs nth={}".format(expr_format, dow_expanded_set, nth_weekday_of_month),
+                    field_index=DOW_FIELD,
+                    token=expressions[DOW_FIELD],
                 )
-                m = step_search_re.search(t)
-
-                if not m:
-                    # Before matching step_search_re,
-                    # normalize "{start}/{step}" to "{start}-{max}/{step}".
-                    # Example: in the minute field, "10/5" normalizes to "10-59/5"
-                    t = re.sub(
-                        r"^(.+)\/(.+)$",
-                        r"\1-%d/\2" % (cls.RANGES[field_index][1]),
-                        str(e),
-                    )
-                    m = step_search_re.search(t)
 
-                if m:
-                    # early abort if low/high are out of bounds
-                    (low, high, step) = m.group(1), m.group(2), m.group(4) or 1
-                    if field_index == DAY_FIELD and high == "l":
-                        high = "31"
+        EXPRESSIONS[(expr_format, hash_id, second_at_beginning)] = expressions
+        return expanded, nth_weekday_of_month
+
+    @staticmethod
+    def _split_nth(e, expr_format=None):
+        """
+        Split a day of week element into its weekday part and its nth
+        qualifier: `sat#3` gives `("sat", 3)`, `l5` gives `("5", "l")`.
+        Elements without qualifier are returned with a `None` nth.
+        """
+        if e[:1] == "l" and e[1:].isdigit():
+            return e[1:], "l"
+        he, sep, last = e.partition("#")
+        if not (sep and he and last.isdigit()):
+            return e, None
+        low, sep, high = he.partition("-")
+        if sep:
+            if not ((low in DOW_ALPHAS and high in DOW_ALPHAS) or (low in M_ALPHAS and high in M_ALPHAS)):
+                return e, None
+        elif not all(c == "_" or c.isalnum() for c in he):
+            return e, None
+        nth = int(last)
+        if not 5 >= nth >= 1:
+            raise CroniterBadCronError(
+                "[{0}] is not acceptable. Invalid day_of_week value: '{1}'".format(expr_format, nth),
+                code="nth",
+                token=e,
+            )
+        return he, nth
+
+    @classmethod
+    def _split_range(cls, field_index, e):
+        """
+        Split a field element into its `(low, high, step)` tokens, `*/5`
+        and `10/5` being read as `{min}-{max}/5` and `10-{max}/5`.
+        Return None if `e` is not a range.
+        """
+        if e[:2] == "*/" and e[2:].isdigit():
+            return str(cls.RANGES[field_index][0]), str(cls.RANGES[field_index][1]), e[2:]
+        if e.count("-") == 1:
+            low, _, high = e.partition("-")
+            high, sep, step = high.partition("/")
+            if low and high and (step.isdigit() or not sep):
+                return low, high, step or "1"
+        low, sep, step = e.rpartition("/")
+        if sep and low and step.isdigit() and "-" not in low:
+            return low, str(cls.RANGES[field_index][1]), step
+        return None
+
+    @classmethod
+    def _expand_field(
+        cls,
+        efl,
+        field_index,
+        expr,
+        expressions,
+        nth_weekday_of_month,
+        expr_format=None,
+        hash_id=None,
+        from_timestamp=None,
+    ):
+        """
+        Expand the field `expr` at `field_index` of the split `expressions`,
+        filling `nth_weekday_of_month` for the day of week field.
+        """
+        for expanderid, expander in EXPANDERS.items():
+            expr = expander(cls).expand(
+                efl,
+                field_index,
+                expr,
+                hash_id=hash_id,
+                from_timestamp=from_timestamp,
+            )
 
-                    if not only_int_re.search(low):
-                        low = "{0}".format(cls._alphaconv(field_index, low, expressions))
+        if "?" in expr:
+            if expr != "?":
+                raise CroniterBadCronError(
+                    "[{0}] is not acceptable. Question mark can not used with other characters".format(expr_format),
+                    code="question_mark",
+                )
+            if field_index not in [DAY_FIELD, DOW_FIELD]:
+                raise CroniterBadCronError(
+                    "[{0}] is not acceptable. Question mark can only used in day_of_month or day_of_week".format(
+                        expr_format
+                    ),
+                    code="question_mark",
+                )
+            # currently just trade `?` as `*`
+            expr = "*"
 
-                    if not only_int_re.search(high):
-                        high = "{0}".format(cls._alphaconv(field_index, high, expressions))
+        low_bound, high_bound = cls.RANGES[field_index][0], cls.RANGES[field_index][1]
+        res = set()
 
-                    # normally, it's already guarded by the RE that should not accept not-int values.
-                    if not only_int_re.search(str(step)):
-                        raise CroniterBadCronError(
-                            "[{0}] step '{2}' in field {1} is not acceptable".format(expr_format, field_index, step)
-                        )
-                    step = int(step)
-
-                    for band in low, high:
-                        if not only_int_re.search(str(band)):
-                            raise CroniterBadCronError(
-                                "[{0}] bands '{2}-{3}' in field {1} are not acceptable".format(
-                                    expr_format, field_index, low, high
-                                )
-                            )
-
-                    low, high = [cls.value_alias(int(_val), field_index, expressions) for _val in (low, high)]
-
-                    if max(low, high) > max(cls.RANGES[field_index][0], cls.RANGES[field_index][1]):
-                        raise CroniterBadCronError("{0} is out of bands".format(expr_format))
-
-                    if from_timestamp:
-                        low = cls._get_low_from_current_date_number(field_index, int(step), int(from_timestamp))
-
-                    # Handle when the second bound of the range is in backtracking order:
-                    # eg: X-Sun or X-7 (Sat-Sun) in DOW, or X-Jan (Apr-Jan) in MONTH
-                    if low > high:
-                        whole_field_range = list(
-                            range(
-                                cls.RANGES[field_index][0],
-                                cls.RANGES[field_index][1] + 1,
-                                1,
-                            )
-                        )
-                        # Add FirstBound -> ENDRANGE, respecting step
-                        rng = list(range(low, cls.RANGES[field_index][1] + 1, step))
-                        # Then 0 -> SecondBound, but skipping n first occurences according to step
-                        # EG to respect such expressions : Apr-Jan/3
-                        to_skip = 0
-                        if rng:
-                            already_skipped = list(reversed(whole_field_range)).index(rng[-1])
-                            curpos = whole_field_range.index(rng[-1])
-                            if ((curpos + step) > len(whole_field_range)) and (already_skipped < step):
-                                to_skip = step - already_skipped
-                        rng += list(range(cls.RANGES[field_index][0] + to_skip, high + 1, step))
-                    # if we include a range type: Jan-Jan, or Sun-Sun,
-                    #  it means the whole cycle (all days of week, # all monthes of year, etc)
-                    elif low == high:
-                        rng = list(
-                            range(
-                                cls.RANGES[field_index][0],
-                                cls.RANGES[field_index][1] + 1,
-                                step,
-                            )
-                        )
-                    else:
-                        try:
-                            rng = list(range(low, high + 1, step))
-                        except ValueError as exc:
-                            raise CroniterBadCronError("invalid range: {0}".format(exc))
-
-                    rng = (
-                        ["{0}#{1}".format(item, nth) for item in rng]
-                        if field_index == DOW_FIELD and nth and nth != "l"
-                        else rng
+        def add(t, e, nth=None):
+            t = cls.value_alias(t, field_index, expressions)
+            if t not in ("*", "l") and (int(t) < low_bound or int(t) > high_bound):
+                raise CroniterBadCronError(
+                    "[{0}] is not acceptable, out of range".format(expr_format), code="out_of_range", token=e
+                )
+            res.add(t)
+            if field_index == DOW_FIELD and nth:
+                nth_weekday_of_month.setdefault(t, set()).add(nth)
+
+        # elements are handled from the last one, as errors were historically
+        # reported for the rightmost faulty element first
+        for e in reversed(expr.split(",")):
+            nth = None
+            if field_index == DOW_FIELD and ("#" in e or e[:1] == "l"):
+                # Handle special case in the dow expression: 2#3, l3
+                e, nth = cls._split_nth(e, expr_format)
+
+            bounds = cls._split_range(field_index, e)
+            if bounds is None:
+                if e.startswith("-"):
+                    raise CroniterBadCronError(
+                        "[{0}] is not acceptable," "negative numbers not allowed".format(expr_format),
+                        code="negative",
+                        token=e,
                     )
-                    e_list += [a for a in rng if a not in e_list]
+                if e == "*":
+                    t = e
+                elif e.isdigit():
+                    t = int(e)
                 else:
-                    if t.startswith("-"):
-                        raise CroniterBadCronError(
-                            "[{0}] is not acceptable," "negative numbers not allowed".format(expr_format)
-                        )
-                    if not star_or_int_re.search(t):
-                        t = cls._alphaconv(field_index, t, expressions)
-
+                    t = cls._alphaconv(field_index, e, expressions)
                     try:
                         t = int(t)
                     except ValueError:
                         pass
+                add(t, e, nth)
+                continue
 
-                    t = cls.value_alias(t, field_index, expressions)
-
-                    if t not in ["*", "l"] and (
-                        int(t) < cls.RANGES[field_index][0] or int(t) > cls.RANGES[field_index][1]
-                    ):
-                        raise CroniterBadCronError("[{0}] is not acceptable, out of range".format(expr_format))
+            # early abort if low/high are out of bounds
+            low, high, step = bounds
+            if field_index == DAY_FIELD and high == "l":
+                high = "31"
 
-                    res.append(t)
+            if not low.isdigit():
+                low = "{0}".format(cls._alphaconv(field_index, low, expressions))
 
-                    if field_index == DOW_FIELD and nth:
-                        if t not in nth_weekday_of_month:
-                            nth_weekday_of_month[t] = set()
-                        nth_weekday_of_month[t].add(nth)
+            if not high.isdigit():
+                high = "{0}".format(cls._alphaconv(field_index, high, expressions))
 
-            res = set(res)
-            res = sorted(res, key=lambda i: "{:02}".format(i) if isinstance(i, int) else i)
-            if len(res) == cls.LEN_MEANS_ALL[field_index]:
-                # Make sure the wildcard is used in the correct way (avoid over-optimization)
-                if (field_index == DAY_FIELD and "*" not in expressions[DOW_FIELD]) or (
-                    field_index == DOW_FIELD and "*" not in expressions[DAY_FIELD]
-                ):
-                    pass
-                else:
-                    res = ["*"]
+            step = int(step)
 
-            expanded.append(["*"] if (len(res) == 1 and res[0] == "*") else res)
+            for band in low, high:
+                if not band.isdigit():
+                    raise CroniterBadCronError(
+                        "[{0}] bands '{2}-{3}' in field {1} are not acceptable".format(
+                            expr_format, field_index, low, high
+                        ),
+                        code="range",
+                        token=e,
+                    )
 
-        # Check to make sure the dow combo in use is supported
-        if nth_weekday_of_month:
-            dow_expanded_set = set(expanded[DOW_FIELD])
-            dow_expanded_set = dow_expanded_set.difference(nth_weekday_of_month.keys())
-            dow_expanded_set.discard("*")
-            # Skip: if it's all weeks instead of wildcard
-            if dow_expanded_set and len(set(expanded[DOW_FIELD])) != cls.LEN_MEANS_ALL[DOW_FIELD]:
-                raise CroniterUnsupportedSyntaxError(
-                    "day-of-week field does not support mixing literal values and nth day of week syntax.  "
-                    "Cron: '{}'    dow={} vs nth={}".format(expr_format, dow_expanded_set, nth_weekday_of_month)
-                )
+            low, high = [cls.value_alias(int(_val), field_index, expressions) for _val in (low, high)]
+
+            if max(low, high) > max(low_bound, high_bound):
+                raise CroniterBadCronError("{0} is out of bands".format(expr_format), code="out_of_range", token=e)
+
+            if from_timestamp:
+                low = cls._get_low_from_current_date_number(field_index, int(step), int(from_timestamp))
+
+            # Handle when the second bound of the range is in backtracking order:
+            # eg: X-Sun or X-7 (Sat-Sun) in DOW, or X-Jan (Apr-Jan) in MONTH
+            if low > high:
+                whole_field_range = list(range(low_bound, high_bound + 1, 1))
+                # Add FirstBound -> ENDRANGE, respecting step
+                rng = list(range(low, high_bound + 1, step))
+                # Then 0 -> SecondBound, but skipping n first occurences according to step
+                # EG to respect such expressions : Apr-Jan/3
+                to_skip = 0
+                if rng:
+                    already_skipped = list(reversed(whole_field_range)).index(rng[-1])
+                    curpos = whole_field_range.index(rng[-1])
+                    if ((curpos + step) > len(whole_field_range)) and (already_skipped < step):
+                        to_skip = step - already_skipped
+                rng += list(range(low_bound + to_skip, high + 1, step))
+            # if we include a range type: Jan-Jan, or Sun-Sun,
+            #  it means the whole cycle (all days of week, # all monthes of year, etc)
+            elif low == high:
+                rng = list(range(low_bound, high_bound + 1, step))
+            else:
+                try:
+                    rng = list(range(low, high + 1, step))
+                except ValueError as exc:
+                    raise CroniterBadCronError("invalid range: {0}".format(exc), code="step", token=e)
+
+            for t in reversed(rng):
+                add(t, e, nth)
+
+        res = sorted(res, key=lambda i: "{:02}".format(i) if isinstance(i, int) else i)
+        if len(res) == cls.LEN_MEANS_ALL[field_index]:
+            # Make sure the wildcard is used in the correct way (avoid over-optimization)
+            if (field_index == DAY_FIELD and "*" not in expressions[DOW_FIELD]) or (
+                field_index == DOW_FIELD and "*" not in expressions[DAY_FIELD]
+            ):
+                pass
+            else:
+                res = ["*"]
 
-        EXPRESSIONS[(expr_format, hash_id, second_at_beginning)] = expressions
-        return expanded, nth_weekday_of_month
+        return ["*"] if (len(res) == 1 and res[0] == "*") else res
 
     @classmethod
     def expand(
@@ -1109,8 +1530,43 @@ class croniter(object):
         >>> croniter.expand('0 0 * * * */15')
         ([[0], [0], ['*'], ['*'], ['*'], [0, 15, 30, 45]], {})
         """
+        expanded, nth_weekday_of_month, _, _ = cls._expand_cached(
+            expr_format,
+            hash_id=hash_id,
+            second_at_beginning=second_at_beginning,
+            from_timestamp=from_timestamp,
+        )
+        return (
+            [list(field) for field in expanded],
+            dict((k, set(v)) for k, v in nth_weekday_of_month.items()),
+        )
+
+    @classmethod
+    def _expand_cached(
+        cls,
+        expr_format,
+        hash_id=None,
+        second_at_beginning=False,
+        from_timestamp=None,
+    ):
+        """
+        Return the `(expanded, nth_weekday_of_month, expressions, masks)`
+        compilation of an expression, served from `EXPAND_CACHE` when possible.
+
+        The returned structures are shared between all callers and must not
+        be mutated.
+
+        Expressions using random `R` values, or expanded relatively to
+        a start time, are never cached.
+        """
+        key = (cls, expr_format, hash_id, bool(second_at_beginning))
+        cacheable = from_timestamp is None and not any(token.startswith("r") for token in expr_format.lower().split())
+        if cacheable:
+            entry = EXPAND_CACHE.get(key)
+            if entry is not None:
+                return entry
         try:
-            return cls._expand(
+            expanded, nth_weekday_of_month = cls._expand(
                 expr_format,
                 hash_id=hash_id,
                 second_at_beginning=second_at_beginning,
@@ -1119,10 +1575,31 @@ class croniter(object):
         except (ValueError,) as exc:
             if isinstance(exc, CroniterError):
                 raise
-            if int(sys.version[0]) >= 3:
-                trace = _traceback.format_exc()
-                raise CroniterBadCronError(trace)
             raise CroniterBadCronError("{0}".format(exc))
+        _, expressions = cls._split_expression(expr_format, hash_id, second_at_beginning)
+        entry = (expanded, nth_weekday_of_month, expressions, cls._fields_masks(expanded))
+        if cacheable:
+            EXPAND_CACHE.set(key, entry)
+        return entry
+
+    @staticmethod
+    def _fields_masks(expanded):
+        """
+        Compile expanded fields into integer bitmasks where bit `i` is set
+        when the value `i` is allowed, `l` being stored as `LAST_DAY_BIT`.
+
+        Wildcard fields are compiled to None.
+        """
+        masks = []
+        for field in expanded:
+            if "*" in field:
+                masks.append(None)
+                continue
+            mask = 0
+            for value in field:
+                mask |= LAST_DAY_BIT if value == "l" else 1 << value
+            masks.append(mask)
+        return tuple(masks)
 
     @classmethod
     def _get_low_from_current_date_number(cls, field_index, step, from_timestamp):
@@ -1154,59 +1631,1405 @@ class croniter(object):
             if not isinstance(hash_id, bytes):
                 hash_id = hash_id.encode(encoding)
         try:
-            cls.expand(expression, hash_id=hash_id, second_at_beginning=second_at_beginning)
+            cls._expand_cached(expression, hash_id=hash_id, second_at_beginning=second_at_beginning)
         except CroniterError:
             return False
         return True
 
     @classmethod
-    def match(cls, cron_expression, testdate, day_or=True, second_at_beginning=False):
-        return cls.match_range(cron_expression, testdate, testdate, day_or, second_at_beginning)
+    def validate_many(
+        cls,
+        expressions,
+        hash_ids=None,
+        encoding="UTF-8",
+        second_at_beginning=False,
+    ):
+        """
+        Validate an iterable of expressions, returning a list holding one
+        `ValidationResult` per expression, in order.
+
+        `hash_ids` is either a single hash_id used for every expression, or an
+        iterable of hash_ids matching `expressions`.
+
+        Duplicated inputs are only validated once, and valid expressions are
+        compiled into the shared `EXPAND_CACHE`. Invalid ones are described by
+        an error `code`, the `field_index` (eg: `MINUTE_FIELD`) and `token` of
+        the offending field when known, and a `message`:
+
+        - `columns`: not 5, 6 or 7 fields
+        - `out_of_range`: value out of the field bounds
+        - `range`, `step`: malformed range or step
+        - `negative`: negative number
+        - `not_alpha`: unknown day or month name
+        - `nth`: invalid `#n` day of week
+        - `question_mark`: misplaced `?`
+        - `unsupported`: unsupported combination of values
+        - `hash_id`: missing or invalid hash_id
+        - `type`: expression is not a string
+        - `invalid`: any other error
+        """
+        expressions = list(expressions)
+        if hash_ids is None or isinstance(hash_ids, (bytes, str)):
+            hash_ids = [hash_ids] * len(expressions)
+        else:
+            hash_ids = list(hash_ids)
+            if len(hash_ids) != len(expressions):
+                raise ValueError("hash_ids must have the same length as expressions")
+        results = []
+        seen = {}
+        for expression, hash_id in zip(expressions, hash_ids):
+            key = (expression, hash_id)
+            try:
+                result = seen[key]
+            except KeyError:
+                result = seen[key] = cls._validate(expression, hash_id, encoding, second_at_beginning)
+            except TypeError:  # unhashable input
+                result = cls._validate(expression, hash_id, encoding, second_at_beginning)
+            results.append(result)
+        return results
 
     @classmethod
-    def match_range(
+    def _validate(cls, expression, hash_id, encoding, second_at_beginning):
+        raw_hash_id = hash_id
+        if hash_id:
+            if not isinstance(hash_id, (bytes, str)):
+                return ValidationResult(
+                    expression, raw_hash_id, False, "hash_id", None, None, "hash_id must be bytes or UTF-8 string"
+                )
+            if not isinstance(hash_id, bytes):
+                hash_id = hash_id.encode(encoding)
+        if not isinstance(expression, str):
+            return ValidationResult(expression, raw_hash_id, False, "type", None, None, "expression must be a string")
+        try:
+            cls._expand_cached(expression, hash_id=hash_id, second_at_beginning=second_at_beginning)
+        except CroniterBadCronError as exc:
+            return ValidationResult(
+                expression, raw_hash_id, False, exc.code, exc.field_index, exc.token, "{0}".format(exc)
+            )
+        except CroniterError as exc:
+            return ValidationResult(expression, raw_hash_id, False, "invalid", None, None, "{0}".format(exc))
+        return ValidationResult(expression, raw_hash_id, True, None, None, None, None)
+
+    @classmethod
+    def expand_hashed_many(
         cls,
-        cron_expression,
-        from_datetime,
-        to_datetime,
-        day_or=True,
+        template,
+        hash_ids,
         second_at_beginning=False,
+        day_or=True,
+        implement_cron_bug=False,
+        encoding="UTF-8",
     ):
-        cron = cls(
-            cron_expression,
-            to_datetime,
-            ret_type=datetime.datetime,
-            day_or=day_or,
-            second_at_beginning=second_at_beginning,
-        )
-        tdp = cron.get_current(datetime.datetime)
-        if not tdp.microsecond:
-            tdp += relativedelta(microseconds=1)
-        cron.set_current(tdp, force=True)
-        try:
-            tdt = cron.get_prev()
-        except CroniterBadDateError:
-            return False
-        precision_in_seconds = 1 if len(cron.expanded) > UNIX_CRON_LEN else 60
-        duration_in_second = (to_datetime - from_datetime).total_seconds() + precision_in_seconds
-        return (max(tdp, tdt) - min(tdp, tdt)).total_seconds() < duration_in_second
+        """
+        Compile a hashed `template` (eg: `H H * * *`) for many `hash_ids`.
 
+        The template is parsed once and each hash_id is hashed once, its
+        hashed values being substituted into the fields of the template.
+        Return an ordered mapping of each distinct `CronSchedule` to the list
+        of the hash_ids expanding to it.
 
-def croniter_range(
-    start,
-    stop,
-    expr_format,
-    ret_type=None,
-    day_or=True,
-    exclude_ends=False,
-    _croniter=None,
+        >>> groups = croniter.expand_hashed_many("H H * * *", ["job1", "job2"])
+        """
+        ids = []
+        for raw_hash_id in hash_ids:
+            hash_id = raw_hash_id
+            if not isinstance(hash_id, (bytes, str)):
+                raise TypeError("hash_id must be bytes or UTF-8 string")
+            if not isinstance(hash_id, bytes):
+                hash_id = hash_id.encode(encoding)
+            ids.append((hash_id, raw_hash_id))
+        schedules = OrderedDict()
+        if not ids:
+            return schedules
+
+        # validate the template, and expand its non hashed fields once for all
+        expanded, nth_weekday_of_month = cls._expand(
+            template, hash_id=ids[0][0], second_at_beginning=second_at_beginning
+        )
+        efl, expressions = cls._split_expression(template, ids[0][0], second_at_beginning)
+        expander = HashExpander(cls)
+        hashed = []
+        for field_index, expr in enumerate(expressions):
+            match = expander.match(efl, field_index, expr)
+            if match:
+                hashed.append((field_index, expr, match))
+
+        groups = OrderedDict()
+        fields = {}
+        for hash_id, raw_hash_id in ids:
+            crc = binascii.crc32(hash_id) & 0xFFFFFFFF
+            concrete = list(expanded)
+            for field_index, expr, match in hashed:
+                value = expander.expand(efl, field_index, expr, hash_id=hash_id, match=match, crc=crc)
+                field = fields.get((field_index, value))
+                if field is None:
+                    try:
+                        field = cls._expand_field(efl, field_index, value, expressions, {}, expr_format=template)
+                    except CroniterBadCronError as exc:
+                        exc.field_index = field_index
+                        exc.token = expr
+                        raise
+                    field = fields[(field_index, value)] = tuple(field)
+                concrete[field_index] = field
+            concrete = tuple(tuple(field) for field in concrete)
+            if concrete in groups:
+                groups[concrete][1].append(raw_hash_id)
+            else:
+                groups[concrete] = (hash_id, [raw_hash_id])
+
+        for concrete, (hash_id, group) in groups.items():
+            concrete = [list(field) for field in concrete]
+            schedule = CronSchedule(
+                template,
+                hash_id=hash_id,
+                day_or=day_or,
+                implement_cron_bug=implement_cron_bug,
+                second_at_beginning=second_at_beginning,
+                _croniter=cls,
+                _compiled=(concrete, nth_weekday_of_month, expressions, cls._fields_masks(concrete)),
+            )
+            schedules[schedule] = group
+        return schedules
+
+    @classmethod
+    def canonicalize(
+        cls,
+        expr_format,
+        hash_id=None,
+        day_or=True,
+        implement_cron_bug=False,
+        second_at_beginning=False,
+    ):
+        """
+        Return the `CanonicalForm` (expression, day_or, fingerprint) of an
+        expression, see `CronSchedule.canonical`.
+
+        >>> croniter.canonicalize("@midnight").expression
+        '0 0 * * *'
+        """
+        return CronSchedule(
+            expr_format,
+            hash_id=hash_id,
+            day_or=day_or,
+            implement_cron_bug=implement_cron_bug,
+            second_at_beginning=second_at_beginning,
+            _croniter=cls,
+        ).canonical()
+
+    @classmethod
+    def frequency(
+        cls,
+        expr_format,
+        start,
+        stop,
+        period=None,
+        hash_id=None,
+        day_or=True,
+        implement_cron_bug=False,
+        second_at_beginning=False,
+    ):
+        """
+        Count the matches of an expression in `[start, stop)`, in total or
+        per `period`, see `CronSchedule.frequency`.
+
+        >>> croniter.frequency("0 9 * * mon-fri", datetime.date(2024, 1, 1), datetime.date(2025, 1, 1))
+        262
+        """
+        return CronSchedule(
+            expr_format,
+            hash_id=hash_id,
+            day_or=day_or,
+            implement_cron_bug=implement_cron_bug,
+            second_at_beginning=second_at_beginning,
+            _croniter=cls,
+        ).frequency(start, stop, period=period)
+
+    @classmethod
+    def match(cls, cron_expression, testdate, day_or=True, second_at_beginning=False):
+        return cls.match_range(cron_expression, testdate, testdate, day_or, second_at_beginning)
+
+    @classmethod
+    def match_range(
+        cls,
+        cron_expression,
+        from_datetime,
+        to_datetime,
+        day_or=True,
+        second_at_beginning=False,
+    ):
+        cron = cls(
+            cron_expression,
+            to_datetime,
+            ret_type=datetime.datetime,
+            day_or=day_or,
+            second_at_beginning=second_at_beginning,
+        )
+        tdp = cron.get_current(datetime.datetime)
+        if not tdp.microsecond:
+            tdp += datetime.timedelta(microseconds=1)
+        cron.set_current(tdp, force=True)
+        try:
+            tdt = cron.get_prev()
+        except CroniterBadDateError:
+            return False
+        precision_in_seconds = 1 if len(cron.expanded) > UNIX_CRON_LEN else 60
+        duration_in_second = (to_datetime - from_datetime).total_seconds() + precision_in_seconds
+        return (max(tdp, tdt) - min(tdp, tdt)).total_seconds() < duration_in_second
+
+
+class CronSchedule(object):
+    """
+    Immutable, hashable and thread-shareable compiled cron expression.
+
+    A schedule only holds the parsed expression; iteration state lives in
+    the `croniter` cursors created by `cursor`, which can all share the same
+    schedule. `next_after` and `prev_before` compute a single match without
+    any cursor.
+
+    >>> schedule = CronSchedule("0 9 * * mon-fri")
+    >>> schedule.next_after(datetime.datetime(2024, 1, 5, 12))
+    datetime.datetime(2024, 1, 8, 9, 0)
+    """
+
+    __slots__ = (
+        "expr_format",
+        "hash_id",
+        "second_at_beginning",
+        "day_or",
+        "implement_cron_bug",
+        "expanded",
+        "nth_weekday_of_month",
+        "expressions",
+        "masks",
+        "fields",
+        "_croniter",
+        "_nth_weekday_of_month",
+        "_dom_dow_union",
+        "_date_key",
+        "_period",
+        "_steps",
+        "_day_times",
+        "_hash",
+    )
+
+    def __init__(
+        self,
+        expr_format,
+        hash_id=None,
+        day_or=True,
+        implement_cron_bug=False,
+        second_at_beginning=False,
+        from_timestamp=None,
+        _croniter=None,
+        _compiled=None,
+    ):
+        _croniter = _croniter or croniter
+        if hash_id:
+            if not isinstance(hash_id, (bytes, str)):
+                raise TypeError("hash_id must be bytes or UTF-8 string")
+            if not isinstance(hash_id, bytes):
+                hash_id = hash_id.encode("UTF-8")
+        if _compiled is None:
+            _compiled = _croniter._expand_cached(
+                expr_format,
+                hash_id=hash_id,
+                second_at_beginning=second_at_beginning,
+                from_timestamp=from_timestamp,
+            )
+        expanded, nth_weekday_of_month, expressions, masks = _compiled
+        setattr_ = super(CronSchedule, self).__setattr__
+        setattr_("expr_format", expr_format)
+        setattr_("hash_id", hash_id)
+        setattr_("second_at_beginning", bool(second_at_beginning))
+        setattr_("day_or", day_or)
+        setattr_("implement_cron_bug", implement_cron_bug)
+        setattr_("expanded", tuple(tuple(field) for field in expanded))
+        setattr_(
+            "nth_weekday_of_month",
+            tuple(sorted(((k, frozenset(v)) for k, v in nth_weekday_of_month.items()), key=lambda i: str(i[0]))),
+        )
+        setattr_("expressions", tuple(expressions))
+        setattr_("masks", masks)
+        setattr_("fields", CRON_FIELDS[len(expanded)])
+        setattr_("_croniter", _croniter)
+        setattr_("_nth_weekday_of_month", self._normalize_nth_weekday_of_month(nth_weekday_of_month))
+        # exception to support day of month and day of week as defined in cron:
+        # both are restricted, the union of them is searched.
+        # If requested, handle a bug in vixie cron/ISC cron where day_of_month and day_of_week form
+        # an intersection (AND) instead of a union (OR) if either field is an asterisk or starts with an asterisk
+        # (https://crontab.guru/cron-bug.html)
+        setattr_(
+            "_dom_dow_union",
+            bool(
+                day_or
+                and masks[DAY_FIELD] is not None
+                and masks[DOW_FIELD] is not None
+                and not (
+                    implement_cron_bug
+                    and (expressions[DAY_FIELD].startswith("*") or expressions[DOW_FIELD].startswith("*"))
+                )
+            ),
+        )
+        # key of the date fields in YEAR_DAYS_CACHE, None when every day matches
+        date_key = None
+        if (
+            masks[MONTH_FIELD] is not None
+            or masks[DAY_FIELD] is not None
+            or masks[DOW_FIELD] is not None
+            or self._nth_weekday_of_month
+            or (len(masks) == YEAR_CRON_LEN and masks[YEAR_FIELD] is not None)
+        ):
+            date_key = (
+                masks[YEAR_FIELD] if len(masks) == YEAR_CRON_LEN else None,
+                masks[MONTH_FIELD],
+                masks[DAY_FIELD],
+                masks[DOW_FIELD],
+                self._nth_weekday_of_month,
+                self._dom_dow_union,
+            )
+        setattr_("_date_key", date_key)
+        # `(period, offset)` of the schedules matching every `period` seconds
+        period = None
+        if date_key is None:
+            period = _fixed_period(masks)
+        setattr_("_period", period)
+        # the masks of the fields searched by `_calc` with its step function, forward then backward
+        has_seconds = len(masks) > UNIX_CRON_LEN
+        year_mask = masks[YEAR_FIELD] if len(masks) == YEAR_CRON_LEN else None
+        second_mask = masks[SECOND_FIELD] if has_seconds else None
+        fields = (year_mask, masks[HOUR_FIELD], masks[MINUTE_FIELD], second_mask, has_seconds)
+        setattr_(
+            "_steps",
+            (
+                (_croniter._get_next_mask_diff, 1, 0) + fields,
+                (_croniter._get_prev_mask_diff, -1, 86399) + fields,
+            ),
+        )
+        # schedules without seconds match at the second 0
+        setattr_("_day_times", _day_times(masks[HOUR_FIELD], masks[MINUTE_FIELD], second_mask if has_seconds else 1))
+        setattr_(
+            "_hash",
+            hash((self.expanded, self.nth_weekday_of_month, self.day_or, self._dom_dow_union)),
+        )
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CronSchedule is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("CronSchedule is immutable")
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if not isinstance(other, CronSchedule):
+            return NotImplemented
+        return (self.expanded, self.nth_weekday_of_month, self.day_or, self._dom_dow_union) == (
+            other.expanded,
+            other.nth_weekday_of_month,
+            other.day_or,
+            other._dom_dow_union,
+        )
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __repr__(self):
+        return "<CronSchedule {0!r}>".format(self.expr_format)
+
+    def canonical(self):
+        """
+        Return the `CanonicalForm` of the schedule: an expression which,
+        compiled with the returned `day_or`, gives back an equal schedule,
+        and a stable fingerprint shared by all the expressions matching the
+        same dates, whatever their spelling (`@midnight`, `0 0 ? * *`, ...).
+        """
+        expanded = [list(field) for field in self.expanded]
+        nth_weekday_of_month = dict(self._nth_weekday_of_month)
+        day, dow = expanded[DAY_FIELD], expanded[DOW_FIELD]
+        day_full = "*" in day or (set(range(1, 31)).issubset(day) and (31 in day or "l" in day))
+        dow_full = "*" in dow or set(range(7)).issubset(dow)
+        union = self._dom_dow_union
+        if union and nth_weekday_of_month:
+            # the union matches the `#n` weekdays alone, see `_calendar_month_days`
+            union, day_full = False, True
+        if not union:
+            # restricting to every day is a no-op in an intersection
+            if day_full:
+                expanded[DAY_FIELD] = ["*"]
+            if dow_full:
+                expanded[DOW_FIELD] = ["*"]
+        elif day_full or dow_full:
+            # one side of the union matches every day
+            expanded[DAY_FIELD] = expanded[DOW_FIELD] = ["*"]
+        # the union only differs from the intersection if both fields are restricted
+        day_or = self._dom_dow_union or "*" in expanded[DAY_FIELD] or "*" in expanded[DOW_FIELD]
+
+        # default seconds and years are implied by shorter expressions
+        if len(expanded) == YEAR_CRON_LEN and expanded[YEAR_FIELD] == ["*"]:
+            expanded.pop()
+        if len(expanded) == SECOND_CRON_LEN and expanded[SECOND_FIELD] == [0]:
+            expanded.pop()
+
+        fields = []
+        for field_index, field in enumerate(expanded):
+            tokens = self._canonical_tokens(field_index, field, nth_weekday_of_month)
+            if field_index == DOW_FIELD:
+                for weekday, nths in sorted(nth_weekday_of_month.items()):
+                    tokens += [
+                        "L{0}".format(weekday) if nth == "l" else "{0}#{1}".format(weekday, nth)
+                        for nth in sorted(nths, key=str)
+                    ]
+            fields.append(",".join(tokens))
+        expression = " ".join(fields)
+        fingerprint = hashlib.sha1("{0} {1}".format(expression, "or" if day_or else "and").encode("ascii"))
+        return CanonicalForm(expression, day_or, fingerprint.hexdigest())
+
+    def _canonical_tokens(self, field_index, field, nth_weekday_of_month):
+        if "*" in field:
+            return ["*"]
+        low, high = self._croniter.RANGES[field_index]
+        values = sorted(v for v in field if v != "l" and not (field_index == DOW_FIELD and v in nth_weekday_of_month))
+        tokens = []
+        step = values[1] - values[0] if len(values) > 2 else None
+        if step and all(b - a == step for a, b in zip(values, values[1:])):
+            if step > 1 and values[0] == low and values[-1] + step > high:
+                tokens.append("*/{0}".format(step))
+            elif step > 1:
+                tokens.append("{0}-{1}/{2}".format(values[0], values[-1], step))
+            else:
+                tokens.append("{0}-{1}".format(values[0], values[-1]))
+        else:
+            # compress runs of at least 3 consecutive values
+            run = []
+            for value in values + [None]:
+                if run and (value is None or value != run[-1] + 1):
+                    if len(run) > 2:
+                        tokens.append("{0}-{1}".format(run[0], run[-1]))
+                    else:
+                        tokens.extend(str(v) for v in run)
+                    run = []
+                if value is not None:
+                    run.append(value)
+        if "l" in field:
+            tokens.append("L")
+        return tokens
+
+    def __reduce__(self):
+        # expressions with random values must keep them, so pickle the compilation result
+        return (_restore_schedule, (self.__class__, tuple(getattr(self, k) for k in self.__slots__)))
+
+    @staticmethod
+    def _normalize_nth_weekday_of_month(nth_weekday_of_month):
+        """
+        Spread the `*` entry of a `nth_weekday_of_month` mapping over every
+        weekday, returning `((weekday, nths), ...)`.
+        """
+        nth = dict((k, set(v)) for k, v in nth_weekday_of_month.items())
+        if "*" in nth:
+            s = nth.pop("*")
+            for i in range(0, 7):
+                nth.setdefault(i, set()).update(s)
+        return tuple((wday, tuple(nth[wday])) for wday in sorted(nth))
+
+    def cursor(self, start_time=None, ret_type=float, is_prev=False, max_years_between_matches=None):
+        """
+        Return a `croniter` iterating over this schedule from `start_time`.
+        """
+        return self._croniter(
+            self,
+            start_time,
+            ret_type=ret_type,
+            is_prev=is_prev,
+            max_years_between_matches=max_years_between_matches,
+        )
+
+    def next_after(self, start_time, max_years_between_matches=50):
+        """
+        Return the first match after `start_time`, which can be a timestamp
+        or a (naive or timezone aware) datetime. The result has the type of
+        `start_time`.
+        """
+        return self._after(start_time, False, max_years_between_matches)
+
+    def prev_before(self, start_time, max_years_between_matches=50):
+        """
+        Return the last match before `start_time`, see `next_after`.
+        """
+        return self._after(start_time, True, max_years_between_matches)
+
+    def frequency(self, start, stop, period=None):
+        """
+        Count the matches in `[start, stop)` without iterating over them.
+
+        `start` and `stop` are dates or datetimes; aware datetimes are
+        counted on the wall clock of `start`, without DST adjustments.
+        Without `period`, return the total number of matches, otherwise an
+        `OrderedDict` mapping the start of each `day`, `week` (starting on
+        monday), `month` or `year` overlapping the interval to its count.
+        """
+        if period not in FREQUENCY_PERIODS:
+            raise ValueError("[{0}] is not a valid period, use one of {1}".format(period, FREQUENCY_PERIODS))
+        start, stop = _wall_clock(start), _wall_clock(stop, start)
+        counts = OrderedDict()
+        if period is not None:
+            key = _period_start(start, period)
+            while key < stop:
+                counts[key] = 0
+                key = _next_period_start(key, period)
+        if stop <= start:
+            return counts if period is not None else 0
+        if period is None and self._period is not None:
+            # matches in [first, last) seconds, with first = offset + k * period
+            every, offset = self._period
+            first, last = [
+                _days_from_civil(d.year, d.month, d.day) * 86400
+                + d.hour * 3600
+                + d.minute * 60
+                + d.second
+                + (1 if d.microsecond else 0)
+                for d in (start, stop)
+            ]
+            return (last - offset - 1) // every - (first - offset - 1) // every
+
+        times = self._times_of_day()
+        per_day = len(times[0]) * len(times[1]) * len(times[2])
+        start_day, stop_day = start.date(), stop.date()
+        total = 0
+        year, month = start_day.year, start_day.month
+        while (year, month) <= (stop_day.year, stop_day.month):
+            days = self._month_days(year, month)
+            if (year, month) == (start_day.year, start_day.month):
+                days &= ~((1 << start_day.day) - 1)
+            if (year, month) == (stop_day.year, stop_day.month):
+                # the day of `stop` is only partially counted, below
+                days &= (1 << stop_day.day) - 1
+            if days:
+                if period in (None, "month", "year"):
+                    count = bin(days).count("1") * per_day
+                    total += count
+                    if period is not None:
+                        counts[_period_start(datetime.datetime(year, month, 1), period)] += count
+                else:
+                    for day in range(1, 32):
+                        if days >> day & 1:
+                            total += per_day
+                            counts[_period_start(datetime.datetime(year, month, day), period)] += per_day
+            month += 1
+            if month > 12:
+                year, month = year + 1, 1
+
+        # partial first and last days
+        for bound, sign in ((start, -1), (stop, 1)):
+            if self._month_days(bound.year, bound.month) >> bound.day & 1:
+                count = sign * _count_before(times, bound)
+                total += count
+                if count and period is not None:
+                    counts[_period_start(bound, period)] += count
+        return counts if period is not None else total
+
+    def _times_of_day(self):
+        """
+        Return the sorted `(hours, minutes, seconds)` matched by the schedule.
+        """
+        masks = self.masks
+
+        def values(field_index, size):
+            if len(masks) <= field_index:
+                return [0]
+            mask = masks[field_index]
+            return [i for i in range(size) if mask is None or mask >> i & 1]
+
+        return values(HOUR_FIELD, 24), values(MINUTE_FIELD, 60), values(SECOND_FIELD, 60)
+
+    def _month_days(self, year, month):
+        """
+        Return the bitmask of the days of `month` matched by the schedule,
+        bit `i` standing for the day `i`.
+        """
+        masks = self.masks
+        if len(masks) == YEAR_CRON_LEN and masks[YEAR_FIELD] is not None and not masks[YEAR_FIELD] >> year & 1:
+            return 0
+        return self._calendar_month_days(year, month)
+
+    def _calendar_month_days(self, year, month):
+        """
+        Return the bitmask of the days of `month` matched by the month, day
+        of month and day of week fields, see `_month_days`.
+        """
+        masks = self.masks
+        if masks[MONTH_FIELD] is not None and not masks[MONTH_FIELD] >> month & 1:
+            return 0
+        cron = self._croniter
+        days = cron.DAYS[month - 1]
+        if month == 2 and cron.is_leap(year):
+            days += 1
+        full = ((1 << days) - 1) << 1
+        dom = full
+        if masks[DAY_FIELD] is not None:
+            dom = masks[DAY_FIELD] & full & ~LAST_DAY_BIT
+            if masks[DAY_FIELD] & LAST_DAY_BIT:
+                dom |= 1 << days
+        first_dow = _first_weekday(year, month)
+        if self._nth_weekday_of_month:
+            dow = 0
+            for wday, nths in self._nth_weekday_of_month:
+                # the first day of the month falling on `wday`, and the number of them
+                first = 1 + (wday - first_dow) % 7
+                count = (days - first) // 7 + 1
+                for n in nths:
+                    if n == "l":
+                        dow |= 1 << (first + 7 * (count - 1))
+                    elif n <= count:
+                        dow |= 1 << (first + 7 * (n - 1))
+        elif masks[DOW_FIELD] is not None:
+            # the days of the first week matched by the weekdays, repeated over the month
+            week = (masks[DOW_FIELD] >> first_dow | masks[DOW_FIELD] << (7 - first_dow)) & 0x7F
+            dow = week * WEEKS_REPEAT << 1 & full
+        else:
+            dow = full
+        if self._dom_dow_union:
+            # the `#n` weekdays restrict the day of month side too, which only
+            # matches some of them: the union matches the weekdays alone
+            if self._nth_weekday_of_month:
+                return dow
+            return dom | dow
+        return dom & dow
+
+    def _year_days(self, year):
+        """
+        Return `(first_day, days)` for `year`: the epoch day of its first
+        day, and the bitmask of its days matched by the schedule, bit `i`
+        standing for the `i`-th day of the year (from 0).
+
+        Entries are shared by the schedules with the same date fields in
+        `YEAR_DAYS_CACHE`.
+        """
+        key = (year, self._date_key)
+        entry = YEAR_DAYS_CACHE.get(key)
+        if entry is None:
+            cron = self._croniter
+            days = offset = 0
+            for month in range(1, cron.MONTHS_IN_YEAR + 1):
+                days |= (self._month_days(year, month) >> 1) << offset
+                offset += cron.DAYS[month - 1]
+                if month == 2 and cron.is_leap(year):
+                    offset += 1
+            entry = (_days_from_civil(year, 1, 1), days)
+            YEAR_DAYS_CACHE.set(key, entry)
+        return entry
+
+    def _year_kinds(self):
+        """
+        Return the bitmask of the kinds of years (see `_year_kind`) having
+        days matched by the month, day of month and day of week fields.
+
+        Entries are shared in `YEAR_DAYS_CACHE`, under the None year.
+        """
+        if self._date_key is None:
+            return (1 << 14) - 1
+        key = (None, self._date_key[1:])
+        kinds = YEAR_DAYS_CACHE.get(key)
+        if kinds is None:
+            kinds = seen = 0
+            # the years 2000 to 2027 are of all the kinds
+            for year in range(2000, 2028):
+                kind = _year_kind(year)
+                if not seen >> kind & 1:
+                    seen |= 1 << kind
+                    if any(self._calendar_month_days(year, month) for month in range(1, 13)):
+                        kinds |= 1 << kind
+            YEAR_DAYS_CACHE.set(key, kinds)
+        return kinds
+
+    def _matching_year(self, year, is_prev):
+        """
+        Return the closest year from `year` (included), forward or backward,
+        allowed by the year field and having matching days, or None if there
+        is none: the Gregorian calendar repeating every 400 years, there is
+        no need to look further.
+        """
+        kinds = self._year_kinds()
+        if not kinds:
+            return None
+        step = -1 if is_prev else 1
+        if len(self.masks) < YEAR_CRON_LEN or self.masks[YEAR_FIELD] is None:
+            for candidate in range(year, year + 400 * step, step):
+                if kinds >> _year_kind(candidate) & 1:
+                    return candidate
+            return None
+        year_mask = self.masks[YEAR_FIELD]
+        while True:
+            year = _mask_prev(year_mask, year) if is_prev else _mask_next(year_mask, year)
+            if year is None or kinds >> _year_kind(year) & 1:
+                return year
+            year += step
+
+    def _after(self, start_time, is_prev, max_years_between_matches):
+        tzinfo = None
+        timestamp = start_time
+        is_datetime = isinstance(start_time, datetime.datetime)
+        if is_datetime:
+            tzinfo = start_time.tzinfo
+            timestamp = datetime_to_timestamp(start_time)
+        result, dtresult, _ = self._next(
+            timestamp, timestamp, tzinfo, is_prev, max(int(max_years_between_matches), 1), is_datetime
+        )
+        if is_datetime:
+            return dtresult
+        return result
+
+    def _next(self, cur, dst_start_time, tzinfo, is_prev, max_years_between_matches, need_datetime=True):
+        """
+        Compute the match following (or preceding) the `cur` timestamp of
+        a cursor, returning `(timestamp, datetime, dst_start_time)`.
+
+        Without `tzinfo` there is no DST to handle, and the datetime is only
+        built when `need_datetime` is set (None otherwise).
+        """
+        utc = not tzinfo or _is_utc(tzinfo)
+        if self._period is not None and utc:
+            result = self._next_periodic(cur, is_prev)
+        else:
+            # the day of month / day of week union is part of the days bitmasks
+            result = self._calc(cur, tzinfo, is_prev, max_years_between_matches)
+
+        if utc:
+            # no DST to handle
+            return result, timestamp_to_datetime(result, tzinfo) if need_datetime else None, dst_start_time
+
+        zone = _tz_offsets(tzinfo)
+        if zone is not None:
+            # DST Handling for cron job spanning across days, on timestamps
+            start_offset = zone.offset(dst_start_time)
+            lag = zone.offset(result) - start_offset
+            if lag:
+                lag_hours = (result - dst_start_time) / 3600
+                hours_before_midnight = 24 - int((dst_start_time + start_offset) // 3600 % 24)
+                if (lag > 0 and abs(lag_hours) >= hours_before_midnight) or (
+                    lag < 0 and 3600 * abs(lag_hours) + abs(lag) >= hours_before_midnight * 3600
+                ):
+                    # keep the wall-clock time of the search with the offset of the match, if it exists with it
+                    adjusted = zone.resolve(result + start_offset, start_offset + lag)
+                    if adjusted is not None:
+                        result = adjusted
+                    dst_start_time = result
+            return result, timestamp_to_datetime(result, tzinfo) if need_datetime else None, dst_start_time
+
+        # DST Handling for cron job spanning across days
+        dtstarttime = timestamp_to_datetime(dst_start_time, tzinfo)
+        dtstarttime_utcoffset = dtstarttime.utcoffset() or datetime.timedelta(0)
+        dtresult = timestamp_to_datetime(result, tzinfo)
+        lag = lag_hours = 0
+        # do we trigger DST on next crontab (handle backward changes)
+        dtresult_utcoffset = dtstarttime_utcoffset
+        if dtresult and tzinfo:
+            dtresult_utcoffset = dtresult.utcoffset()
+            lag_hours = timedelta_to_seconds(dtresult - dtstarttime) / (60 * 60)
+            lag = timedelta_to_seconds(dtresult_utcoffset - dtstarttime_utcoffset)
+        hours_before_midnight = 24 - dtstarttime.hour
+        if dtresult_utcoffset != dtstarttime_utcoffset:
+            if (lag > 0 and abs(lag_hours) >= hours_before_midnight) or (
+                lag < 0 and ((3600 * abs(lag_hours) + abs(lag)) >= hours_before_midnight * 3600)
+            ):
+                dtresult_adjusted = dtresult - datetime.timedelta(seconds=lag)
+                result_adjusted = datetime_to_timestamp(dtresult_adjusted)
+                # Do the actual adjust only if the result time actually exists
+                if timestamp_to_datetime(result_adjusted, tzinfo).tzinfo == dtresult_adjusted.tzinfo:
+                    dtresult = dtresult_adjusted
+                    result = result_adjusted
+                dst_start_time = result
+        return result, dtresult, dst_start_time
+
+    def _next_many(self, cur, dst_start_time, tzinfo, is_prev, max_years_between_matches, count, need_datetime):
+        """
+        Compute the `count` matches following (or preceding) `cur` in a
+        single loop, returning `(timestamps, datetimes, dst_start_time)`
+        with the timestamps in an `array('d')`, see `_next`.
+        """
+        timestamps = array("d")
+        datetimes = [] if need_datetime else None
+        if tzinfo and not _is_utc(tzinfo):
+            # the DST adjustments depend on each match
+            for i in range(count):
+                cur, dtresult, dst_start_time = self._next(
+                    cur, dst_start_time, tzinfo, is_prev, max_years_between_matches, need_datetime
+                )
+                timestamps.append(cur)
+                if need_datetime:
+                    datetimes.append(dtresult)
+            return timestamps, datetimes, dst_start_time
+        if self._period is not None:
+            if count > 0:
+                first = self._next_periodic(cur, is_prev)
+                step = -self._period[0] if is_prev else self._period[0]
+                timestamps.extend(first + i * step for i in range(count))
+        elif count > 0:
+            # walk the times of the day of the first match, then the ones of the following matching days
+            hours, minutes, seconds = self._times_of_day()
+            per_hour = len(minutes) * len(seconds)
+            per_day = len(hours) * per_hour
+            step = -1 if is_prev else 1
+            days, sod = divmod(int(self._calc(cur, tzinfo, is_prev, max_years_between_matches)), 86400)
+            index = (
+                bisect_left(hours, sod // 3600) * per_hour
+                + bisect_left(minutes, sod // 60 % 60) * len(seconds)
+                + bisect_left(seconds, sod % 60)
+            )
+            year_start = year_end = None
+            for i in range(count):
+                if not 0 <= index < per_day:
+                    index = per_day - 1 if is_prev else 0
+                    days += step
+                    empty_years = 0
+                    while True:
+                        if year_start is None or not year_start <= days < year_end:
+                            year = _civil_from_days(days)[0]
+                            year_start, year_days = self._year_days(year)
+                            year_end = year_start + 366 if self._croniter.is_leap(year) else year_start + 365
+                        doy = days - year_start
+                        doy = _mask_prev(year_days, doy) if is_prev else _mask_next(year_days, doy)
+                        if doy is not None:
+                            days = year_start + doy
+                            break
+                        matching_year = self._matching_year(year + step, is_prev)
+                        if matching_year is not None:
+                            empty_years += abs(matching_year - year)
+                        if (
+                            matching_year is None
+                            or empty_years > max_years_between_matches
+                            or not datetime.MINYEAR <= matching_year <= datetime.MAXYEAR
+                        ):
+                            raise CroniterBadDateError("failed to find {0} date".format("prev" if is_prev else "next"))
+                        days = (
+                            _days_from_civil(matching_year, 12, 31)
+                            if is_prev
+                            else _days_from_civil(matching_year, 1, 1)
+                        )
+                timestamps.append(
+                    days * 86400
+                    + hours[index // per_hour] * 3600
+                    + minutes[index // len(seconds) % len(minutes)] * 60
+                    + seconds[index % len(seconds)]
+                )
+                index += step
+        if need_datetime:
+            datetimes.extend(timestamp_to_datetime(timestamp, tzinfo) for timestamp in timestamps)
+        return timestamps, datetimes, dst_start_time
+
+    def _skip(self, match, count, is_prev, tzinfo, max_years_between_matches):
+        """
+        Return the timestamp lying `count` matches after (or before) the
+        `match` timestamp, counting the matches of the days and years in
+        between. Return None for timezones with DST, whose wall-clock
+        matches can not be counted.
+        """
+        if tzinfo and not _is_utc(tzinfo):
+            return None
+        sign = -1 if is_prev else 1
+        if self._period is not None:
+            return match + sign * count * self._period[0]
+
+        hours, minutes, seconds = self._times_of_day()
+        per_hour = len(minutes) * len(seconds)
+        per_day = len(hours) * per_hour
+        days, sod = divmod(int(match), 86400)
+        index = (
+            bisect_left(hours, sod // 3600) * per_hour
+            + bisect_left(minutes, sod // 60 % 60) * len(seconds)
+            + bisect_left(seconds, sod % 60)
+            + sign * count
+        )
+        if not 0 <= index < per_day:
+            # count the matches left after (or before) the day of `match`
+            count = -index if is_prev else index - per_day + 1
+            year = _civil_from_days(days)[0]
+            year_start, year_days = self._year_days(year)
+            doy = days - year_start
+            if is_prev:
+                year_days &= (1 << doy) - 1
+            else:
+                year_days = year_days >> (doy + 1) << (doy + 1)
+            empty_years = 0
+            while True:
+                matches = bin(year_days).count("1") * per_day
+                if count <= matches:
+                    break
+                count -= matches
+                empty_years = 0 if matches else empty_years + 1
+                matching_year = self._matching_year(year + sign, is_prev)
+                if matching_year is not None:
+                    empty_years += abs(matching_year - year) - 1
+                if (
+                    matching_year is None
+                    or empty_years > max_years_between_matches
+                    or not datetime.MINYEAR <= matching_year <= datetime.MAXYEAR
+                ):
+                    raise CroniterBadDateError("failed to find {0} date".format("prev" if is_prev else "next"))
+                year = matching_year
+                year_start, year_days = self._year_days(year)
+            skipped_days, index = divmod(count - 1, per_day)
+            for i in range(skipped_days):
+                if is_prev:
+                    year_days ^= 1 << (year_days.bit_length() - 1)
+                else:
+                    year_days &= year_days - 1
+            if is_prev:
+                days = year_start + year_days.bit_length() - 1
+                index = per_day - 1 - index
+            else:
+                days = year_start + (year_days & -year_days).bit_length() - 1
+        return float(
+            days * 86400
+            + hours[index // per_hour] * 3600
+            + minutes[index // len(seconds) % len(minutes)] * 60
+            + seconds[index % len(seconds)]
+        )
+
+    def _next_periodic(self, now, is_prev):
+        """
+        Find the match following (or preceding) the `now` timestamp of a
+        schedule matching every `_period` seconds, in UTC.
+        """
+        period, offset = self._period
+        has_seconds = len(self.masks) > UNIX_CRON_LEN
+        if is_prev:
+            now = int(math.ceil(now))
+            now -= 1 if (has_seconds or now % 60 > 0) else 60
+            return float(now - (now - offset) % period)
+        now = int(math.floor(now))
+        now += 1 if has_seconds else 60
+        if not has_seconds:
+            now -= now % 60
+        return float(now + (offset - now) % period)
+
+    def _calc(self, now, tzinfo, is_prev, max_years_between_matches):
+        """
+        Find the next (or previous) match of the schedule after the `now`
+        timestamp, matching wall-clock time in `tzinfo`.
+
+        The search runs on integer epoch days and seconds of the day: each
+        field moves the candidate to its nearest allowed value, resetting
+        the smaller fields, and the pass restarts from the year whenever
+        the candidate moved. Days are found by scanning the bitmask of the
+        matching days of the year, see `_year_days`.
+        """
+        # `reset_sod` is the second of the day the smaller fields are reset to
+        steps = self._steps[bool(is_prev)]
+        nearest_diff_method, sign, reset_sod, year_mask, hour_mask, minute_mask, second_mask, has_seconds = steps
+        if is_prev:
+            now = int(math.ceil(now))
+            offset = 1 if (has_seconds or now % 60 > 0) else 60
+        else:
+            now = int(math.floor(now))
+            offset = 1 if has_seconds else 60
+
+        dst = None
+        utc_offset = 0
+        zone = _tz_offsets(tzinfo) if tzinfo else None
+        if zone is not None:
+            # wall-clock times are resolved with the UTC offset of the start
+            utc_offset = zone.offset(now + sign * offset)
+        elif tzinfo:
+            dst = timestamp_to_datetime(now + sign * offset, tzinfo)
+            year, month, day = dst.year, dst.month, dst.day
+            days = _days_from_civil(year, month, day)
+            sod = dst.hour * 3600 + dst.minute * 60 + dst.second
+        if dst is None:
+            days, sod = divmod(now + sign * offset + utc_offset, 86400)
+            year, month, day = _civil_from_days(days)
+
+        current_year = year
+        day_times = self._day_times
+        any_day = self._date_key is None
+        days_year = year_days = year_start = None
+
+        while abs(year - current_year) <= max_years_between_matches:
+            if year_mask is not None:
+                # use None as range_val to indicate no loop
+                diff = nearest_diff_method(year, year_mask, None)
+                if diff is None:
+                    break
+                if diff != 0:
+                    year += diff
+                    month, day = (12, 31) if is_prev else (1, 1)
+                    days, sod = _days_from_civil(year, month, day), reset_sod
+                    continue
+
+            # month, day of month and day of week at once
+            if not any_day:
+                if days_year != year:
+                    days_year = year
+                    year_start, year_days = self._year_days(year)
+                    if not year_days:
+                        # jump to the closest year having matching days at once
+                        year = self._matching_year(year, is_prev)
+                        if year is None:
+                            break
+                        month, day = (12, 31) if is_prev else (1, 1)
+                        days, sod = _days_from_civil(year, month, day), reset_sod
+                        continue
+                doy = days - year_start
+                if not year_days >> doy & 1:
+                    if is_prev:
+                        found = _mask_prev(year_days, doy)
+                        # or the last day of the previous year
+                        diff = -1 - doy if found is None else found - doy
+                    else:
+                        found = _mask_next(year_days, doy)
+                        # or the first day of the next year
+                        diff = (366 if self._croniter.is_leap(year) else 365) - doy if found is None else found - doy
+                    days, sod = days + diff, reset_sod
+                    year, month, day = _civil_from_days(days)
+                    continue
+
+            if day_times is not None:
+                # the time of day at once
+                if not has_seconds:
+                    sod -= sod % 60
+                index = bisect_right(day_times, sod) - 1 if is_prev else bisect_left(day_times, sod)
+                if index < 0 or index == len(day_times):
+                    # search from the next (or previous) day
+                    days, sod = days + sign, reset_sod
+                    year, month, day = _civil_from_days(days)
+                    continue
+                sod = day_times[index]
+            else:
+                if hour_mask is not None:
+                    diff = nearest_diff_method(sod // 3600, hour_mask, 24)
+                    if diff is not None and diff != 0:
+                        sod = (sod // 3600 + diff) * 3600 + (3599 if is_prev else 0)
+                        carry, sod = divmod(sod, 86400)
+                        if carry:
+                            days += carry
+                            year, month, day = _civil_from_days(days)
+                        continue
+
+                if minute_mask is not None:
+                    diff = nearest_diff_method(sod // 60 % 60, minute_mask, 60)
+                    if diff is not None and diff != 0:
+                        sod = (sod // 60 + diff) * 60 + (59 if is_prev else 0)
+                        carry, sod = divmod(sod, 86400)
+                        if carry:
+                            days += carry
+                            year, month, day = _civil_from_days(days)
+                        continue
+
+                if not has_seconds:
+                    sod -= sod % 60
+                elif second_mask is not None:
+                    diff = nearest_diff_method(sod % 60, second_mask, 60)
+                    if diff is not None and diff != 0:
+                        carry, sod = divmod(sod + diff, 86400)
+                        if carry:
+                            days += carry
+                            year, month, day = _civil_from_days(days)
+                        continue
+
+            if dst is None:
+                return float(days * 86400 + sod - utc_offset)
+            return datetime_to_timestamp(
+                dst.replace(
+                    year=year,
+                    month=month,
+                    day=day,
+                    hour=sod // 3600,
+                    minute=sod // 60 % 60,
+                    second=sod % 60,
+                    microsecond=0,
+                )
+            )
+
+        if is_prev:
+            raise CroniterBadDateError("failed to find prev date")
+        raise CroniterBadDateError("failed to find next date")
+
+
+FREQUENCY_PERIODS = (None, "day", "week", "month", "year")
+
+
+def _wall_clock(value, reference=None):
+    """
+    Return `value` as a naive datetime on the wall clock of the
+    `reference` datetime timezone.
+    """
+    if not isinstance(value, datetime.datetime):
+        return datetime.datetime(value.year, value.month, value.day)
+    if value.tzinfo is not None:
+        if isinstance(reference, datetime.datetime) and reference.tzinfo is not None:
+            value = value.astimezone(reference.tzinfo)
+        value = value.replace(tzinfo=None)
+    return value
+
+
+def _period_start(value, period):
+    if period == "year":
+        return datetime.datetime(value.year, 1, 1)
+    if period == "month":
+        return datetime.datetime(value.year, value.month, 1)
+    value = datetime.datetime(value.year, value.month, value.day)
+    if period == "week":
+        value -= datetime.timedelta(days=value.weekday())
+    return value
+
+
+def _next_period_start(value, period):
+    if period == "year":
+        return value.replace(year=value.year + 1)
+    if period == "month":
+        if value.month == 12:
+            return value.replace(year=value.year + 1, month=1)
+        return value.replace(month=value.month + 1)
+    return value + datetime.timedelta(days=7 if period == "week" else 1)
+
+
+def _count_before(times, value):
+    """
+    Count the `(hours, minutes, seconds)` times of day before the time of
+    the `value` datetime.
+    """
+    hours, minutes, seconds = times
+    second = value.second + (1 if value.microsecond else 0)
+    count = bisect_left(hours, value.hour) * len(minutes) * len(seconds)
+    if value.hour in hours:
+        count += bisect_left(minutes, value.minute) * len(seconds)
+        if value.minute in minutes:
+            count += bisect_left(seconds, second)
+    return count
+
+
+_SCHEDULE_SLOTS_SETTERS = tuple(getattr(CronSchedule, name).__set__ for name in CronSchedule.__slots__)
+
+
+def _restore_schedule(cls, values):
+    schedule = cls.__new__(cls)
+    for setter, value in zip(_SCHEDULE_SLOTS_SETTERS, values):
+        setter(schedule, value)
+    return schedule
+
+
+# Binary format of dump_schedules, all integers little endian:
+#   header: magic, format version, number of schedules
+#   schedule: flags (day_or, implement_cron_bug, second_at_beginning,
+#             has hash_id), expression length, hash_id length, compiled
+#             length, expression (UTF-8), hash_id, compiled expression
+#   compiled: number of fields, fields, nth weekdays
+#   field: flags (has `*`, has `l`), smallest value, mask length, mask of
+#          the values relative to the smallest one (big endian)
+#   nth weekdays: number of weekdays, then per weekday its value (255 for
+#                 `*`) and a mask of its nths (bit 0 standing for `l`)
+SCHEDULES_FORMAT_VERSION = 1
+SCHEDULES_MAGIC = b"CRSC"
+_SCHEDULES_HEADER = struct.Struct("<4sBI")
+_SCHEDULE_HEADER = struct.Struct("<BHHH")
+_SCHEDULE_FIELD = struct.Struct("<BHB")
+_NTH_ENTRY = struct.Struct("<BB")
+_BYTE = struct.Struct("<B")
+# largest length of an expression, hash_id or compiled expression
+_MAX_LENGTH = 0xFFFF
+
+
+def _dump_compiled(schedule):
+    chunks = [_BYTE.pack(len(schedule.expanded))]
+    for field in schedule.expanded:
+        values = [value for value in field if value not in ("*", "l")]
+        low = min(values) if values else 0
+        mask = 0
+        for value in values:
+            mask |= 1 << (value - low)
+        mask = "{0:x}".format(mask) if values else ""
+        mask = binascii.unhexlify("0" * (len(mask) % 2) + mask)
+        chunks.append(_SCHEDULE_FIELD.pack(("*" in field) | ("l" in field) << 1, low, len(mask)))
+        chunks.append(mask)
+    chunks.append(_BYTE.pack(len(schedule.nth_weekday_of_month)))
+    for weekday, nths in schedule.nth_weekday_of_month:
+        mask = 0
+        for nth in nths:
+            mask |= 1 if nth == "l" else 1 << nth
+        chunks.append(_NTH_ENTRY.pack(255 if weekday == "*" else weekday, mask))
+    return b"".join(chunks)
+
+
+def _load_compiled(data, fields_cache, fields_count, ranges):
+    if _BYTE.unpack_from(data, 0) != (fields_count,):
+        raise ValueError("Corrupt croniter schedules file: wrong number of fields")
+    offset = _BYTE.size
+    expanded = []
+    for i in range(fields_count):
+        field_flags, low, mask_length = _SCHEDULE_FIELD.unpack_from(data, offset)
+        key_start, start = offset, offset + _SCHEDULE_FIELD.size
+        offset = start + mask_length
+        if offset > len(data):
+            raise ValueError("Truncated croniter schedules file")
+        key = data[key_start:offset]
+        field = fields_cache.get((i, key))
+        if field is None:
+            mask = int(binascii.hexlify(data[start:offset]) or b"0", 16)
+            if mask and not ranges[i][0] <= low <= low + mask.bit_length() - 1 <= ranges[i][1]:
+                raise ValueError("Corrupt croniter schedules file: field value out of range")
+            field = ["*"] if field_flags & 1 else []
+            value = low
+            while mask:
+                if mask & 1:
+                    field.append(value)
+                mask >>= 1
+                value += 1
+            if field_flags & 2:
+                field.append("l")
+            fields_cache[(i, key)] = field = tuple(field)
+        expanded.append(list(field))
+    nth_weekday_of_month = {}
+    (nth_count,) = _BYTE.unpack_from(data, offset)
+    offset += _BYTE.size
+    for _ in range(nth_count):
+        weekday, mask = _NTH_ENTRY.unpack_from(data, offset)
+        offset += _NTH_ENTRY.size
+        if weekday not in (255,) + tuple(range(7)) or mask >> 6:
+            raise ValueError("Corrupt croniter schedules file: nth weekday out of range")
+        nth_weekday_of_month["*" if weekday == 255 else weekday] = set(
+            "l" if nth == 0 else nth for nth in range(6) if mask & (1 << nth)
+        )
+    if offset != len(data):
+        raise ValueError("Corrupt croniter schedules file: wrong compiled expression length")
+    return expanded, nth_weekday_of_month
+
+
+def dump_schedules(fp, schedules):
+    """
+    Write compiled `schedules` to the binary file `fp`, to be loaded back
+    with `load_schedules` without parsing the expressions again.
+
+    The croniter class the schedules are bound to is not written, see
+    `load_schedules`. Raises ValueError when an expression or hash_id is
+    longer than 65535 bytes.
+    """
+    schedules = list(schedules)
+    chunks = [_SCHEDULES_HEADER.pack(SCHEDULES_MAGIC, SCHEDULES_FORMAT_VERSION, len(schedules))]
+    for schedule in schedules:
+        expr_format = schedule.expr_format.encode("UTF-8")
+        hash_id = schedule.hash_id
+        if isinstance(hash_id, str):
+            hash_id = hash_id.encode("UTF-8")
+        flags = (
+            bool(schedule.day_or)
+            | bool(schedule.implement_cron_bug) << 1
+            | bool(schedule.second_at_beginning) << 2
+            | (hash_id is not None) << 3
+        )
+        hash_id = hash_id or b""
+        compiled = _dump_compiled(schedule)
+        if max(len(expr_format), len(hash_id), len(compiled)) > _MAX_LENGTH:
+            raise ValueError(
+                "Schedule too long to dump, expressions and hash_id are limited to {0} bytes: {1!r}".format(
+                    _MAX_LENGTH, schedule.expr_format[:64]
+                )
+            )
+        chunks.append(_SCHEDULE_HEADER.pack(flags, len(expr_format), len(hash_id), len(compiled)))
+        chunks.extend((expr_format, hash_id, compiled))
+    fp.write(b"".join(chunks))
+
+
+def load_schedules(fp, _croniter=None):
+    """
+    Load the list of `CronSchedule` written by `dump_schedules` from the
+    binary file `fp`.
+
+    The schedules are bound to `_croniter` (`croniter` by default), whatever
+    the class they were compiled with. Raises ValueError when `fp` is not a
+    schedules file of a supported version, or is truncated or corrupt.
+    """
+    data = fp.read()
+    try:
+        magic, version, count = _SCHEDULES_HEADER.unpack_from(data, 0)
+    except struct.error:
+        magic = version = None
+    if magic != SCHEDULES_MAGIC:
+        raise ValueError("Not a croniter schedules file")
+    if version != SCHEDULES_FORMAT_VERSION:
+        raise ValueError("Unsupported croniter schedules format version: {0}".format(version))
+    try:
+        return _load_schedules(data, count, _croniter or croniter)
+    except struct.error:
+        raise ValueError("Truncated croniter schedules file")
+    except UnicodeDecodeError as exc:
+        raise ValueError("Corrupt croniter schedules file: {0}".format(exc))
+
+
+def _load_schedules(data, count, _croniter):
+    offset = _SCHEDULES_HEADER.size
+    schedules = []
+    # schedules sharing their compilation (eg: hashed from the same template)
+    # are copied from the first one built
+    prototypes = {}
+    expressions_cache = {}
+    fields_cache = {}
+    slots = CronSchedule.__slots__
+    expr_format_slot, hash_id_slot, expressions_slot = (
+        slots.index(k) for k in ("expr_format", "hash_id", "expressions")
+    )
+    for _ in range(count):
+        flags, expr_length, hash_id_length, compiled_length = _SCHEDULE_HEADER.unpack_from(data, offset)
+        start = offset + _SCHEDULE_HEADER.size
+        if start + expr_length + hash_id_length + compiled_length > len(data):
+            raise ValueError("Truncated croniter schedules file")
+        offset = start + expr_length
+        expr_format = data[start:offset].decode("UTF-8")
+        start, offset = offset, offset + hash_id_length
+        hash_id = data[start:offset] if flags & 8 else None
+        start, offset = offset, offset + compiled_length
+        compiled = data[start:offset]
+
+        second_at_beginning = bool(flags & 4)
+        key = (expr_format, hash_id is None, second_at_beginning)
+        expressions = expressions_cache.get(key)
+        if expressions is None:
+            expressions = expressions_cache[key] = tuple(
+                _croniter._split_expression(expr_format, hash_id, second_at_beginning)[1]
+            )
+        # the cron bug emulation depends on the spelling of the day fields
+        key = (flags & 7, compiled, len(expressions), expressions[DAY_FIELD][:1], expressions[DOW_FIELD][:1])
+        prototype = prototypes.get(key)
+        if prototype is None:
+            expanded, nth_weekday_of_month = _load_compiled(compiled, fields_cache, len(expressions), _croniter.RANGES)
+            schedule = CronSchedule(
+                expr_format,
+                hash_id=hash_id,
+                day_or=bool(flags & 1),
+                implement_cron_bug=bool(flags & 2),
+                second_at_beginning=second_at_beginning,
+                _croniter=_croniter,
+                _compiled=(expanded, nth_weekday_of_month, expressions, _croniter._fields_masks(expanded)),
+            )
+            prototypes[key] = [getattr(schedule, k) for k in slots]
+        else:
+            prototype[expr_format_slot] = expr_format
+            prototype[hash_id_slot] = hash_id
+            prototype[expressions_slot] = expressions
+            schedule = _restore_schedule(CronSchedule, prototype)
+        schedules.append(schedule)
+    if offset != len(data):
+        raise ValueError("Corrupt croniter schedules file: trailing data")
+    return schedules
+
+
+def croniter_range(
+    start,
+    stop,
+    expr_format,
+    ret_type=None,
+    day_or=True,
+    exclude_ends=False,
+    _croniter=None,
     second_at_beginning=False,
     expand_from_start_time=False,
+    offset=0,
 ):
     """
     Generator that provides all times from start to stop matching the given cron expression.
     If the cron expression matches either 'start' and/or 'stop', those times will be returned as
     well unless 'exclude_ends=True' is passed.
+    The first `offset` matches are skipped, see `croniter.get_nth_next`.
 
     You can think of this function as sibling to the builtin range function for datetime objects.
     Like range(start,stop,step), except that here 'step' is a cron expression.
@@ -1219,12 +3042,12 @@ def croniter_range(
             "The start and stop must be same type.  {0} != {1}".format(type(start), type(stop))
         )
     if isinstance(start, (float, int)):
-        start, stop = (datetime.datetime.fromtimestamp(t, tzutc()).replace(tzinfo=None) for t in (start, stop))
+        start, stop = (datetime.datetime.fromtimestamp(t, UTC_DT).replace(tzinfo=None) for t in (start, stop))
         auto_rt = float
     if ret_type is None:
         ret_type = auto_rt
     if not exclude_ends:
-        ms1 = relativedelta(microseconds=1)
+        ms1 = datetime.timedelta(microseconds=1)
         if start < stop:  # Forward (normal) time order
             start -= ms1
             stop += ms1
@@ -1247,15 +3070,15 @@ def croniter_range(
         def cont(v):
             return v < stop
 
-        step = ic.get_next
+        step, skip = ic.get_next, ic.get_nth_next
     else:  # Reverse
 
         def cont(v):
             return v > stop
 
-        step = ic.get_prev
+        step, skip = ic.get_prev, ic.get_nth_prev
     try:
-        dt = step()
+        dt = skip(offset + 1) if offset else step()
         while cont(dt):
             if ret_type is float:
                 yield ic.get_current(float)
@@ -1267,26 +3090,210 @@ def croniter_range(
         return
 
 
+def _range_pieces(
+    start, stop, expr_format, day_or, exclude_ends, _croniter, second_at_beginning, expand_from_start_time
+):
+    """
+    Split the matches `croniter_range` yields for the same arguments in
+    pieces, returning `(schedule, is_prev, pieces)` with the pieces in the
+    order they are yielded: `(begin, end, shift, count)` for the `count`
+    matches in `[begin, end)`, which are the wall clock matches in
+    `[begin + shift, end + shift)`, and `(timestamp,)` for the matches
+    iterated over around DST transitions.
+    """
+    _croniter = _croniter or croniter
+    if type(start) is not type(stop) and not (isinstance(start, type(stop)) or isinstance(stop, type(start))):
+        raise CroniterBadTypeRangeError(
+            "The start and stop must be same type.  {0} != {1}".format(type(start), type(stop))
+        )
+    if isinstance(start, (float, int)):
+        start, stop = (datetime.datetime.fromtimestamp(t, UTC_DT).replace(tzinfo=None) for t in (start, stop))
+    is_prev = stop < start
+    ms1 = datetime.timedelta(microseconds=0 if exclude_ends else 1)
+    ic = _croniter(
+        expr_format,
+        start + ms1 if is_prev else start - ms1,
+        ret_type=float,
+        day_or=day_or,
+        max_years_between_matches=abs(stop.year - start.year) + 1,
+        second_at_beginning=second_at_beginning,
+        expand_from_start_time=expand_from_start_time,
+    )
+    pieces = []
+    # the matches are the whole seconds of [first, end)
+    (low, low_fraction), (high, high_fraction) = (_whole_seconds(d) for d in sorted((start, stop)))
+    if exclude_ends:
+        first, end = low + 1, high + high_fraction
+    else:
+        first, end = low + low_fraction, high + 1
+    if end <= first:
+        return ic.schedule, is_prev, pieces
+    tzinfo = ic.tzinfo
+
+    def offset(timestamp):
+        if not tzinfo:
+            return 0
+        return timedelta_to_seconds(timestamp_to_datetime(timestamp, tzinfo).utcoffset())
+
+    def add_wall_piece(begin, end):
+        # the matches in [begin, end) have the same UTC offset, move the cursor to the last
+        # (or first, backwards) of them as croniter_range would
+        shift = offset(begin)
+        count = ic.schedule.frequency(
+            EPOCH.replace(tzinfo=None) + datetime.timedelta(seconds=begin + shift),
+            EPOCH.replace(tzinfo=None) + datetime.timedelta(seconds=end + shift),
+        )
+        if count:
+            now = begin + shift - 1 if is_prev else end + shift
+            ic.cur = ic.schedule._calc(now, None, not is_prev, ic._max_years_between_matches) - shift
+            pieces.append((begin, end, shift, count))
+
+    transitions = []
+    if tzinfo and not _is_utc(tzinfo):
+        transitions = _utc_transitions(tzinfo, first, end - 1)
+    if is_prev:
+        transitions.reverse()
+    # the matches following (or preceding, backwards) each transition are iterated over from the previous
+    # match, as croniter_range adjusts them, until the cursor no longer adjusts its matches
+    begin = first
+    try:
+        for transition in transitions:
+            if is_prev:
+                if transition < end:
+                    add_wall_piece(transition, end)
+                    end = transition
+                while True:
+                    result = ic.get_prev(float)
+                    if result < begin:
+                        return ic.schedule, is_prev, pieces
+                    pieces.append((result,))
+                    end = int(result)
+                    if result < transition and offset(ic.dst_start_time) == offset(result):
+                        break
+            else:
+                if begin < transition:
+                    add_wall_piece(begin, transition)
+                    begin = transition
+                while True:
+                    result = ic.get_next(float)
+                    if result >= end:
+                        return ic.schedule, is_prev, pieces
+                    pieces.append((result,))
+                    begin = int(result) + 1
+                    if result >= transition and offset(ic.dst_start_time) == offset(result):
+                        break
+    except CroniterBadDateError:
+        return ic.schedule, is_prev, pieces
+    add_wall_piece(begin, end)
+    return ic.schedule, is_prev, pieces
+
+
+def croniter_count(
+    start,
+    stop,
+    expr_format,
+    day_or=True,
+    exclude_ends=False,
+    _croniter=None,
+    second_at_beginning=False,
+    expand_from_start_time=False,
+):
+    """
+    Return the number of times `croniter_range` yields for the same arguments,
+    without building them.
+
+    The matches are counted per day and per year on the wall clock. With a
+    timezone observing DST, only the matches around each transition are
+    iterated over, so that they are counted as `croniter_range` yields them.
+    """
+    schedule, is_prev, pieces = _range_pieces(
+        start, stop, expr_format, day_or, exclude_ends, _croniter, second_at_beginning, expand_from_start_time
+    )
+    return sum(piece[-1] if len(piece) > 1 else 1 for piece in pieces)
+
+
+def croniter_range_array(
+    start,
+    stop,
+    expr_format,
+    dtype="datetime64[s]",
+    day_or=True,
+    exclude_ends=False,
+    _croniter=None,
+    second_at_beginning=False,
+    expand_from_start_time=False,
+):
+    """
+    Return the times `croniter_range` yields for the same arguments as a
+    NumPy array of UTC `datetime64[s]`, or of `int64` epoch seconds.
+
+    The times are built with NumPy as the products of the matching days and
+    times of the day; with a timezone observing DST, the matches around each
+    transition are iterated over as in `croniter_count`. Requires NumPy.
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("croniter_range_array requires NumPy, use croniter_range or croniter.get_next_many instead")
+    if dtype not in ("datetime64[s]", "int64"):
+        raise ValueError("[{0}] is not a valid dtype, use 'datetime64[s]' or 'int64'".format(dtype))
+    schedule, is_prev, pieces = _range_pieces(
+        start, stop, expr_format, day_or, exclude_ends, _croniter, second_at_beginning, expand_from_start_time
+    )
+    hours, minutes, seconds = (numpy.array(values, dtype="int64") for values in schedule._times_of_day())
+    times = (hours[:, None, None] * 3600 + minutes[None, :, None] * 60 + seconds[None, None, :]).ravel()
+    arrays = []
+    for piece in pieces:
+        if len(piece) == 1:
+            arrays.append(numpy.array(piece, dtype="int64"))
+            continue
+        begin, end, shift, count = piece
+        begin, end = int(begin + shift), int(end + shift)
+        # the matching days of each year overlapping [begin, end), as epoch days
+        days = []
+        year, last_year = (_civil_from_days(value // 86400)[0] for value in (begin, end - 1))
+        while year <= last_year:
+            year_start, year_days = schedule._year_days(year)
+            bits = numpy.frombuffer(bin(year_days)[:1:-1].encode("ascii"), dtype="uint8")
+            days.append(numpy.flatnonzero(bits == ord("1")) + year_start)
+            year += 1
+        days = numpy.concatenate(days)
+        low, high = numpy.searchsorted(days, [begin // 86400, end // 86400 + 1])
+        values = (days[low:high, None] * 86400 + times[None, :]).ravel()
+        low, high = numpy.searchsorted(values, [begin, end])
+        values = values[low:high] - int(shift)
+        arrays.append(values[::-1] if is_prev else values)
+    result = numpy.concatenate(arrays) if arrays else numpy.empty(0, dtype="int64")
+    return result.astype(dtype)
+
+
 class HashExpander:
     def __init__(self, cronit):
         self.cron = cronit
 
-    def do(self, idx, hash_type="h", hash_id=None, range_end=None, range_begin=None):
-        """Return a hashed/random integer given range/hash information"""
+    def do(self, idx, hash_type="h", hash_id=None, range_end=None, range_begin=None, crc=None):
+        """
+        Return a hashed/random integer given range/hash information,
+        `crc` being the already computed hash of `hash_id` if any.
+        """
         if range_end is None:
             range_end = self.cron.RANGES[idx][1]
         if range_begin is None:
             range_begin = self.cron.RANGES[idx][0]
         if hash_type == "r":
+            import random
+
             crc = random.randint(0, 0xFFFFFFFF)
-        else:
+        elif crc is None:
             crc = binascii.crc32(hash_id) & 0xFFFFFFFF
         return ((crc >> idx) % (range_end - range_begin + 1)) + range_begin
 
     def match(self, efl, idx, expr, hash_id=None, **kw):
+        if expr[:1] not in ("h", "r"):
+            return None
         return hash_expression_re.match(expr)
 
-    def expand(self, efl, idx, expr, hash_id=None, match="", **kw):
+    def expand(self, efl, idx, expr, hash_id=None, match="", crc=None, **kw):
         """Expand a hashed/random expression to its normal representation"""
         if match == "":
             match = self.match(efl, idx, expr, hash_id, **kw)
@@ -1295,22 +3302,23 @@ class HashExpander:
         m = match.groupdict()
 
         if m["hash_type"] == "h" and hash_id is None:
-            raise CroniterBadCronError("Hashed definitions must include hash_id")
+            raise CroniterBadCronError("Hashed definitions must include hash_id", code="hash_id")
 
         if m["range_begin"] and m["range_end"]:
             if int(m["range_begin"]) >= int(m["range_end"]):
-                raise CroniterBadCronError("Range end must be greater than range begin")
+                raise CroniterBadCronError("Range end must be greater than range begin", code="range")
 
         if m["range_begin"] and m["range_end"] and m["divisor"]:
             # Example: H(30-59)/10 -> 34-59/10 (i.e. 34,44,54)
             if int(m["divisor"]) == 0:
-                raise CroniterBadCronError("Bad expression: {0}".format(expr))
+                raise CroniterBadCronError("Bad expression: {0}".format(expr), code="step")
 
             return "{0}-{1}/{2}".format(
                 self.do(
                     idx,
                     hash_type=m["hash_type"],
                     hash_id=hash_id,
+                    crc=crc,
                     range_begin=int(m["range_begin"]),
                     range_end=int(m["divisor"]) - 1 + int(m["range_begin"]),
                 ),
@@ -1324,6 +3332,7 @@ class HashExpander:
                     idx,
                     hash_type=m["hash_type"],
                     hash_id=hash_id,
+                    crc=crc,
                     range_end=int(m["range_end"]),
                     range_begin=int(m["range_begin"]),
                 )
@@ -1331,13 +3340,14 @@ class HashExpander:
         elif m["divisor"]:
             # Example: H/15 -> 7-59/15 (i.e. 7,22,37,52)
             if int(m["divisor"]) == 0:
-                raise CroniterBadCronError("Bad expression: {0}".format(expr))
+                raise CroniterBadCronError("Bad expression: {0}".format(expr), code="step")
 
             return "{0}-{1}/{2}".format(
                 self.do(
                     idx,
                     hash_type=m["hash_type"],
                     hash_id=hash_id,
+                    crc=crc,
                     range_begin=self.cron.RANGES[idx][0],
                     range_end=int(m["divisor"]) - 1 + self.cron.RANGES[idx][0],
                 ),
@@ -1351,6 +3361,7 @@ class HashExpander:
                     idx,
                     hash_type=m["hash_type"],
                     hash_id=hash_id,
+                    crc=crc,
                 )
             )
 
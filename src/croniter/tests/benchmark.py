@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Speed benchmarks of croniter.
+
+Timings depend on the machine and its load, so they are not part of the
+unit tests, which check the fast code paths are taken instead. Run all the
+benchmarks, or some of them by name, with::
+
+    python -m croniter.tests.benchmark [name ...]
+
+Each case prints the best time of a call, in microseconds.
+"""
+from __future__ import absolute_import, print_function
+
+import os
+import sys
+from datetime import datetime
+from timeit import Timer
+
+import pytz
+
+from croniter import CronSchedule, cron_m, croniter
+from croniter.tests.test_croniter_dst_repetition import DST_SCENARIOS, run_dst_scenario
+
+try:
+    from unittest import mock
+except ImportError:  # py2
+    import mock
+
+try:
+    import zoneinfo
+except ImportError:  # python < 3.9
+    zoneinfo = None
+
+REPEAT = 5
+NUMBER = int(os.environ.get("CRONITER_BENCHMARK_NUMBER", "200"))
+BENCHMARKS = []
+
+
+def benchmark(func):
+    """Register `func`, returning a list of `(case, microseconds)`."""
+    BENCHMARKS.append(func)
+    return func
+
+
+def best_time(func, number=NUMBER):
+    """Return the best time of a call of `func` over `REPEAT` runs, in microseconds."""
+    return min(Timer(func).repeat(REPEAT, number)) / number * 1e6
+
+
+def step_cases(corpus, start, directions=("get_next", "get_prev")):
+    """Time `get_next` and `get_prev` of cursors over each expression of `corpus`."""
+    cases = []
+    for expr in corpus:
+        for direction in directions:
+            step = getattr(croniter(expr, start), direction)
+            cases.append(("{0} {1}".format(direction, expr), best_time(step)))
+    return cases
+
+
+@benchmark
+def parse():
+    # parsed through _expand to bypass the expansion cache
+    corpus = [
+        "*/5 * * * *",
+        "0 0 * * *",
+        "30 2 * * 1-5",
+        "0 */2 * * *",
+        "15,45 8-18 * * mon-fri",
+        "0 0 1 * *",
+        "0 0 L * *",
+        "0 9 * * sat#2",
+        "0 0 1 jan,jul *",
+        "*/15 9-17 * * 1-5",
+        "23 0-20/2 * * *",
+        "0 0,12 1 */2 *",
+        "@daily",
+        "0 12 * * l5",
+        "0 0 * * 6#3,1#1",
+        "0 0 * * * 30",
+        "0 0 1 1 * 0 2020-2030",
+    ]
+    return [(expr, best_time(lambda: croniter._expand(expr))) for expr in corpus]
+
+
+@benchmark
+def day_or():
+    # day of month and day of week unions
+    corpus = ["0 9 1,15 * mon", "30 8 1 * mon-fri", "0 0 13 * fri", "0 12 L * sun", "0 0 1-7 * sat#1"]
+    return step_cases(corpus, datetime(2024, 1, 1))
+
+
+@benchmark
+def fixed_period():
+    # computed with modular arithmetic, compared to the search they replace
+    cases = []
+    for expr, start in (("* * * * * *", datetime(2024, 1, 1, tzinfo=pytz.utc)), ("*/5 * * * *", datetime(2024, 1, 1))):
+        itr = croniter(expr, start)
+        schedule, now = itr.schedule, itr.cur
+        cases.append(("get_next " + expr, best_time(itr.get_next)))
+        cases.append(("arithmetic " + expr, best_time(lambda: schedule._next_periodic(now, False))))
+        cases.append(("search " + expr, best_time(lambda: schedule._calc(now, None, False, 50))))
+    return cases
+
+
+@benchmark
+def day_times():
+    # times of day found in the table of the matching times, compared to searching field by field
+    corpus = ["0 9 * * mon-fri", "*/7 */3 * * *", "10,20 8-17 * * 1-5 */15", "0 12 * * sat#2"]
+    start = datetime(2024, 6, 1)
+    cases = []
+    for expr in corpus:
+        table = croniter(CronSchedule(expr), start)
+        with mock.patch.object(cron_m, "_day_times", return_value=None):
+            fields = croniter(CronSchedule(expr), start)
+        for direction in ("get_next", "get_prev"):
+            cases.append(("{0} {1}".format(direction, expr), best_time(getattr(table, direction))))
+            cases.append(("{0} {1} by field".format(direction, expr), best_time(getattr(fields, direction))))
+    return cases
+
+
+@benchmark
+def tz():
+    # UTC offsets from the transitions of pytz timezones, compared to converting datetimes
+    start = pytz.timezone("America/New_York").localize(datetime(2024, 3, 9))
+    cases = step_cases(["*/30 * * * *", "0 2 * * *"], start)
+    with mock.patch.object(cron_m, "_tz_offsets", return_value=None):
+        cases.extend(
+            (case + " on datetimes", micros) for case, micros in step_cases(["*/30 * * * *", "0 2 * * *"], start)
+        )
+    return cases
+
+
+@benchmark
+def zoneinfo_dst():
+    # the DST scenarios of test_croniter_dst_repetition, with pytz and zoneinfo timezones
+    cases = []
+    timezones = [("pytz", pytz.timezone)]
+    if zoneinfo is not None:
+        timezones.append(("zoneinfo", zoneinfo.ZoneInfo))
+    for name, tz in timezones:
+
+        def run():
+            for zone, expr, start, direction, count in DST_SCENARIOS:
+                run_dst_scenario(tz(zone), expr, start, direction, count)
+
+        cases.append(("{0} scenarios".format(name), best_time(run, max(NUMBER // 10, 1))))
+    return cases
+
+
+@benchmark
+def directions():
+    # get_next and get_prev side by side
+    corpus = [
+        "*/5 * * * *",
+        "17 3 * * *",
+        "0 9 * * mon-fri",
+        "0 0 1,15 * mon",
+        "0 12 * * sat#2",
+        "0 0 L * *",
+        "*/7 */3 * * *",
+        "10,20 8-17 * * 1-5 */15",
+    ]
+    cases = step_cases(corpus, datetime(2024, 6, 1))
+    start = pytz.timezone("Europe/Paris").localize(datetime(2024, 6, 1))
+    cases.extend((case + " Europe/Paris", micros) for case, micros in step_cases(corpus, start))
+    return cases
+
+
+def main(names):
+    for func in BENCHMARKS:
+        if names and func.__name__ not in names:
+            continue
+        for case, micros in func():
+            print("{0:<16} {1:<40} {2:10.2f} us".format(func.__name__, case, micros))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
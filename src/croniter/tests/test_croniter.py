@@ -5,6 +5,7 @@ try:
 except ImportError:
     import unittest
 
+from array import array
 from datetime import datetime, timedelta
 from functools import partial
 from time import sleep
@@ -13,6 +14,10 @@ import dateutil.tz
 import pytz
 
 from croniter import (
+    DOW_FIELD,
+    MINUTE_FIELD,
+    MONTH_FIELD,
+    SECOND_FIELD,
     CroniterBadCronError,
     CroniterBadDateError,
     CroniterNotAlphaError,
@@ -20,7 +25,7 @@ from croniter import (
     croniter,
     datetime_to_timestamp,
 )
-from croniter.croniter import VALID_LEN_EXPRESSION
+from croniter.croniter import LAST_DAY_BIT, VALID_LEN_EXPRESSION, _civil_from_days, _days_from_civil
 from croniter.tests import base
 
 
@@ -910,6 +915,40 @@ class CroniterTest(base.TestCase):
         self.assertFalse(croniter.is_valid("* * * janu-jun *"))
         self.assertTrue(croniter.is_valid("H 0 * * *", hash_id="abc"))
 
+    def test_validate_many(self):
+        results = croniter.validate_many(
+            ["0 * * * *", "61 * * * *", "* * * janu *", "*/0 * * * *", "* * *", "0 0 * * 1#7", "0 * * * *", None]
+        )
+        self.assertEqual(
+            [(r.expression, r.valid, r.code, r.field_index, r.token) for r in results],
+            [
+                ("0 * * * *", True, None, None, None),
+                ("61 * * * *", False, "out_of_range", MINUTE_FIELD, "61"),
+                ("* * * janu *", False, "not_alpha", MONTH_FIELD, "janu"),
+                ("*/0 * * * *", False, "step", MINUTE_FIELD, "*/0"),
+                ("* * *", False, "columns", None, None),
+                ("0 0 * * 1#7", False, "nth", DOW_FIELD, "1#7"),
+                ("0 * * * *", True, None, None, None),
+                (None, False, "type", None, None),
+            ],
+        )
+        self.assertIs(results[0], results[6])
+        self.assertNotIn("Traceback", results[3].message)
+
+    def test_validate_many_hash_ids(self):
+        results = croniter.validate_many(["H * * * *", "H * * * *", "H H * * *"], hash_ids=["a", None, 1])
+        self.assertEqual([(r.valid, r.code) for r in results], [(True, None), (False, "hash_id"), (False, "hash_id")])
+        results = croniter.validate_many(["H * * * *", "61 0 0 * * *"], hash_ids="a", second_at_beginning=True)
+        self.assertEqual([(r.valid, r.field_index) for r in results], [(True, None), (False, SECOND_FIELD)])
+        self.assertRaises(ValueError, croniter.validate_many, ["* * * * *"], hash_ids=["a", "b"])
+
+    def test_bad_cron_error_details(self):
+        with self.assertRaises(CroniterBadCronError) as ctx:
+            croniter("* 24 * * *")
+        self.assertEqual(
+            (ctx.exception.code, ctx.exception.field_index, ctx.exception.token), ("out_of_range", 1, "24")
+        )
+
     def test_exactly_the_same_minute(self):
         base = datetime(2018, 3, 5, 12, 30, 50)
         itr = croniter("30 7,12,17 * * *", base)
@@ -1765,6 +1804,30 @@ class CroniterTest(base.TestCase):
         self.assertListEqual(croniter("1 1 7,14,21,L * *").expanded[d], [7, 14, 21, "l"])
         self.assertListEqual(croniter("0 0 * * *,sat#3").expanded[dow], ["*", 6])
 
+    def test_fields_masks(self):
+        itr = croniter("*/15 0 1,L * mon-fri 30 2030-2031")
+        self.assertEqual(
+            itr.masks,
+            (
+                (1 << 0) | (1 << 15) | (1 << 30) | (1 << 45),
+                1 << 0,
+                (1 << 1) | LAST_DAY_BIT,
+                None,
+                0b111110,
+                1 << 30,
+                (1 << 2030) | (1 << 2031),
+            ),
+        )
+
+    def test_last_day_with_missing_day(self):
+        # 31 does not exist in April, but L does
+        itr = croniter("0 0 31,L * *", datetime(2024, 4, 10))
+        self.assertEqual(itr.get_next(datetime), datetime(2024, 4, 30))
+        self.assertEqual(itr.get_next(datetime), datetime(2024, 5, 31))
+        itr = croniter("0 0 */15,L * *", datetime(2024, 7, 1))
+        self.assertEqual(itr.get_prev(datetime), datetime(2024, 6, 30))
+        self.assertEqual(itr.get_prev(datetime), datetime(2024, 6, 16))
+
     def test_issue_k6(self):
         self.assertRaises(CroniterBadCronError, croniter, "0 0 0 0 0")
         self.assertRaises(CroniterBadCronError, croniter, "0 0 0 1 0")
@@ -2115,6 +2178,138 @@ class CroniterTest(base.TestCase):
         except OverflowError:
             raise Exception("overflow not fixed!")
 
+    def test_civil_days(self):
+        epoch = datetime(1970, 1, 1)
+        for days in list(range(-800, 800)) + list(range(-719162, 2932897, 997)):
+            d = epoch + timedelta(days=days)
+            self.assertEqual(_civil_from_days(days), (d.year, d.month, d.day))
+            self.assertEqual(_days_from_civil(d.year, d.month, d.day), days)
+        # leap days across the 2100 non leap year, in both directions
+        itr = croniter("0 0 29 2 *", datetime(2097, 1, 1), ret_type=datetime, max_years_between_matches=10)
+        self.assertEqual([itr.get_next() for i in range(2)], [datetime(2104, 2, 29), datetime(2108, 2, 29)])
+        self.assertEqual(itr.get_prev(), datetime(2104, 2, 29))
+        self.assertEqual(itr.get_prev(), datetime(2096, 2, 29))
+
+    def test_days_missing_from_previous_month(self):
+        itr = croniter("0 0 */5 * *", datetime(2023, 2, 27), ret_type=datetime)
+        self.assertEqual(itr.get_next(), datetime(2023, 3, 1))
+        itr = croniter("0 0 29 * *", datetime(2024, 3, 6), ret_type=datetime)
+        self.assertEqual(itr.get_prev(), datetime(2024, 2, 29))
+        itr = croniter("0 0 1,31 * wed", datetime(2023, 2, 12), ret_type=datetime, day_or=False)
+        self.assertEqual(itr.get_next(), datetime(2023, 3, 1))
+        itr = croniter("0 0 L * thu", datetime(2024, 3, 3), ret_type=datetime, day_or=False)
+        self.assertEqual(itr.get_prev(), datetime(2024, 2, 29))
+
+    def test_day_or_single_side(self):
+        # the union matches its weekdays even if the day of month never exists, it used to raise like
+        # its day of month side alone still does
+        itr = croniter("0 0 31 2 mon", datetime(2024, 1, 1), ret_type=datetime)
+        self.assertEqual([itr.get_next() for i in range(2)], [datetime(2024, 2, 5), datetime(2024, 2, 12)])
+        self.assertEqual(itr.get_prev(), datetime(2024, 2, 5))
+        itr = croniter("0 0 31 2 mon", datetime(2024, 1, 1), ret_type=datetime, day_or=False)
+        self.assertRaises(CroniterBadDateError, itr.get_next)
+        self.assertRaises(CroniterBadDateError, itr.get_prev)
+        itr = croniter("0 0 29 2 mon", datetime(2024, 1, 1), ret_type=datetime)
+        self.assertEqual([itr.get_next() for i in range(2)], [datetime(2024, 2, 5), datetime(2024, 2, 12)])
+
+    def test_day_or_nth_weekday_single_side(self):
+        # the union matches its `#n` weekdays even if the day of month never falls on one of them, it used
+        # to raise like its day of month side alone still does
+        itr = croniter("0 0 5 * 5#3", datetime(2024, 1, 1), ret_type=datetime)
+        self.assertEqual([itr.get_next() for i in range(2)], [datetime(2024, 1, 19), datetime(2024, 2, 16)])
+        self.assertEqual(itr.get_prev(), datetime(2024, 1, 19))
+        itr = croniter("27 17,19 27 */2 1#1,1#5", datetime(2024, 1, 1), ret_type=datetime)
+        self.assertEqual(
+            [itr.get_next() for i in range(3)],
+            [datetime(2024, 1, 1, 17, 27), datetime(2024, 1, 1, 19, 27), datetime(2024, 1, 29, 17, 27)],
+        )
+        for expr in ("0 0 5 * 5#3", "27 17,19 27 */2 1#1,1#5"):
+            itr = croniter(expr, datetime(2024, 1, 1), ret_type=datetime, day_or=False)
+            self.assertRaises(CroniterBadDateError, itr.get_next)
+        # the day of month only matters when it falls on one of the weekdays, which match anyway
+        itr = croniter("0 0 15 * fri#3", datetime(2024, 1, 1), ret_type=datetime)
+        self.assertEqual(
+            [itr.get_next() for i in range(3)], [datetime(2024, 1, 19), datetime(2024, 2, 16), datetime(2024, 3, 15)]
+        )
+
+    def test_get_nth(self):
+        start = datetime(2023, 12, 30, 11, 7)
+        for expr, day_or, tzinfo in [
+            ("*/7 9-17 * * mon-fri", True, None),
+            ("0 0 L * *", True, pytz.utc),
+            ("15 3 13 * fri", False, None),
+            ("0 12 1,15 * sat#2", True, None),
+            ("*/5 8-9 29 2 * * 1970-2099", True, None),
+            ("30 */6 * * * 5,40", True, pytz.timezone("Europe/Paris")),
+            ("*/10 * * * *", True, None),
+        ]:
+            now = tzinfo.localize(start) if tzinfo else start
+            for n in (1, 2, 11, 500):
+                fwd = croniter(expr, now, ret_type=datetime, day_or=day_or)
+                bwd = croniter(expr, now, ret_type=datetime, day_or=day_or)
+                expected_fwd = [fwd.get_next() for i in range(n)][-1]
+                expected_bwd = [bwd.get_prev() for i in range(n)][-1]
+                itr = croniter(expr, now, ret_type=datetime, day_or=day_or)
+                self.assertEqual(itr.get_nth_next(n), expected_fwd)
+                self.assertEqual(itr.get_next(), fwd.get_next())
+                self.assertEqual(itr.get_nth_prev(n, start_time=now), expected_bwd)
+                self.assertEqual(itr.get_prev(), bwd.get_prev())
+
+    def test_get_nth_options(self):
+        itr = croniter("0 0 1 1 *", datetime(2000, 6, 1))
+        self.assertEqual(itr.get_nth_next(7999, datetime, update_current=False), datetime(9999, 1, 1))
+        self.assertRaises(CroniterBadDateError, itr.get_nth_next, 8000)
+        itr = croniter("0 0 1 * *", datetime(2000, 6, 1), ret_type=datetime)
+        self.assertEqual(itr.get_nth_next(3, update_current=False), datetime(2000, 9, 1))
+        self.assertEqual(itr.get_current(), datetime(2000, 6, 1))
+        self.assertEqual(itr.get_nth_prev(13, float), 925516800.0)
+        self.assertRaises(ValueError, itr.get_nth_next, 0)
+        self.assertRaises(ValueError, itr.get_nth_next, 1.5)
+        itr = croniter("0 0 1 1 * 0 2020,2090", datetime(2000, 1, 1))
+        self.assertRaises(CroniterBadDateError, itr.get_nth_next, 2)
+
+    def test_get_many(self):
+        start = datetime(2024, 2, 28, 11, 7)
+        for expr, tzinfo in [
+            ("*/7 9-17 * * mon-fri", None),
+            ("0 0 L * *", pytz.utc),
+            ("*/10 * * * *", None),
+            ("0 12 1,15 * sat#2", pytz.timezone("Europe/Paris")),
+            ("*/5 8-9 29 2 * * 1970-2099", None),
+        ]:
+            now = tzinfo.localize(start) if tzinfo else start
+            for ret_type in (float, datetime):
+                fwd = croniter(expr, now)
+                bwd = croniter(expr, now)
+                expected_fwd = [fwd.get_next(ret_type) for i in range(50)]
+                expected_bwd = [bwd.get_prev(ret_type) for i in range(50)]
+                itr = croniter(expr, now)
+                self.assertEqual(list(itr.get_next_many(50, ret_type)), expected_fwd)
+                self.assertEqual(itr.get_next(), fwd.get_next())
+                self.assertEqual(list(itr.get_prev_many(50, ret_type, start_time=now)), expected_bwd)
+                self.assertEqual(itr.get_prev(), bwd.get_prev())
+
+    def test_get_many_options(self):
+        itr = croniter("0 0 1 * *", datetime(2000, 6, 1))
+        self.assertEqual(itr.get_next_many(3), array("d", [962409600.0, 965088000.0, 967766400.0]))
+        for n in (0, -1, 1.5):
+            self.assertRaises(ValueError, itr.get_next_many, n)
+            self.assertRaises(ValueError, itr.get_prev_many, n)
+        self.assertEqual(
+            itr.get_prev_many(2, datetime, update_current=False), [datetime(2000, 8, 1), datetime(2000, 7, 1)]
+        )
+        self.assertEqual(itr.get_current(datetime), datetime(2000, 9, 1))
+        # peeking leaves the direction of the cursor unchanged
+        self.assertFalse(itr._is_prev)
+        self.assertEqual(itr.get_nth_prev(2, datetime, update_current=False), datetime(2000, 7, 1))
+        self.assertFalse(itr._is_prev)
+        self.assertEqual(len(itr.get_prev_many(2)), 2)
+        self.assertTrue(itr._is_prev)
+        self.assertRaises(TypeError, itr.get_next_many, 2, int)
+        itr = croniter("0 0 1 1 * 0 2020,2099", datetime(2019, 1, 1))
+        self.assertRaises(CroniterBadDateError, itr.get_next_many, 2)
+        self.assertEqual(itr.get_current(datetime), datetime(2019, 1, 1))
+
     def test_revert_issue_90_aka_support_DOW7(self):
         self.assertTrue(croniter.is_valid("* * * * 1-7"))
         self.assertTrue(croniter.is_valid("* * * * 7"))
@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+import threading
+from datetime import datetime, timedelta
+
+import dateutil.tz
+import pytz
+
+from croniter import (
+    EXPAND_CACHE,
+    TIMESTAMP_TO_DT_CACHE,
+    CroniterBadCronError,
+    LRUCache,
+    croniter,
+    timestamp_to_datetime,
+)
+from croniter.tests import base
+
+try:
+    from datetime import timezone
+except ImportError:  # py2
+    timezone = None
+
+try:
+    import zoneinfo
+except ImportError:  # python < 3.9
+    zoneinfo = None
+
+
+class LRUCacheTest(base.TestCase):
+    def test_eviction_order(self):
+        cache = LRUCache(2)
+        cache["a"] = 1
+        cache["b"] = 2
+        self.assertEqual(cache["a"], 1)
+        cache["c"] = 3
+        self.assertIn("a", cache)
+        self.assertIn("c", cache)
+        self.assertNotIn("b", cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_counters_and_clear(self):
+        cache = LRUCache(10)
+        cache.set("a", 1)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertRaises(KeyError, lambda: cache["b"])
+        self.assertEqual(tuple(cache.info()), (1, 2, 10, 1))
+        cache.clear()
+        self.assertEqual(tuple(cache.info()), (0, 0, 10, 0))
+
+    def test_resize_and_disable(self):
+        cache = LRUCache(None)
+        for i in range(10):
+            cache[i] = i
+        cache.resize(3)
+        self.assertEqual(len(cache), 3)
+        self.assertIn(9, cache)
+        cache.resize(0)
+        cache["x"] = 1
+        self.assertEqual(len(cache), 0)
+
+    def test_reads_take_the_lock(self):
+        cache = LRUCache(10)
+        cache["a"] = 1
+        for read in (cache.info, lambda: "a" in cache, lambda: len(cache)):
+            results = []
+            thread = threading.Thread(target=lambda: results.append(read()))
+            with cache._lock:
+                thread.start()
+                thread.join(0.05)
+                # blocked until the writer releases the lock
+                self.assertTrue(thread.is_alive())
+                self.assertEqual(results, [])
+            thread.join()
+            self.assertEqual(len(results), 1)
+
+
+class CroniterExpandCacheTest(base.TestCase):
+    maxsize = EXPAND_CACHE.maxsize
+
+    def setUp(self):
+        EXPAND_CACHE.clear()
+
+    def tearDown(self):
+        EXPAND_CACHE.resize(self.maxsize)
+        EXPAND_CACHE.clear()
+
+    def test_construction_hits_cache(self):
+        croniter("*/5 * * * *", datetime(2020, 1, 1))
+        croniter("*/5 * * * *", datetime(2021, 1, 1))
+        croniter("*/5 * * * *", datetime(2021, 1, 1), second_at_beginning=True)
+        info = EXPAND_CACHE.info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 2, 2))
+
+    def test_cache_skips_parsing(self):
+        croniter("0 0 * * *")
+        orig = croniter._expand
+
+        def fail(*a, **kw):
+            raise AssertionError("expression was parsed again")
+
+        croniter._expand = fail
+        try:
+            self.assertEqual(croniter.expand("0 0 * * *"), ([[0], [0], ["*"], ["*"], ["*"]], {}))
+            self.assertTrue(croniter.is_valid("0 0 * * *"))
+        finally:
+            croniter._expand = orig
+
+    def test_instances_do_not_share_state(self):
+        itr = croniter("0 0 * * sat#1,sun#2")
+        itr.expanded[0].append(30)
+        itr.nth_weekday_of_month[6].add(2)
+        self.assertEqual(croniter.expand("0 0 * * sat#1,sun#2"), ([[0], [0], ["*"], ["*"], [0, 6]], {0: {2}, 6: {1}}))
+
+    def test_hash_id_is_part_of_the_key(self):
+        a = croniter("H H * * *", hash_id="hello").expanded
+        b = croniter("H H * * *", hash_id="bonjour").expanded
+        self.assertNotEqual(a, b)
+        self.assertEqual(croniter("H H * * *", hash_id="hello").expanded, a)
+
+    def test_random_is_not_cached(self):
+        croniter("R R * * *")
+        croniter("R R * * *")
+        self.assertEqual(len(EXPAND_CACHE), 0)
+
+    def test_errors_are_not_cached(self):
+        for i in range(2):
+            self.assertRaises(CroniterBadCronError, croniter, "61 * * * *")
+        self.assertEqual(len(EXPAND_CACHE), 0)
+
+    def test_bounded(self):
+        EXPAND_CACHE.resize(5)
+        for i in range(60):
+            croniter("{0} * * * *".format(i))
+        self.assertEqual(len(EXPAND_CACHE), 5)
+
+
+class TimestampToDatetimeCacheTest(base.TestCase):
+    maxsize = TIMESTAMP_TO_DT_CACHE.maxsize
+
+    def setUp(self):
+        TIMESTAMP_TO_DT_CACHE.clear()
+
+    def tearDown(self):
+        TIMESTAMP_TO_DT_CACHE.resize(self.maxsize)
+        TIMESTAMP_TO_DT_CACHE.clear()
+
+    def test_hits(self):
+        paris = pytz.timezone("Europe/Paris")
+        for i in range(3):
+            self.assertEqual(timestamp_to_datetime(1700000000), datetime(2023, 11, 14, 22, 13, 20))
+            result = timestamp_to_datetime(1700000000, paris)
+            self.assertEqual(result.isoformat(), "2023-11-14T23:13:20+01:00")
+        info = TIMESTAMP_TO_DT_CACHE.info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (4, 2, 2))
+        self.assertIs(timestamp_to_datetime(1700000000, paris), result)
+
+    def test_tzinfo_key(self):
+        # the instances of a pytz timezone share their entries
+        paris = pytz.timezone("Europe/Paris")
+        result = timestamp_to_datetime(0, paris)
+        self.assertIs(timestamp_to_datetime(0, paris.localize(datetime(2024, 7, 1)).tzinfo), result)
+        self.assertEqual(timestamp_to_datetime(0).tzinfo, None)
+        self.assertEqual(len(TIMESTAMP_TO_DT_CACHE), 2)
+        # equal fixed offsets, but not named alike
+        if timezone is not None:
+            a, b = timezone(timedelta(hours=1), "A"), timezone(timedelta(hours=1), "B")
+            self.assertEqual(timestamp_to_datetime(0, a).tzname(), "A")
+            self.assertEqual(timestamp_to_datetime(0, b).tzname(), "B")
+            self.assertEqual(len(TIMESTAMP_TO_DT_CACHE), 4)
+        # the timezones without a stable identity would be kept alive by their entries
+        TIMESTAMP_TO_DT_CACHE.clear()
+        a, b = dateutil.tz.tzoffset("A", 3600), dateutil.tz.tzoffset("B", 3600)
+        self.assertEqual(timestamp_to_datetime(0, a).tzname(), "A")
+        self.assertEqual(timestamp_to_datetime(0, b).tzname(), "B")
+        self.assertEqual(len(TIMESTAMP_TO_DT_CACHE), 0)
+        if zoneinfo is not None:
+            self.assertEqual(timestamp_to_datetime(0, zoneinfo.ZoneInfo("Europe/Paris")).hour, 1)
+            self.assertEqual(timestamp_to_datetime(0, zoneinfo.ZoneInfo.no_cache("Europe/Paris")).hour, 1)
+            self.assertEqual(len(TIMESTAMP_TO_DT_CACHE), 1)
+
+    def test_bounded(self):
+        TIMESTAMP_TO_DT_CACHE.resize(10)
+        itr = croniter("0 * * * *", datetime(2024, 1, 1, tzinfo=pytz.timezone("Europe/Paris")))
+        for i in range(100):
+            itr.get_next(datetime)
+        self.assertEqual(len(TIMESTAMP_TO_DT_CACHE), 10)
+
+    def test_disable(self):
+        TIMESTAMP_TO_DT_CACHE.resize(0)
+        self.assertEqual(timestamp_to_datetime(0), datetime(1970, 1, 1))
+        self.assertEqual(len(TIMESTAMP_TO_DT_CACHE), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -14,6 +14,8 @@ import time
 from collections import OrderedDict
 from datetime import datetime, timedelta
 
+import pytz
+
 from croniter import (
     HOUR_FIELD,
     CroniterBadCronError,
@@ -26,8 +28,49 @@ from croniter import (
 )
 from croniter.tests import base
 
+try:
+    from unittest import mock
+except ImportError:  # py2
+    import mock
+
+try:
+    import zoneinfo
+except ImportError:  # python < 3.9
+    zoneinfo = None
+
 ORIG_OVERFLOW32B_MODE = cron_m.OVERFLOW32B_MODE
 
+# (timezone, expression, local start, direction, number of matches) around DST changes
+DST_SCENARIOS = [
+    ("Europe/Athens", "*/30 * * * *", datetime(2013, 10, 27, 2), "next", 7),
+    ("Europe/Athens", "*/30 * * * *", datetime(2013, 10, 27, 5), "prev", 7),
+    ("Europe/Athens", "*/30 * * * *", datetime(2013, 3, 31, 1), "next", 5),
+    ("Europe/Athens", "*/30 * * * *", datetime(2013, 3, 31, 5), "prev", 5),
+    ("Europe/Warsaw", "0 * * * *", datetime(2017, 10, 29, 1, 59), "next", 4),
+    ("Europe/Warsaw", "0 0 * * *", datetime(2017, 10, 29), "next", 3),
+    ("America/Sao_Paulo", "0 0 * * *", datetime(2018, 2, 17, 21), "next", 3),
+    ("America/Sao_Paulo", "0 0 * * *", datetime(2018, 11, 3, 21), "next", 3),
+    ("America/Sao_Paulo", "0 0 * * *", datetime(2018, 11, 5, 1), "prev", 3),
+    ("Europe/Paris", "1 2 * * *", datetime(2020, 3, 30, 1, 59, 55), "prev", 3),
+    ("Europe/Paris", "30 2 * * *", datetime(2020, 10, 24, 12), "next", 3),
+    ("Europe/Paris", "30 2 * * *", datetime(2020, 10, 26, 12), "prev", 3),
+    ("Europe/Paris", "*/15 * * * *", datetime(2020, 10, 25, 1, 50), "next", 12),
+    ("Europe/Paris", "*/15 * * * *", datetime(2020, 10, 25, 3, 10), "prev", 12),
+    ("Asia/Hebron", "0 0 * * *", datetime(2022, 3, 26), "next", 3),
+    ("Australia/Lord_Howe", "*/10 * * * *", datetime(2021, 4, 4, 1, 25), "next", 8),
+]
+
+
+def run_dst_scenario(tzinfo, expr, start, direction, count):
+    """Return the matches of a DST scenario in `tzinfo`, a pytz or a zoneinfo timezone."""
+    if hasattr(tzinfo, "localize"):
+        start = tzinfo.localize(start)
+    else:
+        start = start.replace(tzinfo=tzinfo)
+    itr = croniter(expr, start)
+    step = itr.get_prev if direction == "prev" else itr.get_next
+    return [step(datetime) for i in range(count)]
+
 
 class CroniterDST138Test(base.TestCase):
     """
@@ -79,5 +122,137 @@ class CroniterDST138TestLocal(CroniterDST138Test):
     _tz = "UTC-8"
 
 
+@unittest.skipIf(zoneinfo is None, "zoneinfo is not available")
+class CroniterZoneInfoDSTTest(base.TestCase):
+    def tearDown(self):
+        cron_m.OVERFLOW32B_MODE = ORIG_OVERFLOW32B_MODE
+
+    def assertSchedule(self, results, expected):
+        self.assertEqual([(d.strftime("%m-%d %H:%M%z"), d.fold) for d in results], expected)
+
+    def test_repeated_hour(self):
+        # the matches of the repeated hour happen twice, the second time with fold set
+        tz = zoneinfo.ZoneInfo("Europe/Athens")
+        expected = [
+            ("10-27 02:30+0300", 0),
+            ("10-27 03:00+0300", 0),
+            ("10-27 03:30+0300", 0),
+            ("10-27 03:00+0200", 1),
+            ("10-27 03:30+0200", 1),
+            ("10-27 04:00+0200", 0),
+            ("10-27 04:30+0200", 0),
+        ]
+        self.assertSchedule(run_dst_scenario(tz, "*/30 * * * *", datetime(2013, 10, 27, 2), "next", 7), expected)
+        self.assertSchedule(run_dst_scenario(tz, "*/30 * * * *", datetime(2013, 10, 27, 5), "prev", 7), expected[::-1])
+
+    def test_skipped_hour(self):
+        tz = zoneinfo.ZoneInfo("Europe/Athens")
+        expected = [
+            ("03-31 01:30+0200", 0),
+            ("03-31 02:00+0200", 0),
+            ("03-31 02:30+0200", 0),
+            ("03-31 04:00+0300", 0),
+            ("03-31 04:30+0300", 0),
+        ]
+        self.assertSchedule(run_dst_scenario(tz, "*/30 * * * *", datetime(2013, 3, 31, 1), "next", 5), expected)
+        self.assertSchedule(run_dst_scenario(tz, "*/30 * * * *", datetime(2013, 3, 31, 5), "prev", 5), expected[::-1])
+
+    def test_daily(self):
+        tz = zoneinfo.ZoneInfo("Europe/Paris")
+        # going back over a skipped match does not stall on it
+        self.assertSchedule(
+            run_dst_scenario(tz, "1 2 * * *", datetime(2020, 3, 30, 1, 59, 55), "prev", 3),
+            [("03-29 01:01+0100", 0), ("03-28 02:01+0100", 0), ("03-27 02:01+0100", 0)],
+        )
+        tz = zoneinfo.ZoneInfo("Europe/Warsaw")
+        self.assertSchedule(
+            run_dst_scenario(tz, "0 0 * * *", datetime(2017, 10, 29), "next", 2),
+            [("10-30 00:00+0100", 0), ("10-31 00:00+0100", 0)],
+        )
+
+    def test_resolve_with_fold(self):
+        # wall-clock times, in local seconds since the epoch, read with both offsets of a transition
+        zone = cron_m._tz_offsets(zoneinfo.ZoneInfo("Europe/Athens"))
+        repeated = (datetime(2013, 10, 27, 3, 30) - datetime(1970, 1, 1)).total_seconds()
+        self.assertEqual(zone.resolve(repeated, 10800), repeated - 10800)
+        self.assertEqual(zone.resolve(repeated, 7200), repeated - 7200)
+        skipped = (datetime(2013, 3, 31, 3, 30) - datetime(1970, 1, 1)).total_seconds()
+        self.assertIsNone(zone.resolve(skipped, 7200))
+        self.assertIsNone(zone.resolve(skipped, 10800))
+        self.assertIsNone(zone.resolve(skipped + 86400, 7200))
+        self.assertEqual(zone.resolve(skipped + 86400, 10800), skipped + 86400 - 10800)
+        # the pytz transitions resolve the same way
+        transitions = cron_m._tz_offsets(pytz.timezone("Europe/Athens"))
+        for wall in (repeated, skipped, skipped + 86400):
+            for offset in (7200, 10800):
+                self.assertEqual(transitions.resolve(wall, offset), zone.resolve(wall, offset))
+
+    def test_daily_resolved_in_one_step(self):
+        # daily matches keep their wall-clock time across the transitions, without checking the result again
+        tz = zoneinfo.ZoneInfo("Europe/Athens")
+        fail = AssertionError("adjusted result checked")
+        with mock.patch.object(cron_m._ZoneInfoOffsets, "info", side_effect=fail):
+            self.assertSchedule(
+                run_dst_scenario(tz, "30 3 * * *", datetime(2013, 10, 25), "next", 4),
+                [("10-25 03:30+0300", 0), ("10-26 03:30+0300", 0), ("10-27 03:30+0300", 0), ("10-28 03:30+0200", 0)],
+            )
+            self.assertSchedule(
+                run_dst_scenario(tz, "30 3 * * *", datetime(2013, 3, 29), "next", 4),
+                [("03-29 03:30+0200", 0), ("03-30 03:30+0200", 0), ("03-31 04:30+0300", 0), ("04-01 03:30+0300", 0)],
+            )
+
+    def test_old_and_new_results(self):
+        # zoneinfo timezones used to go through the datetime based search, unaware of their DST rules
+        tz = zoneinfo.ZoneInfo("Europe/Athens")
+        scenarios = [
+            (
+                (tz, "*/30 * * * *", datetime(2013, 10, 27, 2), "next", 5),
+                # the repeated hour used to be skipped
+                [
+                    ("10-27 02:30+0300", 0),
+                    ("10-27 03:00+0300", 0),
+                    ("10-27 03:30+0300", 0),
+                    ("10-27 04:00+0200", 0),
+                    ("10-27 04:30+0200", 0),
+                ],
+                [
+                    ("10-27 02:30+0300", 0),
+                    ("10-27 03:00+0300", 0),
+                    ("10-27 03:30+0300", 0),
+                    ("10-27 03:00+0200", 1),
+                    ("10-27 03:30+0200", 1),
+                ],
+            ),
+            (
+                (zoneinfo.ZoneInfo("Europe/Paris"), "1 2 * * *", datetime(2020, 3, 30, 1, 59, 55), "prev", 3),
+                # get_prev used to be stuck on the skipped time
+                [("03-29 03:01+0200", 0), ("03-29 03:01+0200", 0), ("03-29 03:01+0200", 0)],
+                [("03-29 01:01+0100", 0), ("03-28 02:01+0100", 0), ("03-27 02:01+0100", 0)],
+            ),
+            (
+                (zoneinfo.ZoneInfo("Europe/Warsaw"), "0 0 * * *", datetime(2017, 10, 29), "next", 2),
+                # the first match after a fall back used to run an hour late
+                [("10-30 01:00+0100", 0), ("10-31 00:00+0100", 0)],
+                [("10-30 00:00+0100", 0), ("10-31 00:00+0100", 0)],
+            ),
+        ]
+        for scenario, old, new in scenarios:
+            with mock.patch.object(cron_m, "_tz_offsets", return_value=None):
+                self.assertSchedule(run_dst_scenario(*scenario), old)
+            self.assertSchedule(run_dst_scenario(*scenario), new)
+
+    def test_same_as_pytz(self):
+        for m32b in (False, True):
+            cron_m.OVERFLOW32B_MODE = m32b
+            for name, expr, start, direction, count in DST_SCENARIOS:
+                expected = run_dst_scenario(pytz.timezone(name), expr, start, direction, count)
+                results = run_dst_scenario(zoneinfo.ZoneInfo(name), expr, start, direction, count)
+                self.assertEqual(
+                    [(d.replace(tzinfo=None), d.utcoffset(), d.tzname()) for d in results],
+                    [(d.replace(tzinfo=None), d.utcoffset(), d.tzname()) for d in expected],
+                    (name, expr, start, direction),
+                )
+
+
 if __name__ == "__main__":
     unittest.main()
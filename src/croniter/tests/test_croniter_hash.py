@@ -8,7 +8,7 @@ except ImportError:
 
 from datetime import datetime, timedelta
 
-from croniter import CroniterBadCronError, CroniterNotAlphaError, croniter
+from croniter import CroniterBadCronError, CroniterNotAlphaError, CronSchedule, croniter
 from croniter.tests import base
 
 
@@ -553,5 +553,32 @@ class CroniterHashExpanderExpandYearsTest(CroniterHashExpanderBase):
         assert max(years) == 2050
 
 
+class CroniterExpandHashedManyTest(CroniterHashExpanderBase):
+    def test_expand_hashed_many(self):
+        for template in ("H H * * *", "H(0-29)/10 H(1-5) * * H", "@daily", "H H * * sat#2", "0 0 H * * H"):
+            schedules = croniter.expand_hashed_many(template, self.HASH_IDS)
+            self.assertEqual(sum(len(hash_ids) for hash_ids in schedules.values()), len(self.HASH_IDS))
+            for schedule, hash_ids in schedules.items():
+                for hash_id in hash_ids:
+                    self.assertEqual(CronSchedule(template, hash_id=hash_id), schedule)
+                    self.assertEqual(
+                        croniter.expand(template, hash_id=hash_id)[0], [list(f) for f in schedule.expanded]
+                    )
+
+    def test_expand_hashed_many_groups(self):
+        schedules = croniter.expand_hashed_many("H 0 * * *", ["hello", b"hello", "bonjour"])
+        self.assertEqual(list(schedules.values()), [["hello", b"hello"], ["bonjour"]])
+        schedule = list(schedules)[0]
+        self.assertEqual(schedule.next_after(datetime(2021, 4, 10)), datetime(2021, 4, 10, 0, 10))
+        self.assertEqual(croniter.expand_hashed_many("H H * * *", []), {})
+
+    def test_expand_hashed_many_errors(self):
+        self.assertRaises(TypeError, croniter.expand_hashed_many, "H H * * *", [None])
+        self.assertRaises(CroniterBadCronError, croniter.expand_hashed_many, "H H * *", ["hello"])
+        with self.assertRaises(CroniterBadCronError) as ctx:
+            croniter.expand_hashed_many("0 H(0-59) * * *", self.HASH_IDS)
+        self.assertEqual(ctx.exception.field_index, 1)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,14 +1,29 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import sys
 import unittest
 from datetime import datetime, timedelta
 
+import numpy
 import pytz
 
-from croniter import CroniterBadCronError, CroniterBadDateError, CroniterBadTypeRangeError, croniter, croniter_range
+from croniter import (
+    CroniterBadCronError,
+    CroniterBadDateError,
+    CroniterBadTypeRangeError,
+    croniter,
+    croniter_count,
+    croniter_range,
+    croniter_range_array,
+)
 from croniter.tests import base
 
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
 
 class mydatetime(datetime):
     """."""
@@ -196,6 +211,77 @@ class CroniterRangeTest(base.TestCase):
         self.assertEqual(fwd[0], datetime(2020, 1, 1))
         self.assertEqual(fwd[-1], datetime(2028, 1, 1))
 
+    def test_offset(self):
+        start = datetime(2020, 1, 1)
+        stop = datetime(2021, 1, 1)
+        expr = "*/10 9-17 L * mon-fri"
+        matches = list(croniter_range(start, stop, expr))
+        for offset in (0, 1, 53, len(matches) - 1, len(matches)):
+            self.assertEqual(list(croniter_range(start, stop, expr, offset=offset)), matches[offset:])
+            self.assertEqual(
+                list(croniter_range(stop, start, expr, offset=offset)),
+                matches[::-1][offset:],
+            )
+
+    def test_count(self):
+        start = datetime(2024, 1, 30, 10, 0, 30)
+        stop = datetime(2024, 3, 1, 0, 0)
+        for expr in ("*/7 9-17 * * mon-fri", "0 0 L * *", "*/30 * * * *", "0 0 31 2 *", "10 * 29 2 * 0-59/15"):
+            for exclude_ends in (False, True):
+                for bounds in ((start, stop), (stop, start), (stop, stop), (1e9, 1.001e9)):
+                    expected = len(list(croniter_range(*bounds, expr_format=expr, exclude_ends=exclude_ends)))
+                    self.assertEqual(croniter_count(*bounds, expr_format=expr, exclude_ends=exclude_ends), expected)
+        self.assertEqual(croniter_count(start, stop, "0 0 13 * fri", day_or=False), 0)
+        self.assertEqual(croniter_count(start, stop, "0 0 13 * fri"), 6)
+        self.assertEqual(croniter_count(datetime(2024, 1, 1), datetime(2024, 2, 1), "* * * * * *"), 31 * 86400 + 1)
+        self.assertRaises(CroniterBadTypeRangeError, croniter_count, start, 1.0, "* * * * *")
+
+    def test_count_dst(self):
+        for tz_name, expr in [
+            ("Europe/Paris", "*/15 2 * * *"),
+            ("Europe/Paris", "0 */6 * * *"),
+            ("America/New_York", "30 1-3 * * *"),
+            ("America/New_York", "* 2 * * *"),
+            ("Australia/Lord_Howe", "*/10 1-2 * * *"),
+        ]:
+            tz = pytz.timezone(tz_name)
+            for start, stop in [
+                (datetime(2024, 3, 1), datetime(2024, 4, 20, 12)),
+                (datetime(2024, 10, 1), datetime(2024, 11, 20, 12)),
+                (datetime(2024, 3, 9, 20, 10), datetime(2024, 3, 11, 1)),
+                (datetime(2024, 11, 2, 7), datetime(2024, 11, 4, 14, 30)),
+            ]:
+                start, stop = tz.localize(start), tz.localize(stop)
+                for bounds in ((start, stop), (stop, start)):
+                    self.assertEqual(
+                        croniter_count(*bounds, expr_format=expr), len(list(croniter_range(*bounds, expr_format=expr)))
+                    )
+
+    def test_range_array(self):
+        tz = pytz.timezone("Europe/Paris")
+        for start, stop in [
+            (datetime(2024, 2, 28, 10, 0, 30), datetime(2024, 3, 2)),
+            (tz.localize(datetime(2024, 3, 30)), tz.localize(datetime(2024, 4, 2))),
+            (tz.localize(datetime(2024, 10, 28)), tz.localize(datetime(2024, 10, 25, 12))),
+        ]:
+            for expr in ("*/7 1-3 * * *", "0 0 L * *", "30 * * * * */20", "0 2 29 2 sat"):
+                for exclude_ends in (False, True):
+                    expected = list(croniter_range(start, stop, expr, ret_type=float, exclude_ends=exclude_ends))
+                    result = croniter_range_array(start, stop, expr, "int64", exclude_ends=exclude_ends)
+                    self.assertEqual(result.dtype, numpy.dtype("int64"))
+                    self.assertEqual(result.tolist(), expected)
+        result = croniter_range_array(datetime(2024, 1, 1), datetime(2024, 1, 2), "0 12 * * *")
+        self.assertEqual(result.tolist(), [datetime(2024, 1, 1, 12)])
+        self.assertEqual(result.dtype, numpy.dtype("datetime64[s]"))
+        self.assertEqual(len(croniter_range_array(1e9, 1e9 + 30, "0 * * * *")), 0)
+        self.assertRaises(ValueError, croniter_range_array, 1e9, 2e9, "* * * * *", "float64")
+
+    def test_range_array_without_numpy(self):
+        # NumPy is only required by croniter_range_array
+        with mock.patch.dict(sys.modules, {"numpy": None}):
+            self.assertRaises(ImportError, croniter_range_array, 1e9, 2e9, "* * * * *")
+            self.assertEqual(len(list(croniter_range(1e9, 1e9 + 3600, "0 * * * *"))), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
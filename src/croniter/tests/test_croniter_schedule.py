@@ -0,0 +1,470 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+import gc
+import io
+import pickle
+import threading
+import weakref
+from datetime import date, datetime, timedelta, tzinfo
+
+import dateutil.tz
+import pytz
+
+from croniter import (
+    DAY_TIMES_CACHE,
+    EXPAND_CACHE,
+    YEAR_DAYS_CACHE,
+    CroniterBadCronError,
+    CroniterBadDateError,
+    CronSchedule,
+    cron_m,
+    croniter,
+    dump_schedules,
+    load_schedules,
+)
+from croniter.tests import base
+
+try:
+    import zoneinfo
+except ImportError:  # python < 3.9
+    zoneinfo = None
+
+
+class FixedTimezone(tzinfo):
+    # a fixed offset no library keeps alive
+    def __init__(self, offset):
+        self.offset = offset
+
+    def utcoffset(self, dt):
+        return self.offset
+
+    def dst(self, dt):
+        return timedelta(0)
+
+
+class CronScheduleTest(base.TestCase):
+    def test_immutable(self):
+        schedule = CronSchedule("0 9 * * mon-fri")
+        self.assertRaises(AttributeError, setattr, schedule, "day_or", False)
+        self.assertRaises(AttributeError, setattr, schedule, "foo", 1)
+        self.assertRaises(AttributeError, delattr, schedule, "masks")
+        self.assertEqual(schedule.expanded, ((0,), (9,), ("*",), ("*",), (1, 2, 3, 4, 5)))
+
+    def test_hashable(self):
+        a = CronSchedule("0 9 * * mon-fri")
+        b = CronSchedule("0 9 * * 1-5")
+        c = CronSchedule("0 9 * * 1-5", day_or=False)
+        self.assertEqual(a, b)
+        self.assertEqual(hash(a), hash(b))
+        self.assertNotEqual(a, c)
+        self.assertEqual(len({a, b, c}), 2)
+
+    def test_canonicalize(self):
+        canonical = croniter.canonicalize("0 0 * * *")
+        self.assertEqual(canonical.expression, "0 0 * * *")
+        self.assertTrue(canonical.day_or)
+        for expr in ("@midnight", "0 0 ? * *", "00 00 * * SUN-SAT", "0 0 1-31 * *", "0 0 * * * 0", "0 0 1-30,L * ?"):
+            self.assertEqual(croniter.canonicalize(expr), canonical)
+        self.assertEqual(croniter.canonicalize("0 0 0 * * *", second_at_beginning=True), canonical)
+        # a union with every weekday matches every day
+        self.assertEqual(croniter.canonicalize("0 0 1 * 0-6"), canonical)
+        self.assertEqual(croniter.canonicalize("0-55/5 * * * *").expression, "*/5 * * * *")
+        self.assertEqual(
+            croniter.canonicalize("1,2,3,5,7,8,9 * L,1 jan-mar sat#2,sat#3", day_or=False).expression,
+            "1-3,5,7-9 * 1,L 1-3 6#2,6#3",
+        )
+        self.assertEqual(croniter.canonicalize("0 0 * * l5").expression, "0 0 * * L5")
+
+    def test_canonicalize_day_or(self):
+        union = croniter.canonicalize("0 0 1 * mon")
+        intersection = croniter.canonicalize("0 0 1 * mon", day_or=False)
+        self.assertEqual((union.expression, union.day_or), ("0 0 1 * 1", True))
+        self.assertEqual((intersection.expression, intersection.day_or), ("0 0 1 * 1", False))
+        self.assertNotEqual(union.fingerprint, intersection.fingerprint)
+        self.assertEqual(croniter.canonicalize("0 0 1 * mon", implement_cron_bug=True), union)
+        self.assertEqual(croniter.canonicalize("0 0 */2 * mon", implement_cron_bug=True).day_or, False)
+        # both modes are the same when a field is not restricted
+        self.assertEqual(croniter.canonicalize("0 0 * * mon", day_or=False), croniter.canonicalize("0 0 * * 1"))
+
+    def test_canonicalize_nth_weekday_union(self):
+        # a union with `#n` weekdays matches them alone, whatever the day of month
+        canonical = croniter.canonicalize("0 0 * * 5#3")
+        self.assertEqual(canonical.expression, "0 0 * * 5#3")
+        for expr in ("0 0 5 * 5#3", "0 0 6 * fri#3", "0 0 15-21 * 5#3", "0 0 L * 5#3"):
+            self.assertEqual(croniter.canonicalize(expr), canonical)
+        self.assertEqual(
+            croniter.canonicalize("1,2,3,5,7,8,9 * L,1 jan-mar sat#2,sat#3").expression, "1-3,5,7-9 * * 1-3 6#2,6#3"
+        )
+        # the intersection still depends on the day of month
+        self.assertNotEqual(croniter.canonicalize("0 0 15 * 5#3", day_or=False), canonical)
+
+    def test_canonical_round_trip(self):
+        start = datetime(2024, 1, 5, 12)
+        for expr, day_or in (
+            ("0 0 1 * mon", False),
+            ("*/7 1-5 15,L */2 fri", True),
+            ("0 12 * * 0-6,sat#3", True),
+            ("0 12 1 * 0-6,sat#3", True),
+            ("0 0 5 * 5#3", True),
+            ("0 0 31 2,4 0-6 30 2020-2030", True),
+            ("0 0 * * * */10 2030", True),
+        ):
+            canonical = CronSchedule(expr, day_or=day_or).canonical()
+            schedule = CronSchedule(canonical.expression, day_or=canonical.day_or)
+            self.assertEqual(schedule.canonical(), canonical)
+            itr1 = croniter(expr, start, day_or=day_or, ret_type=datetime)
+            itr2 = schedule.cursor(start, ret_type=datetime)
+            for i in range(10):
+                try:
+                    expected = itr1.get_next()
+                except CroniterBadDateError:
+                    self.assertRaises(CroniterBadDateError, itr2.get_next)
+                    break
+                self.assertEqual(itr2.get_next(), expected)
+
+    def test_frequency(self):
+        start, stop = datetime(2024, 1, 30, 10, 17, 31), datetime(2024, 4, 2, 3, 4, 5)
+        for expr, day_or in (
+            ("*/20 */5 * * *", True),
+            ("0 12 L * *", True),
+            ("0 9 1,15 * fri", True),
+            ("0 9 1-7 * fri", False),
+            ("30 6 * * sat#3,L1", True),
+            ("0 0 * * 5#2", False),
+            ("*/30 8-9 * 2-3 * 15,45", True),
+            ("0 0 29 2 * 0 2024-2030", True),
+        ):
+            schedule = CronSchedule(expr, day_or=day_or)
+            itr = schedule.cursor(start, ret_type=datetime)
+            expected = 0
+            while itr.get_next() < stop:
+                expected += 1
+            self.assertEqual(schedule.frequency(start, stop), expected, expr)
+            self.assertEqual(croniter.frequency(expr, start, stop, day_or=day_or), expected, expr)
+
+    def test_frequency_periods(self):
+        self.assertEqual(croniter.frequency("0 9 * * mon-fri", date(2024, 1, 1), date(2025, 1, 1)), 262)
+        self.assertEqual(croniter.frequency("0 0 L 2 *", date(2000, 1, 1), date(2100, 1, 1)), 100)
+        weeks = croniter.frequency("0 9 * * mon-fri", datetime(2024, 1, 3, 10), date(2024, 1, 17), period="week")
+        self.assertEqual(
+            list(weeks.items()), [(datetime(2024, 1, 1), 2), (datetime(2024, 1, 8), 5), (datetime(2024, 1, 15), 2)]
+        )
+        days = croniter.frequency("0 */6 * * *", datetime(2024, 1, 1, 7), datetime(2024, 1, 3, 7), period="day")
+        self.assertEqual(list(days.values()), [2, 4, 2])
+        months = croniter.frequency("0 0 * * *", date(2024, 1, 1), date(2025, 1, 1), period="month")
+        self.assertEqual(list(months.values()), [31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+        years = croniter.frequency("0 0 1 1 * 0 2025", date(2024, 1, 1), date(2027, 1, 1), period="year")
+        self.assertEqual(list(years.values()), [0, 1, 0])
+        self.assertRaises(ValueError, croniter.frequency, "* * * * *", date(2024, 1, 1), date(2025, 1, 1), "hour")
+
+    def test_frequency_bounds(self):
+        schedule = CronSchedule("*/15 * * * *")
+        self.assertEqual(schedule.frequency(datetime(2024, 1, 1, 10), datetime(2024, 1, 1, 10)), 0)
+        self.assertEqual(schedule.frequency(datetime(2024, 1, 2), datetime(2024, 1, 1)), 0)
+        self.assertEqual(schedule.frequency(datetime(2024, 1, 1, 10), datetime(2024, 1, 1, 11)), 4)
+        self.assertEqual(schedule.frequency(datetime(2024, 1, 1, 10), datetime(2024, 1, 1, 11, 0, 0, 1)), 5)
+        self.assertEqual(schedule.frequency(datetime(2024, 1, 1, 10, 0, 0, 1), datetime(2024, 1, 1, 11)), 3)
+        tz = pytz.timezone("Europe/Paris")
+        start = tz.localize(datetime(2024, 1, 1, 10))
+        self.assertEqual(schedule.frequency(start, start.astimezone(pytz.utc) + timedelta(hours=1)), 4)
+
+    def test_year_days(self):
+        YEAR_DAYS_CACHE.clear()
+        schedule = CronSchedule("0 0 13 * fri", day_or=False)
+        first_day, days = schedule._year_days(2026)
+        self.assertEqual(first_day, (datetime(2026, 1, 1) - datetime(1970, 1, 1)).days)
+        expected = [d for d in range(365) if (datetime(2026, 1, 1) + timedelta(days=d)).day == 13]
+        expected = [d for d in expected if (datetime(2026, 1, 1) + timedelta(days=d)).weekday() == 4]
+        self.assertEqual([d for d in range(366) if days >> d & 1], expected)
+        # shared by schedules with the same date fields
+        other = CronSchedule("*/5 12 13 * 5", day_or=False)
+        self.assertEqual(other._year_days(2026), (first_day, days))
+        self.assertEqual(YEAR_DAYS_CACHE.info().currsize, 1)
+        itr = other.cursor(datetime(2026, 1, 1), ret_type=datetime)
+        self.assertEqual(itr.get_next(), datetime(2026, 2, 13, 12))
+        self.assertEqual(itr.get_prev(), datetime(2025, 6, 13, 12, 55))
+        # the year field is part of the key
+        self.assertEqual(CronSchedule("0 0,5 * * *")._year_days(2021)[1], (1 << 365) - 1)
+        self.assertEqual(CronSchedule("0 0,5 * * * 0 2020")._year_days(2021)[1], 0)
+
+    def test_year_kinds(self):
+        # only the leap years starting on a friday have a monday 29th of february
+        schedule = CronSchedule("0 4 29 2 mon", day_or=False)
+        self.assertEqual(schedule._year_kinds(), 1 << 12)
+        self.assertEqual(schedule._matching_year(2024, False), 2044)
+        self.assertEqual(schedule._matching_year(2024, True), 2016)
+        itr = schedule.cursor(datetime(2024, 3, 1), ret_type=datetime, max_years_between_matches=100)
+        self.assertEqual([itr.get_next(), itr.get_next()], [datetime(2044, 2, 29, 4), datetime(2072, 2, 29, 4)])
+        # no match at all is known at once
+        schedule = CronSchedule("0 0 30 2 *")
+        self.assertEqual(schedule._year_kinds(), 0)
+        self.assertEqual(schedule._matching_year(2024, False), None)
+        itr = schedule.cursor(datetime(2024, 3, 1), max_years_between_matches=10 ** 6)
+        self.assertRaises(CroniterBadDateError, itr.get_next)
+        schedule = CronSchedule("0 0 29 2 * 0 2097-2099")
+        self.assertEqual(schedule._matching_year(2000, False), None)
+        self.assertEqual(CronSchedule("0 0 29 2 * 0 2096-2099")._matching_year(2000, False), 2096)
+
+    def test_day_times(self):
+        DAY_TIMES_CACHE.clear()
+        schedule = CronSchedule("15,45 8-9 * * mon")
+        self.assertEqual(list(schedule._day_times), [29700, 31500, 33300, 35100])
+        # shared by schedules with the same time fields
+        self.assertIs(CronSchedule("15,45 8,9 1 * *")._day_times, schedule._day_times)
+        self.assertEqual(DAY_TIMES_CACHE.info().currsize, 1)
+        self.assertEqual(list(CronSchedule("0 0 * * * 10-11")._day_times), [10, 11])
+        itr = schedule.cursor(datetime(2024, 1, 1, 9, 45), ret_type=datetime)
+        self.assertEqual(itr.get_next(), datetime(2024, 1, 8, 8, 15))
+        self.assertEqual(itr.get_prev(), datetime(2024, 1, 1, 9, 45))
+        self.assertEqual(itr.get_prev(), datetime(2024, 1, 1, 9, 15))
+        # too many times of day are searched field by field
+        schedule = CronSchedule("* * * * mon *")
+        self.assertIsNone(schedule._day_times)
+        itr = schedule.cursor(datetime(2024, 1, 1, 23, 59, 59), ret_type=datetime)
+        self.assertEqual(itr.get_next(), datetime(2024, 1, 8))
+        self.assertEqual(itr.get_prev(), datetime(2024, 1, 1, 23, 59, 59))
+
+    def test_tz_offsets(self):
+        paris = pytz.timezone("Europe/Paris")
+        zone = cron_m._tz_offsets(paris)
+        self.assertIs(cron_m._tz_offsets(paris), zone)
+        for day in range(0, 365 * 3, 5):
+            d = datetime(2023, 1, 1, 0, 30, tzinfo=pytz.utc) + timedelta(days=day, hours=day % 24)
+            timestamp = croniter.datetime_to_timestamp(d)
+            local = d.astimezone(paris)
+            self.assertEqual(zone.offset(timestamp), local.utcoffset().total_seconds())
+            self.assertEqual(zone.info(timestamp), (local.utcoffset(), local.dst(), local.tzname()))
+        fixed = cron_m._tz_offsets(pytz.FixedOffset(90))
+        self.assertEqual((fixed.times, fixed.offsets), ([], [5400]))
+        if zoneinfo is not None:
+            self.assertEqual(cron_m._tz_offsets(zoneinfo.ZoneInfo("Europe/Paris")).offset(1688169600), 7200)
+        # timezones resolving wall-clock times on their own are converted datetime by datetime
+        self.assertIsNone(cron_m._tz_offsets(dateutil.tz.gettz("Europe/Paris")))
+        # the known transitions are those found by scanning the days
+        start, stop = 1672531200, 1672531200 + 3 * 365 * 86400
+        self.assertEqual(
+            cron_m._utc_transitions(paris, start, stop),
+            cron_m._utc_transitions(dateutil.tz.gettz("Europe/Paris"), start, stop),
+        )
+        self.assertEqual(len(cron_m._utc_transitions(paris, start, stop)), 6)
+
+    def test_tz_offsets_keys(self):
+        # the instances of a pytz timezone share their offsets
+        paris = pytz.timezone("Europe/Paris")
+        self.assertIs(cron_m._tz_offsets(paris.localize(datetime(2024, 7, 1)).tzinfo), cron_m._tz_offsets(paris))
+        # other timezones are not kept alive by the cache
+        tz = FixedTimezone(timedelta(minutes=90))
+        zone = cron_m._tz_offsets(tz)
+        self.assertEqual((zone.times, zone.offsets), ([], [5400]))
+        self.assertIs(cron_m._tz_offsets(tz), zone)
+        ref = weakref.ref(tz)
+        del tz
+        gc.collect()
+        self.assertIsNone(ref())
+        self.assertEqual(cron_m._tz_offsets(FixedTimezone(timedelta(minutes=30))).offsets, [1800])
+        if zoneinfo is not None:
+            tz = zoneinfo.ZoneInfo.no_cache("Europe/Paris")
+            self.assertIs(cron_m._tz_offsets(tz).tzinfo, tz)
+
+    def test_fixed_period(self):
+        for expr, period in (
+            ("*/5 * * * *", (300, 0)),
+            ("5,35 * * * *", (1800, 300)),
+            ("30 */3 * * *", (10800, 1800)),
+            ("*/20 * * * * 5", (1200, 5)),
+            ("* * * * * *", (1, 0)),
+            ("*/7 * * * *", None),
+            ("0 */5 * * *", None),
+            ("0 0 1 * *", None),
+            ("0 0 * * * 0 2030", None),
+        ):
+            self.assertEqual(CronSchedule(expr)._period, period, expr)
+        schedule = CronSchedule("5,35 * * * *")
+        for start in (datetime(2024, 1, 1), datetime(2024, 1, 1, 0, 5), datetime(2024, 1, 1, 0, 5, 0, 1)):
+            for tz in (None, pytz.utc):
+                start = start.replace(tzinfo=tz)
+                itr = schedule.cursor(start, ret_type=datetime)
+                general = croniter("5,35 * * * * 0 2000-2099", start, ret_type=datetime)
+                self.assertEqual([itr.get_next() for i in range(5)], [general.get_next() for i in range(5)])
+                self.assertEqual([itr.get_prev() for i in range(9)], [general.get_prev() for i in range(9)])
+        # timezones with DST use the general engine
+        tz = pytz.timezone("Europe/Paris")
+        itr = CronSchedule("0 */2 * * *").cursor(tz.localize(datetime(2024, 3, 31)), ret_type=datetime)
+        self.assertEqual([d.hour for d in [itr.get_next() for i in range(3)]], [3, 4, 6])
+        self.assertEqual(schedule.frequency(datetime(2024, 1, 1, 0, 5), datetime(2024, 1, 2, 0, 5)), 48)
+        self.assertEqual(schedule.frequency(datetime(2024, 1, 1, 0, 5, 0, 1), datetime(2024, 1, 2, 0, 5, 0, 1)), 48)
+
+    def test_bad_expression(self):
+        self.assertRaises(CroniterBadCronError, CronSchedule, "* * * *")
+        self.assertRaises(TypeError, CronSchedule, "H * * * *", hash_id=1)
+
+    def test_next_after_prev_before(self):
+        schedule = CronSchedule("0 9 * * mon-fri")
+        self.assertEqual(schedule.next_after(datetime(2024, 1, 5, 12)), datetime(2024, 1, 8, 9))
+        self.assertEqual(schedule.prev_before(datetime(2024, 1, 8, 9)), datetime(2024, 1, 5, 9))
+        self.assertEqual(schedule.next_after(1704456000.0), 1704704400.0)
+        tz = pytz.timezone("Europe/Paris")
+        ret = schedule.next_after(tz.localize(datetime(2024, 3, 29, 12)))
+        self.assertEqual(ret, tz.localize(datetime(2024, 4, 1, 9)))
+        self.assertEqual(str(ret.utcoffset()), "2:00:00")
+
+    def test_next_after_max_years(self):
+        schedule = CronSchedule("0 0 29 2 mon", day_or=False)
+        self.assertEqual(schedule.next_after(datetime(2024, 3, 1)), datetime(2044, 2, 29))
+        self.assertRaises(CroniterBadDateError, schedule.next_after, datetime(2024, 3, 1), 10)
+
+    def test_cursor(self):
+        schedule = CronSchedule("*/10 * * * *")
+        c1 = schedule.cursor(datetime(2024, 1, 1), ret_type=datetime)
+        c2 = schedule.cursor(datetime(2024, 6, 1), ret_type=datetime)
+        self.assertIs(c1.schedule, schedule)
+        self.assertEqual([c1.get_next() for i in range(2)], [datetime(2024, 1, 1, 0, 10), datetime(2024, 1, 1, 0, 20)])
+        self.assertEqual(c2.get_prev(), datetime(2024, 5, 31, 23, 50))
+        self.assertEqual(croniter(schedule, datetime(2024, 1, 1)).get_next(datetime), datetime(2024, 1, 1, 0, 10))
+
+    def test_croniter_attributes(self):
+        itr = croniter("0 0 * * sat#1,sun#2", hash_id="x")
+        self.assertEqual(itr.expanded, [[0], [0], ["*"], ["*"], [0, 6]])
+        self.assertEqual(itr.nth_weekday_of_month, {0: {2}, 6: {1}})
+        self.assertEqual(itr.expressions, ["0", "0", "*", "*", "sat#1,sun#2"])
+        self.assertEqual(itr.schedule.hash_id, b"x")
+        # copied once per cursor
+        self.assertIs(itr.expanded, itr.expanded)
+        self.assertIs(itr.nth_weekday_of_month, itr.nth_weekday_of_month)
+
+    def test_croniter_attributes_assignment(self):
+        schedule = CronSchedule("0 0 * * *")
+        itr = croniter(schedule, datetime(2024, 1, 1))
+        itr.expanded = [[30], [12], ["*"], ["*"], ["*"]]
+        self.assertEqual(itr.expanded, [[30], [12], ["*"], ["*"], ["*"]])
+        self.assertEqual(itr.get_next(datetime), datetime(2024, 1, 1, 12, 30))
+        # the shared schedule is left alone
+        self.assertEqual(schedule.expanded, ((0,), (0,), ("*",), ("*",), ("*",)))
+        itr.expanded = [[0], [0], ["*"], ["*"], [5]]
+        itr.nth_weekday_of_month = {5: {1}}
+        self.assertEqual(itr.get_next(datetime), datetime(2024, 1, 5))
+        itr.expanded = [[0], [0], [1], ["*"], [1]]
+        itr.nth_weekday_of_month = {}
+        itr.expressions = ["0", "0", "1", "*", "mon"]
+        self.assertEqual(itr.get_next(datetime), datetime(2024, 1, 8))
+        itr.fields = ("custom",)
+        self.assertEqual(itr.fields, ("custom",))
+
+    def test_pickle_keeps_random_values(self):
+        schedule = CronSchedule("R R * * *")
+        copy = pickle.loads(pickle.dumps(schedule))
+        self.assertEqual(copy, schedule)
+        self.assertEqual(copy.expanded, schedule.expanded)
+        self.assertEqual(copy.next_after(datetime(2024, 1, 1)), schedule.next_after(datetime(2024, 1, 1)))
+
+    def test_dump_load_schedules(self):
+        schedules = [
+            CronSchedule("*/5 * * * *"),
+            CronSchedule("@daily", hash_id="job"),
+            CronSchedule("H H * * *", hash_id=b"job"),
+            CronSchedule("0 0 15,L */2 *"),
+            CronSchedule("0 9 * * sat#2,L5,mon#1"),
+            CronSchedule("0 9 * * 0-6,sat#3"),
+            CronSchedule("0 0 1 * mon", day_or=False),
+            CronSchedule("0 0 */2 * mon", implement_cron_bug=True),
+            CronSchedule("30 0 0 * * * 2020-2030/3", second_at_beginning=True),
+            CronSchedule("R R * * *"),
+            CronSchedule("0 0 * * *"),
+            CronSchedule("0 0 ? * *"),
+        ]
+        fp = io.BytesIO()
+        dump_schedules(fp, schedules)
+        fp.seek(0)
+        info = EXPAND_CACHE.info()
+        loaded = load_schedules(fp)
+        # nothing was parsed again
+        self.assertEqual(EXPAND_CACHE.info(), info)
+        self.assertEqual(loaded, schedules)
+        for schedule, restored in zip(schedules, loaded):
+            for name in CronSchedule.__slots__:
+                self.assertEqual(getattr(restored, name), getattr(schedule, name))
+        start = datetime(2024, 1, 5, 12)
+        self.assertEqual(
+            [schedule.next_after(start) for schedule in loaded], [schedule.next_after(start) for schedule in schedules]
+        )
+
+    def test_load_schedules_errors(self):
+        self.assertRaises(ValueError, load_schedules, io.BytesIO(b""))
+        self.assertRaises(ValueError, load_schedules, io.BytesIO(b"garbage garbage"))
+        fp = io.BytesIO()
+        dump_schedules(fp, [CronSchedule("0 0 * * *")])
+        data = bytearray(fp.getvalue())
+        data[4] = 255
+        self.assertRaises(ValueError, load_schedules, io.BytesIO(bytes(data)))
+
+    def test_load_schedules_truncated(self):
+        fp = io.BytesIO()
+        dump_schedules(fp, [CronSchedule("0 9 * * sat#2,L5"), CronSchedule("H H * * *", hash_id="job")])
+        data = fp.getvalue()
+        for length in range(len(data)):
+            self.assertRaises(ValueError, load_schedules, io.BytesIO(data[:length]))
+        self.assertRaises(ValueError, load_schedules, io.BytesIO(data + b"\0"))
+
+    def test_load_schedules_corrupt(self):
+        fp = io.BytesIO()
+        dump_schedules(fp, [CronSchedule("0 9 * * sat#2,L5")])
+        data = fp.getvalue()
+        expr_offset = data.index(b"0 9")
+        for offset, value in (
+            # invalid UTF-8 expression
+            (expr_offset, 0xFF),
+            # fields count
+            (expr_offset + len("0 9 * * sat#2,L5"), 6),
+            # smallest value of the minutes
+            (expr_offset + len("0 9 * * sat#2,L5") + 2, 60),
+            # nth weekday
+            (len(data) - 2, 7),
+        ):
+            corrupt = bytearray(data)
+            corrupt[offset] = value
+            self.assertRaises(ValueError, load_schedules, io.BytesIO(bytes(corrupt)))
+
+    def test_dump_schedules_too_long(self):
+        fp = io.BytesIO()
+        self.assertRaises(ValueError, dump_schedules, fp, [CronSchedule("H H * * *", hash_id="x" * 0x10000)])
+        dump_schedules(fp, [CronSchedule("H H * * *", hash_id="x" * 0xFFFF)])
+        fp.seek(0)
+        self.assertEqual(load_schedules(fp)[0].hash_id, b"x" * 0xFFFF)
+
+    def test_load_schedules_croniter_class(self):
+        class MyCroniter(croniter):
+            pass
+
+        fp = io.BytesIO()
+        dump_schedules(fp, [CronSchedule("0 0 * * *", _croniter=MyCroniter)] * 2)
+        fp.seek(0)
+        # the class is not dumped
+        self.assertTrue(all(schedule._croniter is croniter for schedule in load_schedules(fp)))
+        fp.seek(0)
+        self.assertTrue(all(schedule._croniter is MyCroniter for schedule in load_schedules(fp, _croniter=MyCroniter)))
+
+    def test_shared_between_threads(self):
+        schedule = CronSchedule("*/7 1-5 * * *")
+        itr = croniter("*/7 1-5 * * *", datetime(2024, 1, 1), ret_type=datetime)
+        expected = [itr.get_next() for i in range(500)]
+        results = []
+
+        def work():
+            cursor = schedule.cursor(datetime(2024, 1, 1), ret_type=datetime)
+            results.append([cursor.get_next() for i in range(500)])
+
+        threads = [threading.Thread(target=work) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results, [expected] * 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
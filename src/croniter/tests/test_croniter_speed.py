@@ -8,6 +8,7 @@ except ImportError:
     import unittest
 
 import os
+import subprocess
 import sys
 from datetime import datetime
 from timeit import Timer
@@ -17,6 +18,16 @@ import pytz
 from croniter import cron_m, croniter
 from croniter.tests import base
 
+try:
+    from unittest import mock
+except ImportError:  # py2
+    import mock
+
+try:
+    import tracemalloc
+except ImportError:  # py2
+    tracemalloc = None
+
 
 class CroniterSpeedTest(base.TestCase):
     def run_long_test(self, iterations=1):
@@ -116,6 +127,163 @@ class CroniterSpeedTest(base.TestCase):
         ret = t.timeit(limit)
         self.assertTrue(ret < limit, "Regression in croniter speed detected ({0} {1}).".format(ret, limit))
 
+    def test_parse_without_regular_expressions(self):
+        # fields are parsed by a single pass tokenizer, see benchmark.parse for timings
+        def fail(regex, name):
+            raise AssertionError("{0} used to parse".format(regex.pattern))
+
+        corpus = [
+            "*/5 * * * *",
+            "15,45 8-18 * * mon-fri",
+            "0 0 L * *",
+            "0 9 * * sat#2",
+            "0 12 * * l5",
+            "@daily",
+            "0 0 * * * 30",
+            "0 0 1 1 * 0 2020-2030",
+        ]
+        with mock.patch.object(cron_m._LazyRegex, "__getattr__", fail):
+            for expr in corpus:
+                croniter._expand(expr)
+            self.assertRaises(AssertionError, lambda: cron_m.only_int_re.match("1"))
+
+    def test_day_or_single_search(self):
+        # day of month and day of week unions are searched at once, see benchmark.day_or for timings
+        corpus = ["0 9 1,15 * mon", "30 8 1 * mon-fri", "0 0 13 * fri", "0 12 L * sun", "0 0 1-7 * sat#1"]
+        calc = cron_m.CronSchedule._calc
+        for expr in corpus:
+            itr = croniter(expr, datetime(2024, 1, 1))
+            with mock.patch.object(cron_m.CronSchedule, "_calc", autospec=True, side_effect=calc) as search:
+                for i in range(25):
+                    itr.get_next()
+                    itr.get_prev()
+            self.assertEqual(search.call_count, 50, expr)
+
+    def test_fixed_period_arithmetic(self):
+        # fixed period schedules are computed without searching, see benchmark.fixed_period for timings
+        cases = [
+            ("* * * * * *", datetime(2024, 1, 1, tzinfo=pytz.utc), 1),
+            ("*/5 * * * *", datetime(2024, 1, 1, 0, 2), 300),
+            ("0 */2 * * *", datetime(2024, 1, 1, 1), 7200),
+        ]
+        for expr, start, period in cases:
+            expected = croniter(expr, start)
+            expected = [expected.get_next() for i in range(5)] + [expected.get_prev() for i in range(5)]
+            itr = croniter(expr, start)
+            with mock.patch.object(cron_m.CronSchedule, "_calc", side_effect=AssertionError("searched")):
+                results = [itr.get_next() for i in range(5)] + [itr.get_prev() for i in range(5)]
+            self.assertEqual(results, expected)
+            self.assertEqual(results[1] - results[0], period)
+
+    def test_tz_offsets_on_timestamps(self):
+        # UTC offsets come from the transitions of pytz timezones, see benchmark.tz for timings
+        tz = pytz.timezone("America/New_York")
+        start = tz.localize(datetime(2024, 3, 9))
+        for expr in ("*/30 * * * *", "0 2 * * *"):
+            # the search on datetimes of the timezone
+            with mock.patch.object(cron_m, "_tz_offsets", return_value=None):
+                itr = croniter(expr, start)
+                expected = [itr.get_next() for i in range(100)] + [itr.get_prev() for i in range(200)]
+            itr = croniter(expr, start)
+            fail = AssertionError("datetime built")
+            with mock.patch.object(cron_m, "timestamp_to_datetime", side_effect=fail):
+                with mock.patch.object(cron_m, "datetime_to_timestamp", side_effect=fail):
+                    results = [itr.get_next() for i in range(100)] + [itr.get_prev() for i in range(200)]
+            self.assertEqual(results, expected, expr)
+
+    def test_prev_search_steps(self):
+        # get_prev searches the same precomputed tables as get_next, see benchmark.directions for timings
+        corpus = [
+            "*/5 * * * *",
+            "17 3 * * *",
+            "0 9 * * mon-fri",
+            "0 0 1,15 * mon",
+            "0 12 * * sat#2",
+            "0 0 L * *",
+            "*/7 */3 * * *",
+            "10,20 8-17 * * 1-5 */15",
+        ]
+        starts = [datetime(2024, 6, 1), pytz.timezone("Europe/Paris").localize(datetime(2024, 6, 1))]
+        for start in starts:
+            for expr in corpus:
+                itr = croniter(expr, start)
+                # both directions scan the same masks, only the diff method and the reset second differ
+                forward_steps, backward_steps = itr.schedule._steps
+                self.assertEqual(forward_steps[3:], backward_steps[3:], expr)
+                # the days visited by the searches, going forward then back over the same matches
+                with mock.patch.object(cron_m, "_civil_from_days", wraps=cron_m._civil_from_days) as days:
+                    forward = [itr.get_next() for i in range(200)]
+                    forward_days = days.call_count
+                    days.reset_mock()
+                    backward = [itr.get_prev() for i in range(199)]
+                self.assertEqual(backward, forward[-2::-1], expr)
+                self.assertLessEqual(days.call_count, forward_days, expr)
+
+    @unittest.skipIf(tracemalloc is None, "tracemalloc is not available")
+    def test_iteration_allocations(self):
+        # once the caches are warm, stepping a cursor keeps no memory and builds no per call tables
+        corpus = [
+            "*/5 * * * *",
+            "0 9 * * mon-fri",
+            "0 0 1,15 * mon",
+            "0 12 * * sat#2",
+            "0 0 L * *",
+            "* * * * * * 2024",
+        ]
+        start = datetime(2024, 6, 1)
+        for expr in corpus:
+            for is_prev in (False, True):
+                itr = croniter(expr, start)
+                step = itr.get_prev if is_prev else itr.get_next
+                for i in range(500):
+                    step()
+                itr.set_current(start)
+                tracemalloc.start()
+                try:
+                    before = tracemalloc.get_traced_memory()[0]
+                    for i in range(500):
+                        step()
+                    current, peak = tracemalloc.get_traced_memory()
+                finally:
+                    tracemalloc.stop()
+                self.assertLess(current - before, 512, expr)
+                self.assertLess(peak - before, 4096, expr)
+
+    def test_day_times_search(self):
+        # the time of day is found in the table of the matching times, see benchmark.day_times for timings
+        corpus = ["0 9 * * mon-fri", "*/7 */3 * * *", "10,20 8-17 * * 1-5 */15", "0 0 L * *"]
+        start = datetime(2024, 6, 1)
+        for expr in corpus:
+            # the hour, minute and second fields searched one after the other
+            with mock.patch.object(cron_m, "_day_times", return_value=None):
+                itr = croniter(cron_m.CronSchedule(expr), start)
+            expected = [itr.get_next() for i in range(50)] + [itr.get_prev() for i in range(100)]
+            fail = AssertionError("field searched")
+            with mock.patch.object(croniter, "_get_next_mask_diff", side_effect=fail):
+                with mock.patch.object(croniter, "_get_prev_mask_diff", side_effect=fail):
+                    itr = croniter(cron_m.CronSchedule(expr), start)
+                    results = [itr.get_next() for i in range(50)] + [itr.get_prev() for i in range(100)]
+            self.assertEqual(results, expected, expr)
+
+    def test_import_is_cheap(self):
+        if sys.version_info < (3, 7):
+            return
+        # -S: do not let site hooks import modules on their own
+        env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(os.path.abspath(cron_m.__file__))))
+        output = subprocess.check_output(
+            [sys.executable, "-S", "-X", "importtime", "-c", "import croniter"],
+            stderr=subprocess.STDOUT,
+            env=env,
+        )
+        imported = set(
+            line.split("|")[-1].strip()
+            for line in output.decode("utf-8").splitlines()
+            if line.startswith("import time:")
+        )
+        self.assertIn("croniter.croniter", imported)
+        for module in ("pytz", "dateutil", "platform", "subprocess", "calendar", "copy", "re", "random"):
+            self.assertNotIn(module, imported)
+
 
 if __name__ == "__main__":
     unittest.main()